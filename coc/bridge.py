@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import Dict, Any
 import math
+import numpy as np
 
 try:
     # your real implementation should import from coc.core.coc
@@ -34,27 +35,32 @@ def run_local_phases() -> AssetVec | None:
     if results is None:
         return None
     raw = results(["BTC","ETH","SOL","SPX","NDX","DXY","GOLD","US10Y"])
-    out: AssetVec = {}
-    for k, r in raw.items():
-        vx, vy = r.get("vx", 0.0), r.get("vy", 0.0)
-        ux, uy = unit(vx, vy)
-        out[k] = {
-            "vx": ux, "vy": uy,
-            "phase_deg": phase_deg(ux, uy),
-            "c_local": float(r.get("coh", 0.0))
-        }
-    return out
+    if not raw:
+        return {}
+    keys = list(raw)
+    V = np.array([(raw[k].get("vx", 0.0), raw[k].get("vy", 0.0)) for k in keys], dtype=float)
+    coh = np.array([raw[k].get("coh", 0.0) for k in keys], dtype=float)
+    # unit vectors + phases for all assets at once
+    mags = np.hypot(V[:, 0], V[:, 1])[:, None]
+    U = np.divide(V, mags, out=np.zeros_like(V), where=mags > 0)
+    phases = np.abs(np.degrees(np.arctan2(U[:, 1], U[:, 0])))
+    return {
+        k: {"vx": ux, "vy": uy, "phase_deg": ph, "c_local": c}
+        for k, (ux, uy), ph, c in zip(keys, U.tolist(), phases.tolist(), coh.tolist())
+    }
 
 def compute_c_global(av: AssetVec) -> dict | None:
     """Compute global vector, coherence, and per-asset angle vs C_global."""
     if not av: return None
-    vx = sum(d["vx"] for d in av.values())
-    vy = sum(d["vy"] for d in av.values())
-    ux, uy = unit(vx, vy)
+    keys = list(av)
+    n = len(keys)
+    VX = np.fromiter((av[k]["vx"] for k in keys), dtype=float, count=n)
+    VY = np.fromiter((av[k]["vy"] for k in keys), dtype=float, count=n)
+    PH = np.fromiter((av[k]["phase_deg"] for k in keys), dtype=float, count=n)
+    ux, uy = unit(float(VX.sum()), float(VY.sum()))
     global_phase = phase_deg(ux, uy)
     # angle diff per asset (0–180)
-    deltas = {k: abs(av[k]["phase_deg"] - global_phase) for k in av}
+    deltas = dict(zip(keys, np.abs(PH - global_phase).tolist()))
     # crude coherence as average |dot| with global direction
-    dots = [abs(av[k]["vx"]*ux + av[k]["vy"]*uy) for k in av]
-    c_global = sum(dots)/len(dots) if dots else 0.0
+    c_global = float(np.abs(VX*ux + VY*uy).mean())
     return {"ux": ux, "uy": uy, "phase_deg": global_phase, "C_global": c_global, "deltas": deltas}
@@ -1,9 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 import json
+import numpy as np
 import pandas as pd
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
 from .coc_sources import load_basket_ohlcv
-from .coc_metrics import compute_beta, compute_Dphi, compute_Hdir, combine_coc, normalize_vec
+from .coc_metrics import compute_beta, compute_Dphi, compute_Hdir, combine_coc_batch, normalize_columns
+
+def _write_json(path: Path, obj: dict) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(obj, indent=2))
+
+def _read_json(path: Path):
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 @dataclass
 class CoCResult:
@@ -16,13 +32,14 @@ def compute_and_persist(output_dir: Path, years: int = 5, macro_years: int = 15)
     output_dir.mkdir(parents=True, exist_ok=True)
     data = load_basket_ohlcv(years=years, macro_years=macro_years)
 
-    rows = []
-    for asset, per_tf in data.items():
-        beta = compute_beta(per_tf)
-        dphi = compute_Dphi(per_tf)
-        hdir = compute_Hdir(per_tf)
-        rows.append({"asset": asset, "beta": beta, "Dphi": dphi, "Hdir": hdir})
-    df = pd.DataFrame(rows).set_index("asset")
+    def _per_asset(item):
+        asset, per_tf = item
+        return {"asset": asset, "beta": compute_beta(per_tf), "Dphi": compute_Dphi(per_tf), "Hdir": compute_Hdir(per_tf)}
+
+    # each task only reads its own per_tf slice; map() keeps asset order
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(data)))) as ex:
+        rows = list(ex.map(_per_asset, data.items()))
+    df = pd.DataFrame(rows, columns=["asset","beta","Dphi","Hdir"]).set_index("asset")
 
     # If everything is NaN/empty, write neutral CoC and exit gracefully
     if df.empty or df[["beta","Dphi","Hdir"]].isna().all().all():
@@ -35,50 +52,55 @@ def compute_and_persist(output_dir: Path, years: int = 5, macro_years: int = 15)
         hist = pd.DataFrame([{"timestamp": pd.Timestamp.utcnow().isoformat(), "coc_basket": coc_basket}])
         hist.to_csv(output_dir / "coc_time_series.csv", index=False)
         summary = {"coc_basket": coc_basket, "coc_ref": coc_ref, "delta": delta, "coc_decile": decile}
-        (output_dir / "coc_summary.json").write_text(json.dumps(summary, indent=2))
-        (output_dir / "coc_delta.json").write_text(json.dumps({"delta": delta}, indent=2))
+        _write_json(output_dir / "coc_summary.json", summary)
+        _write_json(output_dir / "coc_delta.json", {"delta": delta})
         return CoCResult(coc_basket, coc_ref, delta, decile)
 
     # Normalize and combine
-    df_norm = df.apply(normalize_vec)
-    df["CoC_asset"] = df_norm.apply(lambda r: combine_coc(r["beta"], r["Dphi"], r["Hdir"]), axis=1)
+    norm = normalize_columns(df[["beta","Dphi","Hdir"]].to_numpy(dtype=float))
+    df["CoC_asset"] = combine_coc_batch(norm)
     coc_basket = float(df["CoC_asset"].median())
 
-    # History
+    # History (only the value column is needed; the new row is appended below)
     ts_path = output_dir / "coc_time_series.csv"
-    hist = pd.read_csv(ts_path) if ts_path.exists() else pd.DataFrame(columns=["timestamp","coc_basket"])
-    hist = pd.concat([hist, pd.DataFrame([{"timestamp": pd.Timestamp.utcnow().isoformat(), "coc_basket": coc_basket}])], ignore_index=True)
+    prior = pd.read_csv(ts_path, usecols=["coc_basket"])["coc_basket"] if ts_path.exists() else pd.Series(dtype=float)
+    hist = pd.concat([prior.astype(float), pd.Series([coc_basket], dtype=float)], ignore_index=True)
 
     # Reference (bootstrap if short)
-    coc_ref = float(hist["coc_basket"].median()) if len(hist) >= 10 else 0.50
+    coc_ref = float(hist.median()) if len(hist) >= 10 else 0.50
     delta = coc_basket - coc_ref
 
     # Decile (guard for empty/NaN)
-    series = hist["coc_basket"].dropna()
-    if series.empty:
+    vals = hist.to_numpy(dtype=float)
+    vals = vals[~np.isnan(vals)]
+    if vals.size == 0:
         decile = 5
     else:
-        q = series.quantile([i/10 for i in range(11)])
-        # find how many quantile thresholds current value exceeds
-        decile = int((series.iloc[-1] >= q.values).sum() - 1)
+        q = np.quantile(vals, np.linspace(0.0, 1.0, 11))
+        # number of quantile thresholds <= current value, as a 0..9 decile
+        decile = int(np.clip(np.searchsorted(q, vals[-1], side="right") - 1, 0, 9))
 
     # Save outputs
     df.to_csv(output_dir / "coc_assets_metrics.csv")
-    hist.to_csv(ts_path, index=False)
+    new_ts = not ts_path.exists()
+    with ts_path.open("a", encoding="utf-8", newline="") as fh:
+        if new_ts:
+            fh.write("timestamp,coc_basket\n")
+        fh.write(f"{pd.Timestamp.utcnow().isoformat()},{coc_basket}\n")
     summary = {"coc_basket": coc_basket, "coc_ref": coc_ref, "delta": delta, "coc_decile": decile}
-    (output_dir / "coc_summary.json").write_text(json.dumps(summary, indent=2))
-    (output_dir / "coc_delta.json").write_text(json.dumps({"delta": delta}, indent=2))
+    _write_json(output_dir / "coc_summary.json", summary)
+    _write_json(output_dir / "coc_delta.json", {"delta": delta})
 
     return CoCResult(coc_basket, coc_ref, delta, decile)
 
 def read_delta(path: Path = Path("C:/OPRT/data/derived/coc_delta.json")) -> float:
     try:
-        return json.loads(path.read_text()).get("delta", 0.0) if path.exists() else 0.0
+        return _read_json(path).get("delta", 0.0) if path.exists() else 0.0
     except Exception:
         return 0.0
 
 def read_coc_stats(path: Path = Path("C:/OPRT/data/derived/coc_summary.json")) -> dict:
     try:
-        return json.loads(path.read_text()) if path.exists() else {}
+        return _read_json(path) if path.exists() else {}
     except Exception:
         return {}
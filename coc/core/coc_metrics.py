@@ -6,12 +6,22 @@ import math
 import numpy as np
 
 def normalize_vec(v: Iterable[float] | np.ndarray) -> np.ndarray:
-    x = np.asarray(list(v), dtype=float)
+    try:
+        x = np.asarray(v, dtype=float).ravel()
+    except TypeError:  # generators / sets: not array-like, but still Iterable[float]
+        x = np.fromiter(v, dtype=float)
     n = np.linalg.norm(x)
     if not np.isfinite(n) or n == 0.0:
         return np.zeros_like(x)
     return x / n
 
+def normalize_columns(m: Any) -> np.ndarray:
+    """Column-wise normalize_vec over a 2-D matrix in one call."""
+    x = np.asarray(m, dtype=float)
+    n = np.linalg.norm(x, axis=0)
+    ok = np.isfinite(n) & (n != 0.0)
+    return np.where(ok, x / np.where(ok, n, 1.0), 0.0)
+
 def compute_beta(*args: Any, **kwargs: Any) -> float:
     return 0.0
 
@@ -19,11 +29,9 @@ def compute_Dphi(a: float, b: float | None = None, *, degrees: bool | None = Non
     if b is None:
         return 0.0
     if degrees is None:
-        degrees = any(abs(x) > math.pi for x in (a, b))
-    d = a - b
-    if degrees:
-        return ((d + 180.0) % 360.0) - 180.0
-    return ((d + math.pi) % (2.0 * math.pi)) - math.pi
+        degrees = max(abs(a), abs(b)) > math.pi
+    P = 180.0 if degrees else math.pi
+    return ((a - b + P) % (2.0 * P)) - P
 
 def compute_Hdir(x: float | np.ndarray, **_: Any) -> int:
     try:
@@ -71,3 +79,29 @@ def combine_coc(*args: Any, **kwargs: Any) -> float:
             pass
 
     return float(np.nanmean(vals))
+
+def combine_coc_batch(arr: Any, weights: Any = None) -> np.ndarray:
+    """
+    Row-wise combine_coc over an (N, K) matrix in one vectorized pass.
+    Non-finite entries are ignored; rows with nothing finite yield 0.0.
+    Weights apply only to fully finite rows, as in combine_coc.
+    """
+    x = np.asarray(arr, dtype=float)
+    if x.ndim == 1:
+        x = x[None, :]
+    ok = np.isfinite(x)
+    vals = np.where(ok, x, 0.0)
+    cnt = ok.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = vals.sum(axis=1) / cnt
+
+    if weights is not None:
+        try:
+            w = np.asarray(weights, dtype=float).ravel()
+            if w.size == x.shape[1] and np.isfinite(w).all() and w.sum() != 0:
+                w = w / w.sum()
+                out = np.where(cnt == x.shape[1], vals @ w, out)
+        except Exception:
+            pass
+
+    return np.where(cnt > 0, out, 0.0)
@@ -4,6 +4,9 @@
 # - Safe resample -> 4H with missing-column guards
 # - Chooses first non-empty source per TF; falls back 1D -> 4H if needed
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import yfinance as yf
 from binance.client import Client
@@ -11,11 +14,12 @@ from binance.client import Client
 # ---------- helpers ----------
 
 _COL_MAP = {
-    "Open": "open", "High": "high", "Low": "low", "Close": "close", "Adj Close": "close",
+    "Open": "open", "High": "high", "Low": "low", "Close": "close", "Adj Close": "adj_close",
     "Volume": "volume", "Datetime": "timestamp", "Date": "timestamp",
-    "open": "open", "high": "high", "low": "low", "close": "close", "adj close": "close",
+    "open": "open", "high": "high", "low": "low", "close": "close", "adj close": "adj_close",
     "volume": "volume", "timestamp": "timestamp", "index": "timestamp",
 }
+_CANON = frozenset(("timestamp", "open", "high", "low", "close", "volume"))
 
 def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Return a frame with ['timestamp','open','high','low','close','volume'] (lowercase),
@@ -31,8 +35,14 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     if df.index.name and "timestamp" not in df.columns:
         df = df.reset_index()
 
-    # Standardize names (case-insensitive)
-    df = df.rename(columns=lambda c: _COL_MAP.get(str(c), str(c).lower()))
+    # Standardize names (case-insensitive); skip when already canonical
+    if not _CANON.issuperset(df.columns):
+        df = df.rename(columns={c: _COL_MAP.get(str(c), str(c).lower()) for c in df.columns})
+        # raw 'Close' is the close: 'Adj Close' only stands in when there is no raw one,
+        # so close never mixes adjusted values with the unadjusted open/high/low
+        if "close" not in df.columns and "adj_close" in df.columns:
+            df = df.rename(columns={"adj_close": "close"})
+        df = df.loc[:, ~df.columns.duplicated()]
 
     # Keep / create required columns
     want = ["timestamp", "open", "high", "low", "close", "volume"]
@@ -45,9 +55,9 @@ def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     # Types
     if "timestamp" in df.columns:
         df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
-    for c in ["open", "high", "low", "close", "volume"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+    num = want[1:]
+    if not all(pd.api.types.is_numeric_dtype(df[c]) for c in num):
+        df[num] = df[num].apply(pd.to_numeric, errors="coerce")
 
     # Drop rows without a timestamp
     df = df.dropna(subset=["timestamp"])
@@ -70,10 +80,13 @@ def _resample_ohlc(df: pd.DataFrame, rule: str) -> pd.DataFrame:
         if c not in df.columns:
             df[c] = pd.NA
 
+    # One resampler, one single-column Cython reducer per field
+    r = df.set_index("timestamp").resample(rule, label="right", closed="right")
     g = (
-        df.set_index("timestamp")
-          .resample(rule, label="right", closed="right")
-          .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        pd.concat({
+            "open": r["open"].first(), "high": r["high"].max(), "low": r["low"].min(),
+            "close": r["close"].last(), "volume": r["volume"].sum(),
+        }, axis=1)
           .dropna(how="all")
           .reset_index()
     )
@@ -82,11 +95,22 @@ def _resample_ohlc(df: pd.DataFrame, rule: str) -> pd.DataFrame:
 
 # ---------- data fetchers ----------
 
+_client = None
+_client_lock = threading.Lock()
+
+def _binance_client() -> Client:
+    """One shared Binance client (lazy; Client() pings on construction)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Client()
+        return _client
+
+
 def fetch_binance(symbol: str = "BTCUSDT", interval: str = "1h", lookback: str = "5y") -> pd.DataFrame:
     """Binance klines -> normalized DataFrame. Returns empty normalized frame on error."""
     try:
-        client = Client()
-        kl = client.get_historical_klines(symbol, interval, lookback)
+        kl = _binance_client().get_historical_klines(symbol, interval, lookback)
         if not kl:
             return _finalize(None)
         df = pd.DataFrame(
@@ -95,9 +119,7 @@ def fetch_binance(symbol: str = "BTCUSDT", interval: str = "1h", lookback: str =
         )[["ts", "o", "h", "l", "c", "v"]]
         df.columns = ["timestamp", "open", "high", "low", "close", "volume"]
         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        for c in ["open", "high", "low", "close", "volume"]:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-        return _finalize(df)
+        return _finalize(df)   # string OHLCV coerced to numeric in one pass there
     except Exception:
         return _finalize(None)
 
@@ -118,6 +140,32 @@ def fetch_yahoo(ticker: str = "^GSPC", interval: str = "1h", period: str = "5y")
         return _finalize(None)
 
 
+def fetch_yahoo_batch(tickers: list, interval: str = "1h", period: str = "5y") -> dict:
+    """One yf.download round-trip for several tickers -> {ticker: normalized DataFrame}."""
+    out = {t: _finalize(None) for t in tickers}
+    try:
+        per = "730d" if interval in ("1h", "60m") else period
+        df = yf.download(
+            " ".join(tickers), interval=interval, period=per, group_by="ticker",
+            threads=True, progress=False, auto_adjust=False
+        )
+        if df is None or df.empty:
+            return out
+        multi = isinstance(df.columns, pd.MultiIndex)
+        for t in tickers:
+            try:
+                if multi and t not in df.columns.get_level_values(0):
+                    continue
+                sub = df[t] if multi else df
+                # batched frames share one index; drop the other tickers' rows
+                out[t] = _finalize(sub.dropna(how="all").reset_index())
+            except Exception:
+                pass
+        return out
+    except Exception:
+        return out
+
+
 # ---------- public API ----------
 
 def load_basket_ohlcv(years: int = 5, macro_years: int = 15) -> dict:
@@ -132,25 +180,46 @@ def load_basket_ohlcv(years: int = 5, macro_years: int = 15) -> dict:
         "US10Y": {"yahoo": "^TNX"},
     }
 
+    # Fire every (asset, source, interval) request up-front; the fetchers are
+    # network-bound so threads overlap the round-trips.
+    # Yahoo tickers go out as one batched download per interval.
+    yahoo = {asset: src["yahoo"] for asset, src in assets.items() if "yahoo" in src}
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=12) as ex:
+        for asset, sources in assets.items():
+            if "binance" in sources:
+                for tf in ("1h", "4h", "1d"):
+                    jobs[(asset, "binance", tf)] = ex.submit(fetch_binance, sources["binance"], tf, f"{years}y")
+        if yahoo:
+            for iv in ("1h", "60m", "1d"):   # intraday internally 730d
+                jobs[("*", "yahoo", iv)] = ex.submit(fetch_yahoo_batch, list(yahoo.values()), iv, f"{years}y")
+    fetched = {}
+    for (asset, src, iv), fut in jobs.items():
+        try:
+            res = fut.result()
+        except Exception:
+            res = None
+        if src == "yahoo":
+            for a, ticker in yahoo.items():
+                fetched[(a, src, iv)] = (res or {}).get(ticker, _finalize(None))
+        else:
+            fetched[(asset, src, iv)] = res if res is not None else _finalize(None)
+
     data = {}
     for asset, sources in assets.items():
         per_tf = {"1h": pd.DataFrame(), "4h": pd.DataFrame(), "1d": pd.DataFrame()}
 
         # Binance (native 1h/4h/1d)
         if "binance" in sources:
-            try:
-                per_tf["1h"] = fetch_binance(sources["binance"], "1h", f"{years}y")
-                per_tf["4h"] = fetch_binance(sources["binance"], "4h", f"{years}y")
-                per_tf["1d"] = fetch_binance(sources["binance"], "1d", f"{years}y")
-            except Exception:
-                pass
+            for tf in ("1h", "4h", "1d"):
+                per_tf[tf] = fetched[(asset, "binance", tf)]
 
         # Yahoo (intraday 60m -> resample 4H; 1d is multi-year)
         if "yahoo" in sources:
             try:
-                h1 = fetch_yahoo(sources["yahoo"], "1h", f"{years}y")     # internally 730d
-                m60 = fetch_yahoo(sources["yahoo"], "60m", f"{years}y")   # 730d
-                d1 = fetch_yahoo(sources["yahoo"], "1d", f"{years}y")
+                h1 = fetched[(asset, "yahoo", "1h")]
+                m60 = fetched[(asset, "yahoo", "60m")]
+                d1 = fetched[(asset, "yahoo", "1d")]
 
                 # Use first non-empty
                 if per_tf["1h"].empty: per_tf["1h"] = h1
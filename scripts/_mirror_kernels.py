@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# _mirror_kernels.py
+# Scalar kernels for mirror_loop's coherence math on tiny (N,5) phase matrices.
+# With numba they compile to one native call per cycle; without it they run as
+# plain Python (same results, no NumPy dispatch per 5-element reduction).
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:
+    def njit(*args, **kwargs):  # no numba: run the kernels as plain Python
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+@njit(cache=True, fastmath=True)
+def coherence_kernel(delta_mat, kappa):
+    """delta_mat: (N,L) A-B phase deltas, row 0 = BTC.
+    Returns (C_raw, global_vec, C_glob, angle_deg), per asset where it makes sense:
+      C_raw[i]     = 100 / (1 + kappa*std(row i))
+      global_vec   = column mean of rows 1..N-1
+      C_glob       = 1 / std(rows 1..N-1)
+      angle_deg[i] = angle between row i and global_vec
+    """
+    n_rows, n = delta_mat.shape
+
+    # every lane: population std, two-pass
+    c_raw = np.empty(n_rows)
+    for i in range(n_rows):
+        s = 0.0
+        for j in range(n):
+            s += delta_mat[i, j]
+        mean_r = s / n
+        ss = 0.0
+        for j in range(n):
+            d = delta_mat[i, j] - mean_r
+            ss += d * d
+        c_raw[i] = 100.0 / (1.0 + kappa * math.sqrt(ss / n))
+
+    # global vector over the other assets + their overall dispersion
+    g = np.zeros(n)
+    c_glob = 0.0
+    m = n_rows - 1
+    if m > 0:
+        tot = 0.0
+        for i in range(1, n_rows):
+            for j in range(n):
+                g[j] += delta_mat[i, j]
+                tot += delta_mat[i, j]
+        for j in range(n):
+            g[j] /= m
+        mean_all = tot / (m * n)
+        ss = 0.0
+        for i in range(1, n_rows):
+            for j in range(n):
+                d = delta_mat[i, j] - mean_all
+                ss += d * d
+        std_all = math.sqrt(ss / (m * n))
+        c_glob = 1.0 / std_all if std_all > 0.0 else math.inf
+
+    # angle(row, global) via atan2(sin, cos): domain-safe, so no clip and no acos
+    ng = 0.0
+    for j in range(n):
+        ng += g[j] * g[j]
+    ng = math.sqrt(ng) + 1e-9
+    angle = np.empty(n_rows)
+    for i in range(n_rows):
+        nb = 0.0; dot = 0.0
+        for j in range(n):
+            b = delta_mat[i, j]
+            nb += b * b
+            dot += b * g[j]
+        cos = dot / ((math.sqrt(nb) + 1e-9) * ng)
+        sin = math.sqrt(max(0.0, 1.0 - cos * cos))
+        angle[i] = math.degrees(math.atan2(sin, cos))
+    return c_raw, g, c_glob, angle
+
+@njit(cache=True)
+def tech_kernel(vals):
+    """vals = [ema_H4, ema_H1, macd_slope_H4, macd_slope_H1, rsi_H4, rsi_H1]
+    (ema/macd encoded as +1/-1, rsi raw). Returns (g, S_H4, S_H1, coh, S_dir)."""
+    s_h4 = (0.7 * vals[0] + vals[2] + max(-1.0, min(1.0, (vals[4] - 50.0) / 25.0))) / 3.0
+    s_h1 = (0.7 * vals[1] + vals[3] + max(-1.0, min(1.0, (vals[5] - 50.0) / 25.0))) / 3.0
+    coh = max(0.0, 1.0 - abs(s_h4 - s_h1))
+    s_dir = (s_h4 + s_h1) / 2.0
+    return 0.85 + 0.15 * abs(s_dir) * coh, s_h4, s_h1, coh, s_dir
+
+@njit(cache=True)
+def gates_kernel(c_loc, g_tech, volume_ratio, vol_edges, vol_mults, tech_sign,
+                 sentiment, si_thr, si_mult, oi, liq, up_mult, down_mult):
+    """All BTC gate multipliers and their product in one call.
+    oi / liq: +1 up/short, -1 down/long, 0 otherwise.
+    Returns (C_eff, g_volume, g_tf, g_sent, g_flow)."""
+    # volume: mults[#edges <= r]; NaN lands in the first bucket
+    k = 0
+    for e in vol_edges:
+        if volume_ratio >= e:
+            k += 1
+    g_volume = vol_mults[k]
+
+    g_tf = 1.0 if tech_sign != 0 else 0.5
+
+    # sentiment opposing the tech bias, strongly enough
+    v = max(-3.0, min(3.0, sentiment))
+    conflict = (v > 0.0 and tech_sign < 0) or (v < 0.0 and tech_sign > 0)
+    g_sent = max(0.5, 1.0 - si_mult) if (abs(v) >= si_thr and conflict) else 1.0
+
+    if oi == 1 and liq == 1:
+        g_flow = 1.0 + up_mult
+    elif oi == -1 and liq == -1:
+        g_flow = max(0.8, 1.0 - down_mult)
+    else:
+        g_flow = 1.0
+
+    # same left-to-right order as the old Python product
+    c_eff = c_loc * g_volume * g_tf * g_sent * g_flow * g_tech
+    return c_eff, g_volume, g_tf, g_sent, g_flow
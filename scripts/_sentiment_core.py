@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# _sentiment_core.py
+# Shared engine for the headline scorers (headlines_to_sentiment.py / _hdr.py):
+# one-pass keyword matcher, headerless-row helpers, 24h-decayed index, JSON encoder.
+# Each script keeps its own keyword profile, score rule, row format and outputs.
+import os, json, math, re
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
+try:
+    import ahocorasick  # pyahocorasick, optional
+except Exception:
+    ahocorasick = None
+
+_KNOWN_DIRS = set()
+
+def ensure_dir(d: str):
+    # makedirs once per directory per process; later calls skip the stat
+    if d not in _KNOWN_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _KNOWN_DIRS.add(d)
+
+def build_matcher(keywords):
+    """Return f(text) -> set of keywords occurring in text as substrings, in one pass."""
+    kws = sorted(set(keywords), key=len, reverse=True)
+    if ahocorasick is not None:
+        ac = ahocorasick.Automaton()
+        for k in kws: ac.add_word(k, k)
+        ac.make_automaton()
+        return lambda txt: {k for _, k in ac.iter(txt)}
+    # Fallback: a lookahead alternation yields the longest keyword starting at
+    # each position; shorter keywords that are prefixes of it are implied.
+    pat = re.compile("(?=(" + "|".join(map(re.escape, kws)) + "))")
+    implied = {k: frozenset(j for j in kws if k.startswith(j)) for k in kws}
+    def match(txt):
+        found = set()
+        for m in pat.finditer(txt): found |= implied[m.group(1)]
+        return found
+    return match
+
+def score_texts(texts, score_text) -> np.ndarray:
+    return np.fromiter((score_text(t) for t in texts), dtype=np.int8, count=len(texts))
+
+def clean_text(text: pd.Series, trail_re) -> pd.Series:
+    # strip trailing ",0,domain" if present, then light normalization
+    return (text.str.replace(trail_re, "", regex=True)
+                .str.replace("â€“", " ", regex=False).str.replace("â€”", " ", regex=False)
+                .str.replace(";", " ", regex=False).str.strip())
+
+def ts_floats(ts_str: pd.Series):
+    # vectorized ISO parse straight to epoch seconds; unparseable -> None
+    ts = pd.to_datetime(ts_str, utc=True, errors="coerce", format="ISO8601")
+    secs = (ts - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+    return [None if math.isnan(x) else x for x in secs.tolist()]
+
+def compute_index(rows, score_text, half_life_h=24.0, default_age_h=12.0):
+    if not rows: return 0.0, []
+    lam = math.log(2.0) / half_life_h
+    now_ts = datetime.now(timezone.utc).timestamp()
+    scores = score_texts([r["text"] for r in rows], score_text)
+    nz = np.flatnonzero(scores)
+    if not nz.size: return 0.0, []
+    ts_f = [rows[i]["ts_f"] for i in nz]
+    ages = np.fromiter(((now_ts - t)/3600.0 if t is not None else default_age_h for t in ts_f),
+                       dtype=np.float64, count=nz.size)
+    s = scores[nz]
+    w = np.exp(-lam * ages)
+    den = w.sum()
+    idx = float((w * s).sum() / den) if den > 0 else 0.0
+    items = [{"text": rows[i]["text"][:180], "score": si, "age_h": round(a,2), "w": round(wi,4)}
+             for i, si, a, wi in zip(nz.tolist(), s.tolist(), ages.tolist(), w.tolist())]
+    return max(-1.0, min(1.0, idx)), items
+
+def dumps(obj, indent: bool = True) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if indent else orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
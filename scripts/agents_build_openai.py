@@ -42,6 +42,14 @@ except Exception:
 
 import numpy as np
 
+try:
+    from numba import njit
+except Exception:
+    def njit(*args, **kwargs):  # no numba: run the kernels as plain Python
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 # ---------------- Config ----------------
 ASSETS = ["BTC","ETH","SOL","SPX","NDX","DXY","GOLD","US10Y"]
 # Which assets get LIVE crypto indicators (others skip)
@@ -64,17 +72,33 @@ phase_vector (array of 5 floats; mean ~{mean_hint}).
 STRICT JSON. No commentary, no code fences."""
 
 # ---------------- Indicator math ----------------
+@njit(cache=True)
+def _ema_kernel(arr, k):
+    out = np.empty_like(arr)
+    out[0] = arr[0]
+    for i in range(1, arr.shape[0]):
+        out[i] = arr[i]*k + out[i-1]*(1.0-k)
+    return out
+
+@njit(cache=True)
+def _rsi_kernel(gains, losses, period, avg_gain, avg_loss):
+    n = gains.shape[0]
+    out = np.full(n + 1, np.nan)
+    for i in range(period, n):
+        avg_gain = (avg_gain*(period-1) + gains[i]) / period
+        avg_loss = (avg_loss*(period-1) + losses[i]) / period
+        if avg_loss == 0:
+            out[i+1] = 100.0
+        else:
+            rs = avg_gain/avg_loss
+            out[i+1] = 100.0 - 100.0/(1.0+rs)
+    return out
+
 def ema(arr, period):
     arr = np.asarray(arr, dtype=float)
     if len(arr) < period:
         return None
-    k = 2.0/(period+1.0)
-    e = arr[0]
-    out = [e]
-    for x in arr[1:]:
-        e = x*k + e*(1.0-k)
-        out.append(e)
-    return np.array(out)
+    return _ema_kernel(arr, 2.0/(period+1.0))
 
 def rsi(arr, period=14):
     arr = np.asarray(arr, dtype=float)
@@ -83,19 +107,7 @@ def rsi(arr, period=14):
     diffs = np.diff(arr)
     gains = np.where(diffs>0, diffs, 0.0)
     losses = np.where(diffs<0, -diffs, 0.0)
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    rsis = []
-    for i in range(period, len(diffs)):
-        avg_gain = (avg_gain*(period-1) + gains[i]) / period
-        avg_loss = (avg_loss*(period-1) + losses[i]) / period
-        if avg_loss == 0:
-            rsis.append(100.0)
-        else:
-            rs = avg_gain/avg_loss
-            rsis.append(100.0 - 100.0/(1.0+rs))
-    pad = [np.nan]*(len(arr) - len(rsis))
-    return np.array(pad + rsis, dtype=float)
+    return _rsi_kernel(gains, losses, period, float(np.mean(gains[:period])), float(np.mean(losses[:period])))
 
 def macd(arr, fast=12, slow=26, signal=9):
     arr = np.asarray(arr, dtype=float)
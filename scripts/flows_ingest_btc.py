@@ -1,14 +1,35 @@
 #!/usr/bin/env python3
 # flows_ingest_btc_closed.py
 # Robust BTC flows ingest with LAST-CLOSED candle volume and futures enrichment.
-# - Prefers ccxt (Binance spot OHLCV) and uses the **last closed** 1h bar.
+# - Prefers Binance spot klines (direct REST) and uses the **last closed** 1h bar.
 # - Falls back to yfinance; also uses the second-to-last (closed) bar.
 # - Enriches with Binance futures funding + OI; infers OI direction from state if needed.
 
-import sys, json, os, math
-from statistics import mean
+import sys, json, os, math, threading
+from pathlib import Path
+import urllib.request
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+except Exception:
+    requests = None  # urllib fallback (no keep-alive)
+
+SPOT_API = "https://api.binance.com"
+FAPI     = "https://fapi.binance.com"
+
 def now_iso_utc() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -18,36 +39,68 @@ def safe_float(x):
     except Exception:
         return None
 
+_KNOWN_DIRS = set()
+
+def ensure_dir(d: str):
+    # makedirs once per directory per process; later calls skip the stat
+    if d not in _KNOWN_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _KNOWN_DIRS.add(d)
+
+_session = None
+_session_lock = threading.Lock()
+
+def _http_session():
+    """One pooled keep-alive session for every Binance call in this run (None without requests)."""
+    global _session
+    if requests is None:
+        return None
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        return _session
+
+def get_json(url: str, params: dict = None, timeout: float = 10.0):
+    s = _http_session()
+    if s is not None:
+        r = s.get(url, params=params, timeout=timeout)
+        r.raise_for_status()
+        return _json_loads(r.content)
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    with urllib.request.urlopen(url, timeout=timeout) as r:
+        return _json_loads(r.read())
+
 def write_text(path: str, text: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ensure_dir(os.path.dirname(path))
     with open(path, "w", encoding="utf-8") as f:
         f.write(text)
 
+def _dumps(obj, indent: bool = True) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if indent else orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
 def write_json(path: str, obj: dict):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+    ensure_dir(os.path.dirname(path))
+    Path(path).write_bytes(_dumps(obj))
 
-def using_ccxt_closed(symbol: str = "BTC/USDT", limit: int = 250):
+def using_binance_closed(symbol: str = "BTCUSDT", limit: int = 22):
     try:
-        import ccxt  # type: ignore
-    except Exception:
-        return None
-    try:
-        ex = ccxt.binance({"enableRateLimit": True})
-        ohlcv = ex.fetch_ohlcv(symbol, timeframe="1h", limit=limit)
-        if not ohlcv or len(ohlcv) < 22:
+        kl = get_json(f"{SPOT_API}/api/v3/klines", {"symbol": symbol, "interval": "1h", "limit": limit})
+        if not kl or len(kl) < 22:
             return None
-        closes = [c[4] for c in ohlcv]
-        vols   = [c[5] for c in ohlcv]
+        # columns: open_time, open, high, low, close, volume, ...
+        arr = np.array(kl, dtype=object)[:, :6].astype(np.float64)
         # Use the last **closed** candle at index -2
-        vol_curr = float(vols[-2])
+        vol_curr = arr[-2, 5].item()
         # Average the previous 20 closed candles
-        vol_avg20 = float(mean(vols[-22:-2]))
+        vol_avg20 = arr[-22:-2, 5].mean().item()
         ratio = (vol_curr / vol_avg20) if vol_avg20 > 0 else None
-        price = float(closes[-2])  # price of last closed bar
+        price = arr[-2, 4].item()  # price of last closed bar
         return {
-            "source": "ccxt.binance",
+            "source": "binance.rest",
             "ts_utc": now_iso_utc(),
             "price": price,
             "vol_1h_current": vol_curr,
@@ -69,11 +122,12 @@ def using_yf_closed(ticker: str = "BTC-USD"):
         df = yf.download(ticker, period="4d", interval="1h", progress=False, auto_adjust=False)
         if df is None or df.empty or len(df) < 22 or "Volume" not in df.columns or "Close" not in df.columns:
             return None
-        # Use second-to-last row as last closed
-        vol_curr = float(df["Volume"].iloc[-2])
-        vol_avg20 = float(df["Volume"].iloc[-22:-2].mean())
+        # Use second-to-last row as last closed (ravel: yfinance may return a 1-col frame)
+        vols = df["Volume"].to_numpy(dtype=np.float64).ravel()
+        vol_curr = vols[-2].item()
+        vol_avg20 = vols[-22:-2].mean().item()
         ratio = (vol_curr / vol_avg20) if vol_avg20 > 0 else None
-        price = float(df["Close"].iloc[-2])
+        price = df["Close"].to_numpy(dtype=np.float64).ravel()[-2].item()
         return {
             "source": "yfinance",
             "ts_utc": now_iso_utc(),
@@ -88,56 +142,33 @@ def using_yf_closed(ticker: str = "BTC-USD"):
     except Exception:
         return None
 
-def enrich_futures_metrics(data: dict) -> dict:
-    try:
-        import ccxt  # type: ignore
-    except Exception:
-        return data
+def enrich_futures_metrics(data: dict, symbol: str = "BTCUSDT") -> dict:
+    def _try(url, params):
+        try:
+            return get_json(url, params)
+        except Exception:
+            return None
 
     try:
-        fx = ccxt.binance({"options": {"defaultType": "future"}, "enableRateLimit": True})
+        # funding, OI history and OI snapshot are independent: fetch them concurrently
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            f_fund = ex.submit(_try, f"{FAPI}/fapi/v1/premiumIndex", {"symbol": symbol})
+            f_hist = ex.submit(_try, f"{FAPI}/futures/data/openInterestHist", {"symbol": symbol, "period": "5m", "limit": 2})
+            f_snap = ex.submit(_try, f"{FAPI}/fapi/v1/openInterest", {"symbol": symbol})
+            prem, hist, snap = f_fund.result(), f_hist.result(), f_snap.result()
 
         funding = None
-        for sym in ("BTC/USDT", "BTC/USDT:USDT", "BTC/USDT-PERP"):
-            try:
-                fr = fx.fetchFundingRate(sym) if hasattr(fx, "fetchFundingRate") else fx.fetch_funding_rate(sym)
-                if fr is None: 
-                    continue
-                val = fr.get("fundingRate")
-                if val is None and isinstance(fr.get("info"), dict):
-                    val = fr["info"].get("lastFundingRate") or fr["info"].get("fundingRate")
-                if val is not None:
-                    funding = float(val)
-                    break
-            except Exception:
-                continue
+        if isinstance(prem, dict):
+            funding = safe_float(prem.get("lastFundingRate"))
 
         oi_value = None
         oi_prev = None
-        for fn_name in ("fapiPublicGetOpenInterestHist", "fapiV2PublicGetOpenInterestHist"):
-            try:
-                fn = getattr(fx, fn_name)
-                hist = fn({"symbol": "BTCUSDT", "period": "5m", "limit": 2})
-                if isinstance(hist, list) and len(hist) >= 2:
-                    def _sf(x):
-                        try: return float(x)
-                        except Exception: return None
-                    oi_prev = _sf(hist[-2].get("sumOpenInterest"))
-                    oi_value = _sf(hist[-1].get("sumOpenInterest"))
-                    break
-            except Exception:
-                pass
-
-        if oi_value is None:
-            for fn_name in ("fapiPublicGetOpenInterest", "fapiV2PublicGetOpenInterest"):
-                try:
-                    fn = getattr(fx, fn_name)
-                    snap = fn({"symbol": "BTCUSDT"})
-                    if isinstance(snap, dict) and snap.get("openInterest") is not None:
-                        oi_value = float(snap["openInterest"])
-                        break
-                except Exception:
-                    pass
+        if isinstance(hist, list) and len(hist) >= 2:
+            oi_prev = safe_float(hist[-2].get("sumOpenInterest"))
+            oi_value = safe_float(hist[-1].get("sumOpenInterest"))
+
+        if oi_value is None and isinstance(snap, dict) and snap.get("openInterest") is not None:
+            oi_value = safe_float(snap["openInterest"])
 
         oi = None
         if oi_value is not None and oi_prev is not None:
@@ -158,7 +189,7 @@ def enrich_futures_metrics(data: dict) -> dict:
 
 def infer_oi_direction_stateful(data: dict, state_path: str):
     try:
-        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        ensure_dir(os.path.dirname(state_path))
         prev = None
         try:
             with open(state_path, "r", encoding="utf-8") as sf:
@@ -190,14 +221,14 @@ def main():
     ap.add_argument("--oi_state", default="C:/OPRT/data/oi_prev.txt")
     args = ap.parse_args()
 
-    os.makedirs(os.path.dirname(args.log), exist_ok=True)
+    ensure_dir(os.path.dirname(args.log))
     def log(msg: str):
         with open(args.log, "a", encoding="utf-8") as fp:
             fp.write(f"{now_iso_utc()} {msg}\n")
 
-    data = using_ccxt_closed() or using_yf_closed()
+    data = using_binance_closed() or using_yf_closed()
     if not data:
-        msg = "ERROR: Neither ccxt nor yfinance ingest succeeded (closed bar)."
+        msg = "ERROR: Neither Binance REST nor yfinance ingest succeeded (closed bar)."
         log(msg); print(msg, file=sys.stderr); sys.exit(2)
 
     data = enrich_futures_metrics(data)
@@ -225,7 +256,7 @@ def main():
         write_text(args.last_price, f"{data['price']:.2f}")
 
     log(f"flows_btc.json written: src={data.get('source')} vol_ratio={ratio} flag={ratio_flag} funding={data.get('funding')} oi={data.get('oi')}")
-    print(json.dumps(data, ensure_ascii=False))
+    print(_dumps(data, indent=False).decode("utf-8"))
 
     # Exit 0: data written successfully (engine will handle gates/risk)
     sys.exit(0)
@@ -8,17 +8,31 @@ Headlines â†’ sentiment_index for OPRT.
     C:\OPRT\data\headlines.csv  (ISO8601,title,score,source)
     C:\OPRT\data\sentiment_index.txt  (single float/integer)
 """
-import os, re, time, math, json
+import os, re, io, time, math, json
+from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 import urllib.request
+import urllib.error
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
+try:
+    from lxml import etree as LET  # optional: streaming C parser
+except Exception:
+    LET = None
 
 ROOT   = r"C:\OPRT"
 DATA   = os.path.join(ROOT, "data")
 os.makedirs(DATA, exist_ok=True)
 OUT_CSV = os.path.join(DATA, "headlines.csv")
 OUT_SI  = os.path.join(DATA, "sentiment_index.txt")
+FEEDS_CACHE = os.path.join(DATA, "feeds_cache.json")  # {url: {etag, last_modified, items}}
 
 # â€”â€”â€” feeds (feel free to add/remove) â€”â€”â€”
 FEEDS = [
@@ -29,37 +43,107 @@ FEEDS = [
     "https://news.google.com/rss/search?q=stocks+futures+OR+nasdaq+OR+sp500&hl=en-US&gl=US&ceid=US:en",
 ]
 
-BULL = re.compile(r"\b(etf inflow|spot etf buys|approval|adopt|accumulate|longs rise|risk-on|rally|breaks out|bullish|tops inflow|buyback|cuts rates|rate cut|eases policy|institutional buy)\b", re.I)
-BEAR = re.compile(r"\b(outflow|ban|restrict|probe|hack|exploit|selloff|liquidations|risk-off|bearish|rate hike|tighten policy|defaults|bankruptcy|lawsuit)\b", re.I)
+BULL = r"etf inflow|spot etf buys|approval|adopt|accumulate|longs rise|risk-on|rally|breaks out|bullish|tops inflow|buyback|cuts rates|rate cut|eases policy|institutional buy"
+BEAR = r"outflow|ban|restrict|probe|hack|exploit|selloff|liquidations|risk-off|bearish|rate hike|tighten policy|defaults|bankruptcy|lawsuit"
+# one pass per title; no keyword contains or word-overlaps one from the other bucket,
+# so non-overlapping finditer sees every bull/bear hit the two separate searches did
+TITLE_RE = re.compile(rf"\b(?:(?P<bull>{BULL})|(?P<bear>{BEAR}))\b", re.I)
+
+# CSV-sanitize titles in one pass: drop quotes, commas -> ';', newlines -> ' '
+_SAN = str.maketrans({'"': None, ",": ";", "\n": " ", "\r": " "})
+
+def fetch(url, timeout=5, headers=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return r.read(), r.headers
+
+def load_feeds_cache():
+    try:
+        with open(FEEDS_CACHE, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:
+        return {}
+
+def save_feeds_cache(cache):
+    tmp = FEEDS_CACHE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(cache) if orjson is not None else json.dumps(cache, ensure_ascii=False).encode("utf-8"))
+    os.replace(tmp, FEEDS_CACHE)
+
+def fetch_items(url, cache):
+    """Conditional GET; on 304 reuse the cached parse. Soft-fails to None."""
+    ent = cache.get(url) or {}
+    hdrs = {}
+    if ent.get("etag"): hdrs["If-None-Match"] = ent["etag"]
+    if ent.get("last_modified"): hdrs["If-Modified-Since"] = ent["last_modified"]
+    try:
+        body, resp_hdrs = fetch(url, headers=hdrs)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and "items" in ent: return ent["items"]
+        return None
+    except Exception:
+        # soft-fail per feed so one dead/slow feed can't sink the batch
+        return None
+    items = parse_rss(body)
+    etag, lm = resp_hdrs.get("ETag"), resp_hdrs.get("Last-Modified")
+    if etag or lm:
+        cache[url] = {"etag": etag, "last_modified": lm, "items": [list(i) for i in items]}
+    else:
+        cache.pop(url, None)
+    return items
+
+RSS_NS = {"dc":"http://purl.org/dc/elements/1.1/"}  # sometimes used for date
 
-def fetch(url, timeout=15):
-    with urllib.request.urlopen(url, timeout=timeout) as r:
-        return r.read()
+def _item_fields(it):
+    title = (it.findtext("title") or "").strip()
+    pub = it.findtext("pubDate") or it.findtext("dc:date", namespaces=RSS_NS) or ""
+    link = (it.findtext("link") or "").strip()
+    return title, pub, link
 
 def parse_rss(xml_bytes):
+    if LET is not None:
+        # stream <item> elements and drop each once read; keeps memory flat on big feeds
+        items = []
+        try:
+            for _, it in LET.iterparse(io.BytesIO(xml_bytes), events=("end",), tag="item"):
+                items.append(_item_fields(it))
+                it.clear()
+                parent = it.getparent()
+                if parent is not None: parent.remove(it)
+        except LET.XMLSyntaxError:
+            return []
+        return items
     try:
         root = ET.fromstring(xml_bytes)
     except ET.ParseError:
         return []
-    ns = {"dc":"http://purl.org/dc/elements/1.1/"}  # sometimes used for date
-    items = []
-    for it in root.findall(".//item"):
-        title = (it.findtext("title") or "").strip()
-        pub = it.findtext("pubDate") or it.findtext("dc:date", namespaces=ns) or ""
-        link = (it.findtext("link") or "").strip()
-        items.append((title, pub, link))
-    return items
+    return [_item_fields(it) for it in root.findall(".//item")]
 
 def score_title(title: str) -> int:
-    t = title.lower()
-    if BULL.search(t) and not BEAR.search(t): return +1
-    if BEAR.search(t) and not BULL.search(t): return -1
-    return 0
+    bull = bear = False
+    for m in TITLE_RE.finditer(title.lower()):
+        if m.lastgroup == "bull": bull = True
+        else: bear = True
+        if bull and bear: return 0
+    return +1 if bull else (-1 if bear else 0)
+
+# fast path for the common RFC-822 pubDate shape: "Wed, 02 Oct 2024 13:00:00 GMT|+0000"
+_RFC822 = re.compile(r"^(?:\w{3}, )?(\d{1,2}) (\w{3}) (\d{4}) (\d{2}):(\d{2}):(\d{2}) (GMT|UTC|Z|[+-]\d{4})$")
+_MONTHS = {m: i for i, m in enumerate(("Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"), 1)}
 
 def to_iso(pub_text: str) -> str:
+    m = _RFC822.match(pub_text.strip())
+    if m and m.group(2) in _MONTHS:
+        d, mon, y, hh, mm, ss, z = m.groups()
+        off = 0 if z in ("GMT", "UTC", "Z") else (1 if z[0] == "+" else -1) * (int(z[1:3]) * 60 + int(z[3:]))
+        try:
+            dt = datetime(int(y), _MONTHS[mon], int(d), int(hh), int(mm), int(ss), tzinfo=timezone.utc)
+            return (dt - timedelta(minutes=off)).isoformat()
+        except ValueError:
+            pass
     # best-effort; if parsing fails, use now
     try:
-        from email.utils import parsedate_to_datetime
         dt = parsedate_to_datetime(pub_text)
         if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc).isoformat()
@@ -76,10 +160,18 @@ def within_24h(iso_str: str) -> bool:
 def main():
     rows = []
     seen = set()
-    for url in FEEDS:
+    # feeds are IO-bound; fetch them concurrently, then walk them in FEEDS order
+    cache = load_feeds_cache()
+    with ThreadPoolExecutor(max_workers=len(FEEDS)) as ex:
+        parsed = list(ex.map(lambda u: fetch_items(u, cache), FEEDS))
+    try:
+        save_feeds_cache(cache)
+    except Exception:
+        pass
+    for url, items in zip(FEEDS, parsed):
+        if items is None: continue
         try:
-            xmlb = fetch(url)
-            for title, pub, link in parse_rss(xmlb):
+            for title, pub, link in items:
                 if not title: continue
                 iso = to_iso(pub)
                 if not within_24h(iso): continue
@@ -88,7 +180,7 @@ def main():
                 seen.add(key)
                 score = score_title(title)
                 src = urlparse(url).netloc.split(":")[0]
-                rows.append((iso, title.replace("\n"," ").strip(), score, src))
+                rows.append((iso, title.translate(_SAN).strip(), score, src))
         except Exception as e:
             # soft-fail; keep going
             pass
@@ -97,12 +189,11 @@ def main():
     rows.sort(key=lambda r: r[0], reverse=True)
     rows = rows[:100]
 
-    # write CSV
-    with open(OUT_CSV, "w", encoding="utf-8") as f:
-        for iso, title, score, src in rows:
-            # iso,title,score,source
-            title = title.replace('"','').replace(",",";")
-            f.write(f"{iso},{title},{score},{src}\n")
+    # write CSV: build the payload in memory, one binary write (no per-line text-mode writes)
+    out = []
+    for iso, title, score, src in rows:
+        out.append(f"{iso},{title},{score},{src}\n")  # iso,title,score,source
+    Path(OUT_CSV).write_bytes("".join(out).encode("utf-8"))
 
     # aggregate sentiment index
     if rows:
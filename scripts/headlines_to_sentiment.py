@@ -5,9 +5,14 @@
 # Parses the first ISO timestamp, takes everything after the first comma as text,
 # strips common trailing ",0,<domain>" parts, computes a 24h-decayed sentiment index,
 # and writes C:\OPRT\data\sentiment_index.txt (+ snapshot JSON & log).
-import os, json, math, sys, re
+import os, sys, re
+from pathlib import Path
 from datetime import datetime, timezone
 
+import pandas as pd
+
+from _sentiment_core import build_matcher, ensure_dir, clean_text, ts_floats, dumps, compute_index as _compute_index
+
 DATA_DIR = "C:/OPRT/data"
 LOG_DIR  = "C:/OPRT/logs"
 HEADLINES = os.path.join(DATA_DIR, "headlines.csv")
@@ -32,75 +37,53 @@ BEAR = [
     "reversal lower","broke below","record low","slide","losses","slump","plunge","misses"
 ]
 
-def now_iso_utc(): return datetime.now(timezone.utc).isoformat()
+_SIGN = {**{k: -1 for k in BEAR}, **{k: +1 for k in BULL}}
+_match = build_matcher(_SIGN)
 
-def parse_ts(s: str):
-    s = s.strip()
-    if s.endswith("Z"): s = s[:-1] + "+00:00"
-    try:
-        dt = datetime.fromisoformat(s)
-        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-    except Exception:
-        return None
+def now_iso_utc(): return datetime.now(timezone.utc).isoformat()
 
 def score_text(t: str) -> int:
-    txt = (t or "").lower()
-    bull = any(k in txt for k in BULL)
-    bear = any(k in txt for k in BEAR)
+    signs = {_SIGN[k] for k in _match((t or "").lower())}
+    bull = +1 in signs
+    bear = -1 in signs
     if bull and not bear: return +1
     if bear and not bull: return -1
     return 0
 
 def read_headerless_lines(path: str):
-    rows = []
-    if not os.path.exists(path): return rows
-    with open(path, "r", encoding="utf-8", newline="") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line: continue
-            # split only on the first comma (timestamp delimiter)
-            parts = line.split(",", 1)
-            if len(parts) < 2: continue
-            ts_str, text = parts[0].strip(), parts[1].strip()
-            if not ISO_RE.match(ts_str):
-                # try to find iso-like token at start anyway
-                m = ISO_RE.search(line)
-                if not m: continue
-                ts_str = m.group(0)
-                text = line[m.end():].lstrip(", ")
-            # strip trailing ",0,domain" if present
-            text = TRAIL_RE.sub("", text)
-            # light normalization
-            text = text.replace("â€“", " ").replace("â€”", " ").replace(";", " ").strip()
-            rows.append({"ts": parse_ts(ts_str), "text": text})
-    return rows
+    if not os.path.exists(path): return []
+    with open(path, "r", encoding="utf-8") as f:
+        lines = pd.Series(f.read().split("\n"), dtype=object).str.strip()
+    lines = lines[lines != ""]
+    if lines.empty: return []
+    # split only on the first comma (timestamp delimiter), all rows at once
+    parts = lines.str.split(",", n=1, expand=True)
+    if parts.shape[1] < 2: return []
+    parts = parts[parts[1].notna()]
+    ts_str, text = parts[0].str.strip(), parts[1].str.strip()
+    # the timestamp must lead the line; ISO_RE is anchored and comma-free
+    ok = ts_str.str.match(ISO_RE.pattern)
+    ts_str, text = ts_str[ok], text[ok]
+    text = clean_text(text, TRAIL_RE)
+    return [{"ts_f": t, "text": x} for t, x in zip(ts_floats(ts_str), text.tolist())]
 
 def compute_index(rows, half_life_h=24.0, default_age_h=12.0):
-    if not rows: return 0.0, []
-    lam = math.log(2.0) / half_life_h
-    now = datetime.now(timezone.utc)
-    num=0.0; den=0.0; items=[]
-    for r in rows:
-        s = score_text(r["text"])
-        if s == 0: continue
-        age_h = ((now - r["ts"]).total_seconds()/3600.0) if r["ts"] else default_age_h
-        w = math.exp(-lam * age_h)
-        num += w * s; den += w
-        items.append({"text": r["text"][:180], "score": s, "age_h": round(age_h,2), "w": round(w,4)})
-    idx = (num/den) if den>0 else 0.0
-    return max(-1.0, min(1.0, idx)), items
+    return _compute_index(rows, score_text, half_life_h, default_age_h)
 
 def main():
-    os.makedirs(LOG_DIR, exist_ok=True)
+    ensure_dir(LOG_DIR)
     rows = read_headerless_lines(HEADLINES)
     idx, items = compute_index(rows)
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(OUT_TXT, "w", encoding="utf-8") as f: f.write(f"{idx:.3f}")
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump({"ts_utc": now_iso_utc(), "count": len(rows), "index": idx, "sample": items[:12]}, f, ensure_ascii=False, indent=2)
-    with open(LOG_FILE, "a", encoding="utf-8") as fp:
-        fp.write(f"{now_iso_utc()} headlines={len(rows)} sentiment_index={idx:.3f} format=headerless\n")
-    print(json.dumps({"sentiment_index": round(idx,3), "headlines": len(rows)}, ensure_ascii=False))
+    ts = now_iso_utc()
+    # serialize everything up front, then one write per output file
+    txt = f"{idx:.3f}".encode("utf-8")
+    js = dumps({"ts_utc": ts, "count": len(rows), "index": idx, "sample": items[:12]})
+    log_line = f"{ts} headlines={len(rows)} sentiment_index={idx:.3f} format=headerless\n"
+    ensure_dir(DATA_DIR)
+    Path(OUT_TXT).write_bytes(txt)
+    Path(OUT_JSON).write_bytes(js)
+    with open(LOG_FILE, "a", encoding="utf-8") as fp: fp.write(log_line)
+    print(dumps({"sentiment_index": round(idx,3), "headlines": len(rows)}, indent=False).decode("utf-8"))
 
 if __name__ == "__main__":
     main()
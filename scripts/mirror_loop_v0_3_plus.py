@@ -3,12 +3,20 @@
 # - Fastgate: size_band='Watch' (clear WATCH labeling)
 # - LITE: new --lite_rescue_min_vol (default 0.85) instead of hard 0.75
 # - Defaults aligned to strong-zone policy: C_eff enter 66/70, angles 12–35
+# - --serve: persistent worker, one cycle per stdin line (JSON overrides: sentiment_index/volume_ratio/flows/price)
 from __future__ import annotations
-import os, json, math, argparse, csv
+import os, sys, json, math, argparse, csv
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Tuple
 import numpy as np
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
+
+from _mirror_kernels import coherence_kernel, tech_kernel, gates_kernel
 
 ASSETS = ["BTC","ETH","SOL","SPX","NDX","DXY","GOLD","US10Y"]
 
@@ -21,12 +29,32 @@ def ensure_dir(path:str):
         os.makedirs(d, exist_ok=True)
 
 def load_json(path:str):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def dumps_line(obj)->bytes:
+    """One compact JSON record as UTF-8 bytes (JSONL / heartbeat)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def load_agent_pairs(agents_dir:str)->Dict[str,Tuple[dict,dict]]:
+    """{asset: (A_json, B_json)} for every asset with both files; reads overlap on a pool."""
+    try: present=set(os.listdir(agents_dir))   # one syscall instead of 16 exists()
+    except OSError: present=set()
+    have=[a for a in ASSETS if f'{a}_A.json' in present and f'{a}_B.json' in present]
+    if not have: return {}
+    def _pair(asset):
+        return (load_json(os.path.join(agents_dir,f'{asset}_A.json')),
+                load_json(os.path.join(agents_dir,f'{asset}_B.json')))
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return dict(zip(have, ex.map(_pair, have)))
+
+# mock phase vectors drawn once at import; every missing agent reuses them
 _rng = np.random.default_rng(40)
-def _mock_vec(bias=1.0):
-    return (bias + _rng.normal(0,0.05,size=5)).astype(float)
+_MOCK_BULL_VEC = (1.04 + _rng.normal(0,0.05,size=5)).round(4).tolist()
+_MOCK_BEAR_VEC = (0.96 + _rng.normal(0,0.05,size=5)).round(4).tolist()
 
 def mock_agent_json(bull=True):
     sign = 'bull' if bull else 'bear'
@@ -45,10 +73,23 @@ def mock_agent_json(bull=True):
         'flows': {'oi':'up' if bull else 'down','funding':'flat','liq_skew':'short' if bull else 'long'},
         'sentiment_index': 1 if bull else -1,
         'levels': {}, 'scenarios': [],
-        'phase_vector': _mock_vec(1.04 if bull else 0.96).round(4).tolist(),
+        'phase_vector': list(_MOCK_BULL_VEC if bull else _MOCK_BEAR_VEC),
     }
 
-@dataclass
+# AgentOut.signs lanes: tf bull/bear, ema 50>200, macd hist slope; each +1/-1 (tf: 0 = neutral)
+SIGN_TF_H4, SIGN_TF_H1, SIGN_EMA_H4, SIGN_EMA_H1, SIGN_MACD_H4, SIGN_MACD_H1 = range(6)
+_TF_SIGN = {'bull': 1, 'bear': -1}
+
+def _encode_signs(tf:Dict[str,str], ind:Dict[str,Any])->np.ndarray:
+    """String indicator encodings -> int8 signs, once per agent at load time."""
+    ema=ind.get('ema',{}); slope=ind.get('macd',{}).get('hist_slope',{})
+    return np.array([_TF_SIGN.get(tf.get('H4'),0), _TF_SIGN.get(tf.get('H1'),0),
+                     1 if '50>200' in str(ema.get('H4','50>200')) else -1,
+                     1 if '50>200' in str(ema.get('H1','50>200')) else -1,
+                     1 if slope.get('H4','+')=='+' else -1,
+                     1 if slope.get('H1','+')=='+' else -1], dtype=np.int8)
+
+@dataclass(slots=True)
 class AgentOut:
     tf_alignment: Dict[str,str]
     indicators: Dict[str,Any]
@@ -59,94 +100,77 @@ class AgentOut:
     levels: Dict[str,Any]
     scenarios: List[Dict[str,Any]]
     phase_vector: np.ndarray
+    signs: np.ndarray
     @staticmethod
-    def from_json(d:Dict[str,Any])->'AgentOut':
+    def from_json(d:Dict[str,Any], phase_out:np.ndarray|None=None)->'AgentOut':
+        # phase_out: optional row of a preallocated (N,5) matrix; phase_vector becomes a view of it
+        pv=d.get('phase_vector',[1,1,1,1,1])
+        if phase_out is None:
+            phase_out=np.array(pv, dtype=float)
+        else:
+            phase_out[:]=pv
+        tf=d.get('tf_alignment',{'H4':'neutral','H1':'neutral'}); ind=d.get('indicators',{})
         return AgentOut(
-            tf_alignment=d.get('tf_alignment',{'H4':'neutral','H1':'neutral'}),
-            indicators=d.get('indicators',{}),
+            tf_alignment=tf,
+            indicators=ind,
             volume_ratio=float(d.get('volume',{}).get('ratio_1h_to_avg20',1.0)),
             leaders=d.get('leaders',{}),
             flows=d.get('flows',{}),
             sentiment_index=float(d.get('sentiment_index',0.0)),
             levels=d.get('levels',{}), scenarios=d.get('scenarios',[]),
-            phase_vector=np.array(d.get('phase_vector',[1,1,1,1,1]), dtype=float),
+            phase_vector=phase_out,
+            signs=_encode_signs(tf, ind),
         )
 
-def c_raw_from_delta(delta_phi:np.ndarray, kappa:float=25.0)->float:
-    std = float(np.std(delta_phi))
-    return 100.0 / (1.0 + kappa*std)
-
-def global_vector_and_metrics(delta_by_asset:Dict[str,np.ndarray])->Tuple[np.ndarray,float]:
-    others=[v for a,v in delta_by_asset.items() if a!='BTC']
-    if not others:
-        return np.zeros(5), 0.0
-    mat = np.vstack(others)
-    return np.mean(mat, axis=0), 1.0/float(np.std(mat))
-
-def phase_angle_deg(v1:np.ndarray,v2:np.ndarray)->float:
-    v1 = v1 / (np.linalg.norm(v1)+1e-9)
-    v2 = v2 / (np.linalg.norm(v2)+1e-9)
-    dot = float(np.clip(np.dot(v1,v2), -1.0, 1.0))
-    return math.degrees(math.acos(dot))
-
-def apply_global_alignment(c_local:float, angle:float):
-    if angle <= 10.0: return c_local*1.00, "Tight alignment (no boost)"
-    if angle <= 35.0: return c_local*1.15, "Sweet lane (12–35°) +15%"
-    if angle <= 45.0: return c_local*1.00, "Loose alignment (no change)"
-    return c_local*0.70, "Divergence (-30% C)"
-
-def gate_volume(r:float)->float:
-    r=float(r)
-    if r>=1.30: return 1.00
-    if r>=1.15: return 0.98
-    if r>=1.00: return 0.92
-    return 0.85
+# step-function gates as edge/table lookups (batchable over assets later)
+_ALIGN_EDGES = np.array([10.0, 35.0, 45.0])   # angle <= edge
+_ALIGN_MULTS = np.array([1.00, 1.15, 1.00, 0.70])
+_ALIGN_NOTES = ("Tight alignment (no boost)", "Sweet lane (12–35°) +15%", "Loose alignment (no change)", "Divergence (-30% C)")
+_VOL_EDGES   = np.array([1.00, 1.15, 1.30])   # r >= edge
+_VOL_MULTS   = np.array([0.85, 0.92, 0.98, 1.00])
+_TRAP_EDGES  = np.array([0.95, 1.05, 1.15, 1.30])
+_TRAP_P      = (0.70, 0.50, 0.30, 0.20, 0.10)
+
+def _step_ge(edges:np.ndarray, table:tuple, x:float)->float:
+    # table[#edges <= x]; NaN falls to the lowest bucket like the old if-ladders
+    return table[int(np.searchsorted(edges, x, side='right'))] if x == x else table[0]
+
+def apply_global_alignment(c_local:np.ndarray, angle:np.ndarray)->Tuple[np.ndarray,np.ndarray]:
+    """Per-asset C_loc and alignment bucket (index into _ALIGN_NOTES)."""
+    i = np.searchsorted(_ALIGN_EDGES, angle, side='left')   # NaN -> last bucket (divergence)
+    return c_local*_ALIGN_MULTS[i], i
 
 def trap_probability(v:float)->float:
-    v=float(v)
-    if v>=1.30: return 0.10
-    if v>=1.15: return 0.20
-    if v>=1.05: return 0.30
-    if v>=0.95: return 0.50
-    return 0.70
-
-def tech_bias_sign_from_tf(tf:Dict[str,str])->int:
-    if tf.get('H4')=='bull' and tf.get('H1')=='bull': return +1
-    if tf.get('H4')=='bear' and tf.get('H1')=='bear': return -1
-    return 0
+    return _step_ge(_TRAP_EDGES, _TRAP_P, float(v))
+
+def tech_bias_sign_from_tf(signs:np.ndarray)->int:
+    # +1/-1 only when H4 and H1 agree on bull/bear
+    h4=int(signs[SIGN_TF_H4])
+    return h4 if h4==int(signs[SIGN_TF_H1]) else 0
+
+def _extract_tech(A:AgentOut)->np.ndarray:
+    """Kernel input: [ema_H4, ema_H1, macd_slope_H4, macd_slope_H1, rsi_H4, rsi_H1]."""
+    rsi=A.indicators.get('rsi',{})
+    def _rsi(v):
+        try: return float(v)
+        except Exception: return 50.0
+    vals=np.empty(6)
+    vals[:4]=A.signs[SIGN_EMA_H4:]
+    vals[4]=_rsi(rsi.get('H4',50)); vals[5]=_rsi(rsi.get('H1',50))
+    return vals
 
 def compute_tech_detail(A:AgentOut, price:float):
-    def norm_trend(ema): return (+1 if '50>200' in str(ema) else -1)*0.7
-    def norm_momo(tf):  return +1.0 if A.indicators.get('macd',{}).get('hist_slope',{}).get(tf,'+')=='+' else -1.0
-    def norm_rsi(v):
-        try: r = float(v)
-        except Exception: r = 50.0
-        # clamp to [-1, +1]
-        return max(-1.0, min(1.0, (r - 50.0) / 25.0))
-    S_H4=(norm_trend(A.indicators.get('ema',{}).get('H4','50>200'))+norm_momo('H4')+norm_rsi(A.indicators.get('rsi',{}).get('H4',50)))/3.0
-    S_H1=(norm_trend(A.indicators.get('ema',{}).get('H1','50>200'))+norm_momo('H1')+norm_rsi(A.indicators.get('rsi',{}).get('H1',50)))/3.0
-    coh=float(max(0.0,1.0-abs(S_H4-S_H1))); S_dir=(S_H4+S_H1)/2.0
-    g=0.85+0.15*max(0.0, S_dir if S_dir>=0 else -S_dir)*coh
+    # plain floats out: checks below test `is False`, which np.bool_ would break
+    g,S_H4,S_H1,coh,S_dir=map(float, tech_kernel(_extract_tech(A)))
     return g, {'S_H4':round(S_H4,3),'S_H1':round(S_H1,3),'coh':round(coh,3),'S_dir':round(S_dir,3)}
 
-def gate_tf(tech_sign:int)->float:
-    return 1.00 if tech_sign!=0 else 0.50
-
-def gate_sentiment_conflict(si:float, tech_sign:int, thr:float, mult:float)->float:
-    try: v=float(si)
-    except: v=0.0
-    v=max(-3.0, min(3.0, v))
-    conflict=(v>0 and tech_sign<0) or (v<0 and tech_sign>0)
-    if abs(v) >= thr and conflict:
-        return max(0.50, 1.0 - float(mult))
-    return 1.00
-
-def gate_flows(flows:Dict[str,str], up_short_mult:float, down_long_mult:float)->float:
-    oi=(flows or {}).get('oi','').lower()
-    liq=(flows or {}).get('liq_skew','').lower()
-    if oi=='up' and liq=='short':  return 1.0 + float(up_short_mult)
-    if oi=='down' and liq=='long': return max(0.80, 1.0 - float(down_long_mult))
-    return 1.00
+_OI_SIGN  = {'up': 1, 'down': -1}
+_LIQ_SIGN = {'short': 1, 'long': -1}
+
+def flow_signs(flows:Dict[str,str])->Tuple[int,int]:
+    """(oi, liq_skew) as +1 up/short, -1 down/long, 0 otherwise; case-insensitive."""
+    return (_OI_SIGN.get(str(flows.get('oi','')).lower(),0),
+            _LIQ_SIGN.get(str(flows.get('liq_skew','')).lower(),0))
 
 def size_band_from_ce(C_eff:float, full:float)->str:
     if C_eff>=full: return 'Full'
@@ -154,13 +178,201 @@ def size_band_from_ce(C_eff:float, full:float)->str:
     return 'Watch'
 
 def read_state(data_dir:str)->dict:
-    try: return json.load(open(os.path.join(data_dir,'loop_state.json'),'r',encoding='utf-8'))
+    try: return load_json(os.path.join(data_dir,'loop_state.json'))
     except Exception: return {}
 def write_state(data_dir:str, state:dict):
-    try: open(os.path.join(data_dir,'loop_state.json'),'w',encoding='utf-8').write(json.dumps(state))
+    try:
+        with open(os.path.join(data_dir,'loop_state.json'),'wb') as f:
+            f.write(dumps_line(state))
     except Exception: pass
 
-def main():
+# coc_stats.json changes rarely: reparse only when its mtime moves
+_coc_cache={'path': None, 'mtime': None, 'decile': None}
+
+def get_decile(data_dir:str)->int|None:
+    """Regime decile from coc_stats.json; None if the file is missing or unreadable."""
+    path=os.path.join(data_dir,'coc_stats.json')
+    try: mtime=os.stat(path).st_mtime_ns
+    except OSError: return None
+    if _coc_cache['path']!=path or _coc_cache['mtime']!=mtime:
+        try: decile=int(load_json(path).get('decile'))
+        except Exception: decile=None
+        _coc_cache.update(path=path, mtime=mtime, decile=decile)
+    return _coc_cache['decile']
+
+@dataclass(slots=True)
+class DecisionInputs:
+    """Everything decide() looks at: this cycle's BTC numbers plus the CLI thresholds."""
+    C_eff: float
+    angle: float
+    volume_ratio: float
+    tech_sign: int
+    coh: float
+    herald_ok: bool
+    trap_T: float
+    decile: int|None
+    starve_cnt: int
+    strong_ceff_enter_quiet: float
+    strong_ceff_enter_active: float
+    strong_angle_min: float
+    strong_angle_max: float
+    vol_enter: float
+    coh_enter: float
+    trap_cutoff: float
+    lite_enable: bool
+    lite_angle_max: float
+    lite_ceff_enter: float
+    lite_coh_enter: float
+    lite_vol_enter: float
+    lite_rescue_min_vol: float
+    lite_starve_cycles: int|None
+
+@dataclass(slots=True)
+class Decision:
+    signal: str
+    w_code: str
+    mode: str
+    size_band: str
+    gate_note: str
+    checks: Dict[str,bool]
+    failed_checks: List[str]
+    hard_gate_reason: str|None
+    thr_full: float
+    amin: float
+    amax: float
+    tf_ok: bool
+    lite_guard_ok: bool
+    conditions_ready: bool
+
+def decide(d:DecisionInputs)->Decision:
+    """Strong checks, trap veto, LITE rescue and size band. Pure: no I/O, no args."""
+    thr_full = d.strong_ceff_enter_quiet if d.volume_ratio < 1.0 else d.strong_ceff_enter_active
+    amin=d.strong_angle_min; amax=d.strong_angle_max
+
+    # regime-aware angle tweaks (optional)
+    if d.decile is not None:
+        if d.decile>=7: amax=min(amax,35.0)
+        elif d.decile<=2: amax=min(60.0, amax+10.0); amin=max(0.0, amin-5.0)
+
+    tf_ok      = (d.tech_sign!=0)
+
+    phase_strong_ok = (d.angle <= amax)  # min angle covered in checks
+    checks={
+        'ceff':   (d.C_eff>=thr_full),
+        'phase':  bool(phase_strong_ok),
+        'volume': (d.volume_ratio>=d.vol_enter),
+        'coh':    (d.coh>d.coh_enter),
+        'tf':     bool(tf_ok),
+        'herald': bool(d.herald_ok)
+    }
+    trap_veto=(d.trap_T > d.trap_cutoff) and (not d.herald_ok)
+    if trap_veto:
+        checks['trap_veto']=False
+
+    strong_ok=all(checks.values())
+    signal=('BUY' if d.tech_sign>=0 else 'SELL') if strong_ok else 'WATCH'
+    w_code='strong' if strong_ok else 'weak_zone'; mode='strong' if strong_ok else 'baseline'
+    gate_note = 'strong_full' if strong_ok else 'watch_checks'
+
+    # -------- LITE rescue (tightened) --------
+    lite_guard_ok = True if d.lite_starve_cycles is None else (d.starve_cnt >= d.lite_starve_cycles)
+
+    if (not strong_ok) and d.lite_enable:
+        amax_l=d.lite_angle_max
+        if d.decile is not None and d.decile>=7: amax_l=min(amax_l,35.0)
+
+        ang_l_ok = (d.angle <= amax_l)  # low-angle capture
+        # Tightened rescue: require at least lite_rescue_min_vol with Herald & TF
+        vol_rescue_ok = (d.volume_ratio >= d.lite_rescue_min_vol) and d.herald_ok and tf_ok
+        vol_l_ok = (d.volume_ratio >= d.lite_vol_enter) or vol_rescue_ok
+        ceff_l_thr = d.lite_ceff_enter if (d.volume_ratio >= d.lite_vol_enter) else max(35.0, d.lite_ceff_enter - 6.0)
+
+        checks_l={
+            'ceff': (d.C_eff>=ceff_l_thr),
+            'phase': bool(ang_l_ok),
+            'volume': bool(vol_l_ok),
+            'coh': (d.coh>d.lite_coh_enter),
+            'tf': bool(tf_ok),
+            'herald': bool(d.herald_ok),
+            'starve_guard': bool(lite_guard_ok)
+        }
+        if (not trap_veto) and all(checks_l.values()):
+            signal=('BUY' if d.tech_sign>=0 else 'SELL'); w_code='lite'; mode='lite'
+            gate_note='lite_rescue' if vol_rescue_ok else 'lite_default'
+
+    size_band = 'Half' if mode=='lite' else size_band_from_ce(d.C_eff, thr_full)
+
+    failed_checks=[k for k,v in checks.items() if v is False]
+    hard_gate_reason = None
+    if trap_veto: hard_gate_reason='trap_veto'
+    elif failed_checks:
+        for k in ('phase','ceff','volume','tf','coh','herald'):
+            if k in failed_checks: hard_gate_reason=k; break
+
+    conditions_ready=bool((d.volume_ratio>=1.0) and (d.trap_T <= d.trap_cutoff) and d.herald_ok and tf_ok)
+    return Decision(signal=signal, w_code=w_code, mode=mode, size_band=size_band, gate_note=gate_note,
+                    checks=checks, failed_checks=failed_checks, hard_gate_reason=hard_gate_reason,
+                    thr_full=thr_full, amin=amin, amax=amax, tf_ok=tf_ok,
+                    lite_guard_ok=bool(lite_guard_ok), conditions_ready=conditions_ready)
+
+CSV_HEADER=['timestamp_utc','asset','price','C_eff','phase_angle_deg','volume_ratio','signal','size_band','mode','trap_T']
+
+SINK_BUFFER = 65536
+
+class Sinks:
+    """Append-only outputs of a cycle: run CSV, decisions JSONL (+ _skipped), heartbeat.
+    Handles open on first use (64 KiB buffers) and stay open until close(), so --serve
+    reuses them; callers flush() at cycle end. JSONL/heartbeat take pre-encoded bytes."""
+    def __init__(self, args):
+        self.args=args; self._fp={}; self._csv=None
+    def _open(self, path:str, mode:str='ab', **kw):
+        fp=self._fp.get(path)
+        if fp is None:
+            ensure_dir(path); fp=self._fp[path]=open(path,mode,buffering=SINK_BUFFER,**kw)
+        return fp
+    def csv_row(self, row:list):
+        if self._csv is None:
+            fp=self._open(self.args.csv,'a',newline='')
+            self._csv=csv.writer(fp)
+            if os.path.getsize(self.args.csv)==0: self._csv.writerow(CSV_HEADER)
+        self._csv.writerow(row)
+    def jsonl(self, line:bytes, skipped:bool=False):
+        path=self.args.jsonl.replace('.jsonl','_skipped.jsonl') if skipped else self.args.jsonl
+        self._open(path).write(line+b'\n')
+    def heartbeat(self, line:bytes):
+        self._open(self.args.heartbeat).write(line+b'\n')
+    def flush(self):
+        for fp in self._fp.values(): fp.flush()
+    def close(self):
+        for fp in self._fp.values(): fp.close()
+        self._fp.clear(); self._csv=None
+
+# fastgate WATCH record: static fields fixed here, None slots filled per cycle
+# (keys listed in output order; dict.update keeps it)
+_FASTGATE_TEMPLATE={
+    'timestamp_utc': None,
+    'asset': 'BTC',
+    'signal': 'WATCH',
+    'size_band': 'Watch',           # <— NEW explicit
+    'mode': 'baseline',             # <— explicit
+    'reason': 'volume_low_fastgate',
+    'is_watch': True,
+    'volume_ratio': None,
+    'phase_angle_deg': None,
+    'trap_T': None,
+    'herald_ok': None,
+    'leaders_ok': None,
+    'flows_ok': None,
+    'lane': None,
+    'experiment_id': None,
+    'checks_values': None,
+    'failed_checks': ['volume'],
+    'hard_gate_reason': 'volume',
+    'conditions_ready': False,
+    'gate_note': 'watch_fastgate'
+}
+
+def build_parser()->argparse.ArgumentParser:
     ap=argparse.ArgumentParser()
     ap.add_argument('--agents_dir',default='C:/OPRT/agents')
     ap.add_argument('--csv',default='C:/OPRT/logs/mirror_loop_unified_run.csv')
@@ -205,11 +417,46 @@ def main():
     ap.add_argument('--trap_cutoff',type=float,default=0.80)
     ap.add_argument('--log_all',action='store_true',default=False)
     ap.add_argument('--lite_starve_cycles',type=int,default=None)
-    args=ap.parse_args()
+    ap.add_argument('--serve',action='store_true',default=False)  # persistent worker: one cycle per stdin line
+    return ap
+
+# per-cycle overrides accepted on stdin in --serve mode
+_SERVE_KEYS=('sentiment_index','volume_ratio','flows','price')
+
+def serve(args, sinks:Sinks):
+    """Parse args once, then run one cycle per stdin line; each line is an optional JSON
+    object overriding sentiment_index / volume_ratio / flows / price for that cycle."""
+    for line in sys.stdin:
+        line=line.strip()
+        try:
+            ov=json.loads(line) if line else {}
+            if not isinstance(ov, dict): raise ValueError('not an object')
+            cyc=argparse.Namespace(**vars(args))
+            for k in _SERVE_KEYS:
+                v=ov.get(k)
+                if v is None: continue
+                setattr(cyc, k, v if k=='flows' and isinstance(v,str) else json.dumps(v) if k=='flows' else float(v))
+        except Exception as e:
+            print(f'[SERVE] bad input ignored ({e}): {line[:80]}', file=sys.stderr); continue
+        try:
+            run_cycle(cyc, sinks)
+        except Exception as e:
+            print(f'[SERVE] cycle failed: {e!r}', file=sys.stderr)
+        sinks.flush(); sys.stdout.flush()
 
+def main():
+    args=build_parser().parse_args()
     if args.pressure_mode is not None:
         args.pressure_gate = args.pressure_mode
+    sinks=Sinks(args)
+    try:
+        if args.serve: serve(args, sinks)
+        else: run_cycle(args, sinks)
+    finally:
+        sinks.close()
 
+def run_cycle(args, sinks:Sinks):
+    ts=now_iso_utc()   # one timestamp for every record this cycle writes
     up_mult   = 0.05 if args.flows_up_short_mult   is None else float(args.flows_up_short_mult)
     down_mult = 0.05 if args.flows_down_long_mult is None else float(args.flows_down_long_mult)
     si_mult   = 0.25 if args.si_conflict_mult is None else float(args.si_conflict_mult)
@@ -217,14 +464,17 @@ def main():
         si_mult = float(args.si_conflict_multiplier)
 
     # Agents load (mock if missing)
+    # phase vectors land straight in two (N,5) SoA matrices, BTC in row 0
     agentA={}; agentB={}
-    for asset in ASSETS:
-        a=os.path.join(args.agents_dir,f'{asset}_A.json'); b=os.path.join(args.agents_dir,f'{asset}_B.json')
-        if os.path.exists(a) and os.path.exists(b):
-            aj=load_json(a); bj=load_json(b)
+    PA=np.empty((len(ASSETS),5)); PB=np.empty((len(ASSETS),5))
+    pairs=load_agent_pairs(args.agents_dir)
+    for i,asset in enumerate(ASSETS):
+        if asset in pairs:
+            aj,bj=pairs[asset]
         else:
+            # mock vectors are fixed at import and shared by every missing asset
             aj=mock_agent_json(True); bj=mock_agent_json(False)
-        agentA[asset]=AgentOut.from_json(aj); agentB[asset]=AgentOut.from_json(bj)
+        agentA[asset]=AgentOut.from_json(aj, PA[i]); agentB[asset]=AgentOut.from_json(bj, PB[i])
 
     A=agentA['BTC']
     if args.sentiment_index is not None: A.sentiment_index=args.sentiment_index
@@ -232,157 +482,88 @@ def main():
     if args.flows:
         try: A.flows.update(json.loads(args.flows))
         except Exception: pass
-    if args.flows_file and os.path.exists(args.flows_file):
-        try: A.flows.update(json.load(open(args.flows_file,'r',encoding='utf-8')))
+    if args.flows_file:
+        try: A.flows.update(load_json(args.flows_file))   # missing/bad file -> ignored
         except Exception: pass
 
-    # Coherence + global alignment
-    delta_by_asset={a:(agentA[a].phase_vector-agentB[a].phase_vector) for a in ASSETS}
-    btc_delta=delta_by_asset['BTC']
-    C_raw=c_raw_from_delta(btc_delta,kappa=args.kappa)
-    global_vec,_Cglob=global_vector_and_metrics(delta_by_asset)
-    angle=phase_angle_deg(btc_delta,global_vec)
-    C_loc,align_note=apply_global_alignment(C_raw,angle)
-
+    # herald inputs, computed once per cycle
+    # (flows can be overridden above, so they are encoded here rather than at load)
+    _oi, _liq = flow_signs(A.flows)
     leaders_ok = (A.leaders.get("ETH")=="+") or (A.leaders.get("SOL")=="+")
-    flows_ok   = (A.flows.get("oi","").lower()=="up") and (A.flows.get("liq_skew","").lower()=="short")
+    flows_ok   = (_oi==1) and (_liq==1)
     herald_ok  = bool(leaders_ok or flows_ok)
+
+    # Coherence + global alignment
+    # one subtract for all assets; the kernel does std/mean/angle in a single pass
+    delta=PA-PB
+    C_raw_all,global_vec,_Cglob,angle_all=coherence_kernel(delta, float(args.kappa))
+    C_loc_all,align_idx=apply_global_alignment(C_raw_all,angle_all)
+    # decisions are BTC-driven (row 0); plain floats keep the `is False` checks honest
+    C_raw=float(C_raw_all[0]); angle=float(angle_all[0]); C_loc=float(C_loc_all[0])
+    align_note=_ALIGN_NOTES[align_idx[0]]
+
     trap_T_fg  = float(round(trap_probability(A.volume_ratio), 3))
 
     # FASTGATE (volume low) -> explicit WATCH
     if float(A.volume_ratio) < 0.80:
-        ensure_dir(args.csv); new_csv = not os.path.exists(args.csv)
-        with open(args.csv,'a',newline='') as fp:
-            w=csv.writer(fp)
-            if new_csv:
-                w.writerow(['timestamp_utc','asset','price','C_eff','phase_angle_deg','volume_ratio','signal','size_band','mode','trap_T'])
-            w.writerow([now_iso_utc(),'BTC',None,round(C_loc,3),round(angle,2),float(A.volume_ratio),
-                        'WATCH','Watch','baseline',trap_T_fg])
-
-        out = {
-            'timestamp_utc': now_iso_utc(),
-            'asset': 'BTC',
-            'signal': 'WATCH',
-            'size_band': 'Watch',           # <— NEW explicit
-            'mode': 'baseline',             # <— explicit
-            'reason': 'volume_low_fastgate',
-            'is_watch': True,
+        sinks.csv_row([ts,'BTC',None,round(C_loc,3),round(angle,2),float(A.volume_ratio),
+                       'WATCH','Watch','baseline',trap_T_fg])
+
+        out=_FASTGATE_TEMPLATE.copy()
+        lane=args.experiment_id or 'baseline'
+        out.update({
+            'timestamp_utc': ts,
             'volume_ratio': float(A.volume_ratio),
             'phase_angle_deg': round(angle, 2),
             'trap_T': trap_T_fg,
             'herald_ok': bool(herald_ok),
             'leaders_ok': bool(leaders_ok),
             'flows_ok': bool(flows_ok),
-            'lane': (args.experiment_id or 'baseline'),
-            'experiment_id': (args.experiment_id or 'baseline'),
+            'lane': lane,
+            'experiment_id': lane,
             'checks_values': {
-                'ceff':  {'thr': (args.strong_ceff_enter_quiet if A.volume_ratio < 1.0 else args.strong_ceff_enter_active)},
+                'ceff':  {'thr': args.strong_ceff_enter_quiet},   # fastgate implies vol < 1.0 (quiet)
                 'phase': {'thr_min': args.strong_angle_min, 'thr_max': args.strong_angle_max},
                 'volume':{'thr': args.vol_enter}
             },
-            'failed_checks': ['volume'],
-            'hard_gate_reason': 'volume',
-            'conditions_ready': False,
-            'gate_note': 'watch_fastgate'
-        }
-        ensure_dir(args.jsonl)
-        open(args.jsonl,'a',encoding='utf-8').write(json.dumps(out)+'\n')
-        open(args.jsonl.replace('.jsonl','_skipped.jsonl'),'a',encoding='utf-8').write(json.dumps(out)+'\n')
+        })
+        blob=dumps_line(out)
+        sinks.jsonl(blob); sinks.jsonl(blob, skipped=True)
         print(f'[WHY] fastgate volume_low | vol={A.volume_ratio:.3f}')
         return
 
     # Tech & gates
-    tech_sign=tech_bias_sign_from_tf(A.tf_alignment)
+    tech_sign=tech_bias_sign_from_tf(A.signs)
     g_tech, tech_detail=compute_tech_detail(A, args.price if math.isfinite(args.price) else float('nan'))
-    g_volume=gate_volume(A.volume_ratio)
-    g_tf=gate_tf(tech_sign)
-    g_sent=gate_sentiment_conflict(A.sentiment_index, tech_sign, args.si_conflict_threshold, si_mult)
-    g_flow=gate_flows(A.flows, up_short_mult=up_mult, down_long_mult=down_mult)
+    # volume / tf / sentiment / flow gates and the C_eff product in one kernel call
+    C_eff,g_volume,g_tf,g_sent,g_flow=map(float, gates_kernel(
+        C_loc, g_tech, float(A.volume_ratio), _VOL_EDGES, _VOL_MULTS, tech_sign,
+        float(A.sentiment_index), float(args.si_conflict_threshold), si_mult,
+        _oi, _liq, up_mult, down_mult))
     trap_T=float(round(trap_probability(A.volume_ratio),3))
-    C_eff=C_loc*g_volume*g_tf*g_sent*g_flow*g_tech
-
-    thr_full = args.strong_ceff_enter_quiet if A.volume_ratio < 1.0 else args.strong_ceff_enter_active
-    amin=args.strong_angle_min; amax=args.strong_angle_max
-
-    # regime-aware angle tweaks (optional)
-    try:
-        cstats_path=os.path.join(args.data_dir,'coc_stats.json')
-        if os.path.exists(cstats_path):
-            decile=int(json.load(open(cstats_path,'r',encoding='utf-8')).get('decile'))
-            if decile>=7: amax=min(amax,35.0)
-            elif decile<=2: amax=min(60.0, amax+10.0); amin=max(0.0, amin-5.0)
-    except Exception:
-        pass
-
-    leaders_ok = (A.leaders.get("ETH")=="+") or (A.leaders.get("SOL")=="+")
-    flows_ok   = (A.flows.get("oi","").lower()=="up") and (A.flows.get("liq_skew","").lower()=="short")
-    herald_ok  = bool(leaders_ok or flows_ok)
-    tf_ok      = (tech_sign!=0)
-
-    phase_strong_ok = (angle <= amax)  # min angle covered in checks
-    checks={
-        'ceff':   (C_eff>=thr_full),
-        'phase':  bool(phase_strong_ok),
-        'volume': (A.volume_ratio>=args.vol_enter),
-        'coh':    (tech_detail['coh']>args.coh_enter),
-        'tf':     bool(tf_ok),
-        'herald': bool(herald_ok)
-    }
-    trap_veto=(trap_T > float(args.trap_cutoff)) and (not herald_ok)
-    if trap_veto:
-        checks['trap_veto']=False
-
-    strong_ok=all(checks.values())
-    signal=('BUY' if tech_sign>=0 else 'SELL') if strong_ok else 'WATCH'
-    w_code='strong' if strong_ok else 'weak_zone'; mode='strong' if strong_ok else 'baseline'
-    gate_note = 'strong_full' if strong_ok else 'watch_checks'
 
-    # -------- LITE rescue (tightened) --------
-    lite_ok=False
     state = read_state(args.data_dir)
     starve_cnt = int(state.get('starve_cnt', 0)) if isinstance(state, dict) else 0
-    lite_guard_ok = True if args.lite_starve_cycles is None else (starve_cnt >= int(args.lite_starve_cycles))
 
-    if (not strong_ok) and bool(args.lite_enable):
-        amin_l=args.lite_angle_min; amax_l=args.lite_angle_max
-        try:
-            if 'decile' in locals() and decile>=7: amax_l=min(amax_l,35.0)
-        except Exception:
-            pass
-
-        ang_l_ok = (angle <= amax_l)  # low-angle capture
-        # Tightened rescue: require at least lite_rescue_min_vol with Herald & TF
-        vol_rescue_ok = (A.volume_ratio >= float(args.lite_rescue_min_vol)) and herald_ok and tf_ok
-        vol_l_ok = (A.volume_ratio >= args.lite_vol_enter) or vol_rescue_ok
-        ceff_l_thr = args.lite_ceff_enter if (A.volume_ratio >= args.lite_vol_enter) else max(35.0, args.lite_ceff_enter - 6.0)
-
-        checks_l={
-            'ceff': (C_eff>=ceff_l_thr),
-            'phase': bool(ang_l_ok),
-            'volume': bool(vol_l_ok),
-            'coh': (tech_detail['coh']>args.lite_coh_enter),
-            'tf': bool(tf_ok),
-            'herald': bool(herald_ok),
-            'starve_guard': bool(lite_guard_ok)
-        }
-        lite_ok=(not trap_veto) and all(checks_l.values())
-        if lite_ok:
-            signal=('BUY' if tech_sign>=0 else 'SELL'); w_code='lite'; mode='lite'
-            gate_note='lite_rescue' if vol_rescue_ok else 'lite_default'
-
-    size_band = 'Half' if mode=='lite' else size_band_from_ce(C_eff, thr_full)
-
-    print(f"[EXP] {args.experiment_id or 'baseline'} | mode={mode} | vol={A.volume_ratio:.3f} | angle={angle:.2f} | Ceff={C_eff:.2f} | gates(vol={g_volume:.2f},tech={g_tech:.2f},sent={g_sent:.2f},flow={g_flow:.2f}) | TFok={tf_ok} Herald={herald_ok} | trapT={trap_T} | align={align_note} | {gate_note}")
-
-    failed_checks=[k for k,v in checks.items() if v is False]
-    hard_gate_reason = None
-    if trap_veto: hard_gate_reason='trap_veto'
-    elif failed_checks:
-        for k in ('phase','ceff','volume','tf','coh','herald'):
-            if k in failed_checks: hard_gate_reason=k; break
+    dec=decide(DecisionInputs(
+        C_eff=C_eff, angle=angle, volume_ratio=A.volume_ratio, tech_sign=tech_sign,
+        coh=tech_detail['coh'], herald_ok=herald_ok, trap_T=trap_T,
+        decile=get_decile(args.data_dir), starve_cnt=starve_cnt,
+        strong_ceff_enter_quiet=args.strong_ceff_enter_quiet,
+        strong_ceff_enter_active=args.strong_ceff_enter_active,
+        strong_angle_min=args.strong_angle_min, strong_angle_max=args.strong_angle_max,
+        vol_enter=args.vol_enter, coh_enter=args.coh_enter,
+        trap_cutoff=float(args.trap_cutoff), lite_enable=bool(args.lite_enable),
+        lite_angle_max=args.lite_angle_max, lite_ceff_enter=args.lite_ceff_enter,
+        lite_coh_enter=args.lite_coh_enter, lite_vol_enter=args.lite_vol_enter,
+        lite_rescue_min_vol=float(args.lite_rescue_min_vol),
+        lite_starve_cycles=None if args.lite_starve_cycles is None else int(args.lite_starve_cycles)))
+    signal=dec.signal; mode=dec.mode
+
+    print(f"[EXP] {args.experiment_id or 'baseline'} | mode={mode} | vol={A.volume_ratio:.3f} | angle={angle:.2f} | Ceff={C_eff:.2f} | gates(vol={g_volume:.2f},tech={g_tech:.2f},sent={g_sent:.2f},flow={g_flow:.2f}) | TFok={dec.tf_ok} Herald={herald_ok} | trapT={trap_T} | align={align_note} | {dec.gate_note}")
 
     summary={
-        'timestamp_utc': now_iso_utc(),
+        'timestamp_utc': ts,
         'asset':'BTC',
         'kappa': float(args.kappa),
         'experiment_id': (args.experiment_id or 'baseline'),
@@ -392,8 +573,8 @@ def main():
         'flows_ok': bool(flows_ok),
         'herald_ok': bool(herald_ok),
         'signal': signal,
-        'w_code': w_code,
-        'size_band': size_band,
+        'w_code': dec.w_code,
+        'size_band': dec.size_band,
         'mode': mode,
         'C_eff': round(C_eff,3),
         'phase_angle_deg': round(angle,2),
@@ -404,36 +585,30 @@ def main():
         'tech_coh': float(tech_detail['coh']),
         'tech_sdir': float(tech_detail['S_dir']),
         'checks_values': {
-            'ceff': {'actual': round(C_eff,3),'thr': thr_full},
-            'phase': {'actual': round(angle,2),'thr_min': amin,'thr_max': amax},
+            'ceff': {'actual': round(C_eff,3),'thr': dec.thr_full},
+            'phase': {'actual': round(angle,2),'thr_min': dec.amin,'thr_max': dec.amax},
             'volume': {'actual': round(A.volume_ratio,3),'thr': args.vol_enter},
             'coh': {'actual': round(tech_detail['coh'],3),'thr': args.coh_enter}
         },
         'assets_present': ",".join(ASSETS),
         'starve_cnt': starve_cnt,
-        'lite_guard_ok': bool(lite_guard_ok),
-        'gate_note': gate_note
+        'lite_guard_ok': dec.lite_guard_ok,
+        'gate_note': dec.gate_note
     }
-    summary['conditions_ready']=bool((A.volume_ratio>=1.0) and (trap_T <= float(args.trap_cutoff)) and herald_ok and tf_ok)
+    summary['conditions_ready']=dec.conditions_ready
     if signal=='WATCH':
-        summary['failed_checks']= failed_checks
-        if hard_gate_reason: summary['hard_gate_reason']= hard_gate_reason
+        summary['failed_checks']= dec.failed_checks
+        if dec.hard_gate_reason: summary['hard_gate_reason']= dec.hard_gate_reason
 
     # CSV + JSONL write
-    ensure_dir(args.csv)
-    csv_exists=os.path.exists(args.csv)
-    with open(args.csv,'a' if csv_exists else 'w',newline='') as fp:
-        w=csv.writer(fp)
-        if not csv_exists:
-            w.writerow(['timestamp_utc','asset','price','C_eff','phase_angle_deg','volume_ratio','signal','size_band','mode','trap_T'])
-        w.writerow([summary['timestamp_utc'],'BTC',summary['price'],summary['C_eff'],
-                    summary['phase_angle_deg'],summary['volume_ratio'],summary['signal'],
-                    summary['size_band'],summary['mode'],summary['trap_T']])
-
-    ensure_dir(args.jsonl)
-    open(args.jsonl,'a',encoding='utf-8').write(json.dumps(summary,ensure_ascii=False)+'\n')
+    sinks.csv_row([summary['timestamp_utc'],'BTC',summary['price'],summary['C_eff'],
+                   summary['phase_angle_deg'],summary['volume_ratio'],summary['signal'],
+                   summary['size_band'],summary['mode'],summary['trap_T']])
+
+    blob=dumps_line(summary)   # encoded once, shared by both files
+    sinks.jsonl(blob)
     if summary.get('signal')=='WATCH':
-        open(args.jsonl.replace('.jsonl','_skipped.jsonl'),'a',encoding='utf-8').write(json.dumps(summary,ensure_ascii=False)+'\n')
+        sinks.jsonl(blob, skipped=True)
 
     # state & heartbeat
     try:
@@ -441,8 +616,8 @@ def main():
         write_state(args.data_dir, state_next)
     except Exception: pass
     try:
-        hb=json.dumps({'ts':now_iso_utc(),'strong': 1 if signal!='WATCH' else 0,'exp':args.experiment_id,'C_eff':summary['C_eff']})
-        ensure_dir(args.heartbeat); open(args.heartbeat,'a',encoding='utf-8').write(hb+'\n')
+        hb=dumps_line({'ts':ts,'strong': 1 if signal!='WATCH' else 0,'exp':args.experiment_id,'C_eff':summary['C_eff']})
+        sinks.heartbeat(hb)
     except Exception: pass
 
 if __name__=='__main__':
@@ -15,9 +15,19 @@ OPRT EOD Supervisor — v1.20 (ENGINE-ALIGNED + DIAGNOSTICS)
 
 from __future__ import annotations
 from pathlib import Path
-import argparse, csv, json, sys, math
-from collections import defaultdict, Counter
+import argparse, calendar, csv, json, mmap, os, re, sys, math
+from collections import defaultdict, Counter, deque
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+import numpy as np
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None  # NumPy bucket path below
 
 # --------------- CLI ---------------
 def parse_args():
@@ -48,33 +58,75 @@ def parse_args():
 # --------------- IO helpers ---------------
 def _p(p): return Path(p)
 
-def read_jsonl(fp: Path, n=200000) -> list[dict]:
+def _loads(b: bytes):
+    # orjson on raw bytes; anything it rejects (bad utf-8, NaN/Infinity) gets the old lenient path
+    if orjson is not None:
+        try: return orjson.loads(b)
+        except Exception: pass
+    return json.loads(b.decode("utf-8", errors="replace"))
+
+def _dumps(obj, indent=False) -> bytes:
+    if orjson is not None:
+        try: return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except Exception: pass   # e.g. ints beyond 64 bit: stdlib handles them
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+def read_jsonl_window(fp: Path, start_ts: float, end_ts: float, n=200000) -> list[dict]:
+    """Records among the last n of fp whose timestamp is in [start_ts, end_ts).
+    The window test runs as each line is parsed, so out-of-window rows are never kept."""
     if not fp or not fp.exists(): return []
-    out=[]
-    with fp.open("r", encoding="utf-8", errors="replace") as fh:
-        for line in fh:
-            s=line.strip()
-            if not s: continue
-            try: out.append(json.loads(s))
-            except: pass
-    return out[-n:]
+    hits=deque(maxlen=n); total=0   # only the last n hits can survive the tail cut
+    with fp.open("rb") as fh:
+        if fh.seek(0, 2) == 0: return []        # mmap refuses empty files
+        # mapped, not read: pages come in as the newline scan (memchr) reaches them
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos=0; end=len(mm)
+            while pos < end:
+                nl=mm.find(b"\n", pos)
+                if nl < 0: nl=end          # last record without a trailing newline
+                s=mm[pos:nl].strip()
+                pos=nl+1
+                if not s: continue
+                try: r=_loads(s)
+                except: continue
+                total+=1
+                ep=row_epoch(r)
+                if ep is not None and start_ts <= ep < end_ts: hits.append((total, r))
+    # tail cut: ordinals > total-n are the last n parsed records
+    first=total-n
+    return [r for i,r in hits if i > first]
 
 def load_optional_json(fp: Path):
     if not fp or not fp.exists(): return None
-    try: return json.loads(fp.read_text(encoding="utf-8", errors="replace"))
+    try: return _loads(fp.read_bytes())
     except Exception: return None
 
-def path_age_minutes(fp: Path):
-    try:
-        if not fp or not fp.exists(): return None
-        now = datetime.now(timezone.utc).timestamp()
-        return round((now - fp.stat().st_mtime)/60.0, 1)
+def path_age_minutes(fp: Path, now: float | None = None):
+    # one stat() per path; a missing file raises and maps to None like before
+    if not fp: return None
+    try: mtime = os.stat(fp).st_mtime
     except Exception: return None
+    if now is None: now = datetime.now(timezone.utc).timestamp()
+    return round((now - mtime)/60.0, 1)
 
 def to_epoch(ts):
     if ts is None:
         return None
-    s = str(ts).strip()
+    return _epoch_of(str(ts).strip())
+
+# the shape the engine writes: UTC with Z (or +00:00), optional fraction
+_ISO_UTC = re.compile(r"(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:\.(\d+))?(?:Z|\+00:00)")
+
+@lru_cache(maxsize=200_000)
+def _epoch_of(s: str):
+    # engine rows repeat timestamps (strong + skipped copies), so each string parses once
+    m = _ISO_UTC.fullmatch(s)
+    if m:
+        y,mo,d,H,M,S = map(int, m.groups()[:6])
+        if y >= 1 and 1 <= mo <= 12 and 1 <= d <= calendar.monthrange(y, mo)[1] and H < 24 and M < 60 and S < 60:
+            us = int((m.group(7) or "")[:6].ljust(6, "0"))
+            # same arithmetic as datetime.timestamp(): whole microseconds / 1e6
+            return (calendar.timegm((y,mo,d,H,M,S,0,0,0)) * 10**6 + us) / 10**6
     try:
         return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc).timestamp()
     except Exception:
@@ -92,6 +144,9 @@ def to_epoch(ts):
     except Exception:
         return None
 
+def row_epoch(r: dict):
+    return to_epoch(r.get("timestamp_utc") or r.get("ts_utc") or r.get("timestamp"))
+
 def day_bounds_utc(day_str: str | None, tz_name: str):
     try:
         import zoneinfo
@@ -109,15 +164,31 @@ def day_bounds_utc(day_str: str | None, tz_name: str):
     return start_local.astimezone(timezone.utc).timestamp(), end_local.astimezone(timezone.utc).timestamp()
 
 def f(x, default=None):
+    # numbers and missing values skip the try/except; only odd inputs pay for an exception
+    t=type(x)
+    if t is float or t is int: return float(x)
+    if x is None: return default
     try: return float(x)
     except Exception: return default
 
+_TRUTHY = frozenset(("1","true","yes","y","t"))
+
 def to_bool(x):
-    if isinstance(x,bool): return x
-    return str(x).strip().lower() in ("1","true","yes","y","t")
+    # common JSON types skip the str() round-trip; ints keep the old "1"-only rule
+    t=type(x)
+    if t is bool: return x
+    if x is None: return False
+    if t is int: return x == 1
+    if t is str: return x.strip().lower() in _TRUTHY
+    return str(x).strip().lower() in _TRUTHY
+
+_P_KEYS = ("P","pressure","p")
 
 def compute_p(r: dict):
-    for k in ("P","pressure","p"):
+    # engine rows carry a numeric "P": clamp it directly, no probing/try
+    v=r.get("P"); t=type(v)
+    if t is float or t is int: return max(-1.0, min(1.0, float(v)))
+    for k in _P_KEYS:
         if k in r:
             try:
                 pv = float(r.get(k))
@@ -125,10 +196,24 @@ def compute_p(r: dict):
             except: pass
     return None
 
+def herald_of(r: dict) -> bool:
+    return to_bool(r.get("herald_ok")) if "herald_ok" in r else (to_bool(r.get("leaders_ok")) or to_bool(r.get("flows_ok")))
+
+# --------------- columnar view (SoA) ---------------
+_SOA_FIELDS = (("ce","C_eff"), ("ang","phase_angle_deg"), ("vr","volume_ratio"), ("trap","trap_T"), ("tech","tech_coh"))
+
+def rows_to_soa(rows) -> dict[str, np.ndarray]:
+    """One float64 column per gate field (missing/unparseable -> NaN), P via compute_p, bool herald."""
+    n=len(rows)
+    soa={k: np.fromiter((f(r.get(key), math.nan) for r in rows), dtype=np.float64, count=n) for k,key in _SOA_FIELDS}
+    soa["p"]=np.fromiter((math.nan if pv is None else pv for pv in map(compute_p, rows)), dtype=np.float64, count=n)
+    soa["herald"]=np.fromiter(map(herald_of, rows), dtype=bool, count=n)
+    return soa
+
 # ---------------- ENGINE-ALIGNED GATES ----------------
-def strong_zone_ok(r: dict, pv: float | None):
+def strong_zone_mask(soa: dict) -> np.ndarray:
     """
-    Engine-aligned strong-zone:
+    Engine-aligned strong-zone, one bool per row:
       - Dynamic full_cut: 66 if vol>=1.0 else 70
       - Phase 15–45°
       - Volume >= 1.00
@@ -136,61 +221,120 @@ def strong_zone_ok(r: dict, pv: float | None):
       - Pressure OPTIONAL: only gate when pv is provided and |pv|<0.20
       - tech_coh is DIAGNOSTIC ONLY
     """
-    ce=f(r.get("C_eff")); ang=f(r.get("phase_angle_deg")); vr=f(r.get("volume_ratio"))
-    trap=f(r.get("trap_T"))
-    herald = to_bool(r.get("herald_ok")) if "herald_ok" in r else (to_bool(r.get("leaders_ok")) or to_bool(r.get("flows_ok")))
-    if None in (ce,ang,vr): return False
-
-    full_cut = 66.0 if (vr is not None and vr >= 1.0) else 70.0
-    if ce < full_cut: return False
-    if ang < 15 or ang > 45: return False
-    if vr < 1.00: return False
-
-    # Engine-style trap veto (no generic herald requirement)
-    if (trap is not None and trap >= 0.60) and (not herald):
-        return False
-
-    # Pressure optional
-    if pv is not None and abs(pv) < 0.20:
-        return False
-
-    return True
-
-def gate_fail_tags(r: dict, pv: float | None):
+    ce=soa["ce"]; ang=soa["ang"]; vr=soa["vr"]; trap=soa["trap"]; pv=soa["p"]; herald=soa["herald"]
+    full_cut = np.where(vr >= 1.0, 66.0, 70.0)
+    with np.errstate(invalid="ignore"):   # NaN compares False: missing ce/ang/vr fail below
+        ok = (ce >= full_cut) & (ang >= 15) & (ang <= 45) & (vr >= 1.00)
+        # Engine-style trap veto (no generic herald requirement)
+        ok &= ~((trap >= 0.60) & ~herald)
+        # Pressure optional
+        ok &= ~(np.abs(pv) < 0.20)
+    return ok
+
+def gate_fail_tags(soa: dict) -> list[list[str]]:
     """
-    Diagnostic tags aligned to engine policy (dynamic C_eff and vol>=1.00).
+    Diagnostic tags per row, aligned to engine policy (dynamic C_eff and vol>=1.00).
     """
-    tags=[]
-    ce=f(r.get("C_eff")); ang=f(r.get("phase_angle_deg")); vr=f(r.get("volume_ratio"))
-    tech=f(r.get("tech_coh")); trap=f(r.get("trap_T"))
-    herald = to_bool(r.get("herald_ok")) if "herald_ok" in r else (to_bool(r.get("leaders_ok")) or to_bool(r.get("flows_ok")))
-
-    # Dynamic C_eff threshold by volume regime
-    full_cut = 66.0 if (vr is not None and vr >= 1.0) else 70.0
-    if ce is None or ce < full_cut: tags.append(f"C_eff<{int(full_cut)}")
-
-    if ang is None or ang < 15 or ang > 45: tags.append("angle_out")
-
-    # Volume gate aligned to engine enter
-    if vr is None or vr < 1.00: tags.append("vol<1.00")
-
-    # Herald/Trap diagnostics
-    if not herald: tags.append("herald_off")
-    if tech is not None and tech <= 0.60: tags.append("tech_coh_low")
-
-    # Pressure only tagged as fail when provided and small
-    if pv is not None and abs(pv) < 0.20: tags.append("|P|<0.20")
+    ce=soa["ce"]; ang=soa["ang"]; vr=soa["vr"]; trap=soa["trap"]; tech=soa["tech"]; pv=soa["p"]; herald=soa["herald"]
+    with np.errstate(invalid="ignore"):
+        active = vr >= 1.0                                   # dynamic C_eff threshold by volume regime
+        cols = (
+            (~(ce >= np.where(active, 66.0, 70.0))).tolist(),  # missing counts as a fail
+            (~((ang >= 15) & (ang <= 45))).tolist(),
+            (~(vr >= 1.00)).tolist(),                         # volume gate aligned to engine enter
+            (~herald).tolist(),
+            (tech <= 0.60).tolist(),
+            (np.abs(pv) < 0.20).tolist(),                     # pressure only when provided and small
+            (trap >= 0.60).tolist(),                          # trap info + veto documentation
+        )
+    out=[]
+    for act, ce_f, ang_f, vr_f, h_off, tech_f, p_f, trap_hi in zip(active.tolist(), *cols):
+        tags=[]
+        if ce_f: tags.append("C_eff<66" if act else "C_eff<70")
+        if ang_f: tags.append("angle_out")
+        if vr_f: tags.append("vol<1.00")
+        if h_off: tags.append("herald_off")
+        if tech_f: tags.append("tech_coh_low")
+        if p_f: tags.append("|P|<0.20")
+        if trap_hi: tags.append("trap_veto" if h_off else "trap_hi")
+        out.append(tags)
+    return out
+
+# --------------- buckets ---------------
+_CE_LABELS  = ("Ceff:<35", "Ceff:[35,55)", "Ceff:[55,70)", "Ceff:[70,90)", "Ceff:>=90", "Ceff:NA")
+_ANG_LABELS = ("Ang:<15", "Ang:15-45", "Ang:45-90", "Ang:>90", "Ang:NA")
+_VR_LABELS  = ("Vol:<1.00", "Vol:1.00-1.19", "Vol:1.20-1.29", "Vol:>=1.30", "Vol:NA")
+_TR_LABELS  = ("Trap:<0.30", "Trap:0.30-0.59", "Trap:>=0.60", "Trap:NA")
+_P_LABELS   = ("P:<0.10", "P:[0.10,0.20)", "P:[0.20,0.30)", "P:[0.30,0.50)", "P:>=0.50", "P:NA")
+_H_LABELS   = ("Herald:N", "Herald:Y")
+_TH_LABELS  = ("TrapLo", "TrapHi")
+
+def _codes(x: np.ndarray, *steps) -> np.ndarray:
+    # bucket index = number of thresholds passed; NaN -> last label (NA)
+    with np.errstate(invalid="ignore"):
+        code = np.zeros(len(x), dtype=np.int64)
+        for st in steps: code += st
+    code[np.isnan(x)] = len(steps) + 1
+    return code
+
+# pattern key: 4 bits per bucket field -> ce | ang<<4 | vr<<8 | p<<12 | herald<<16 | trap_hi<<17
+_CODE_COLS = ("ce", "ang", "vr", "trap", "p", "herald", "trap_hi")
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _label_kernel(ce, ang, vr, trap, p, herald):
+        n = ce.shape[0]
+        out = np.empty((n, 7), np.int8)
+        key = np.empty(n, np.int64)
+        for i in prange(n):
+            c = ce[i]; a = abs(ang[i]); v = vr[i]; t = trap[i]; q = abs(p[i])
+            b_ce = 5 if c != c else int(c >= 35) + int(c >= 55) + int(c >= 70) + int(c >= 90)
+            b_an = 4 if a != a else int(a >= 15) + int(a > 45) + int(a > 90)
+            b_vr = 4 if v != v else int(v >= 1.00) + int(v >= 1.20) + int(v >= 1.30)
+            b_tr = 3 if t != t else int(t >= 0.30) + int(t >= 0.60)
+            b_p  = 5 if q != q else int(q >= 0.10) + int(q >= 0.20) + int(q >= 0.30) + int(q >= 0.50)
+            b_h  = 1 if herald[i] else 0
+            b_th = 1 if t >= 0.60 else 0
+            out[i, 0] = b_ce; out[i, 1] = b_an; out[i, 2] = b_vr; out[i, 3] = b_tr
+            out[i, 4] = b_p;  out[i, 5] = b_h;  out[i, 6] = b_th
+            key[i] = b_ce | b_an << 4 | b_vr << 8 | b_p << 12 | b_h << 16 | b_th << 17
+        return out, key
+
+def bucket_codes(soa: dict) -> dict[str, np.ndarray]:
+    """Integer bucket label per row and field (index into the _*_LABELS tuples) + packed pattern key."""
+    if njit is not None:
+        out, key = _label_kernel(soa["ce"], soa["ang"], soa["vr"], soa["trap"], soa["p"], soa["herald"])
+        bc = {k: out[:, j] for j, k in enumerate(_CODE_COLS)}
+        bc["key"] = key
+        return bc
+    ce=soa["ce"]; vr=soa["vr"]; trap=soa["trap"]
+    ang=np.abs(soa["ang"]); ap=np.abs(soa["p"])
+    with np.errstate(invalid="ignore"):
+        bc = {
+            "ce":   _codes(ce, ce>=35, ce>=55, ce>=70, ce>=90),
+            "ang":  _codes(ang, ang>=15, ang>45, ang>90),
+            "vr":   _codes(vr, vr>=1.00, vr>=1.20, vr>=1.30),
+            "trap": _codes(trap, trap>=0.30, trap>=0.60),
+            "p":    _codes(ap, ap>=0.10, ap>=0.20, ap>=0.30, ap>=0.50),
+            "herald": soa["herald"].astype(np.int64),
+            "trap_hi": (trap >= 0.60).astype(np.int64),
+        }
+    bc["key"] = bc["ce"] | bc["ang"]<<4 | bc["vr"]<<8 | bc["p"]<<12 | bc["herald"]<<16 | bc["trap_hi"]<<17
+    return bc
 
-    # Trap info + veto documentation
-    if trap is not None and trap >= 0.60:
-        if not herald: tags.append("trap_veto")
-        else: tags.append("trap_hi")
+def classify(rows) -> dict:
+    """Everything the reports need per row, computed once: SoA columns, strong mask, fail tags, bucket codes."""
+    soa=rows_to_soa(rows)
+    return {"soa": soa, "strong_ok": strong_zone_mask(soa), "tags": gate_fail_tags(soa), "codes": bucket_codes(soa)}
 
-    return tags
+def _first_seen_counts(code: np.ndarray):
+    """(code, first_row, count) per distinct code; first_row keeps Counter tie order row-stable."""
+    u, first, cnt = np.unique(code, return_index=True, return_counts=True)
+    return zip(u.tolist(), first.tolist(), cnt.tolist())
 
 # --------------- LLM ---------------
 def try_llm(out_dir: Path, kpis: dict, patterns, buckets, ingest, model: str, max_tokens: int):
-    import os, json as _json, traceback
+    import os, traceback
     # API key from env OR fallback file
     key = os.getenv("OPENAI_API_KEY")
     if not key:
@@ -224,13 +368,13 @@ def try_llm(out_dir: Path, kpis: dict, patterns, buckets, ingest, model: str, ma
         prompt = (
             "You are the EOD supervisor for an OPRT mirror loop.\n"
             "Follow THESE engine thresholds exactly (do NOT propose angles <15°, or C_eff below Full cuts):\n"
-            f"{_json.dumps(thresholds)}\n\n"
+            f"{_dumps(thresholds).decode()}\n\n"
             "Using the JSON context, produce:\n"
             "1) DAILY SYNTHESIS (3–6 sentences) about C_eff, |P|, volume_ratio, trap, Strong-Zone coverage, ingests.\n"
             "2) STRATEGIC TASKING (1–3 actions) to improve accuracy tomorrow.\n"
             "3) MIRROR LOOP COORDINATION: Bull/Bear prompts for the next 1H/4H with volume & angle checks.\n"
             "4) RISK NOTE: anomalies/data gaps.\n\n"
-            f"Context:\n{_json.dumps(compact)}"
+            f"Context:\n{_dumps(compact).decode()}"
         )
         resp = client.chat.completions.create(
             model=model,
@@ -243,9 +387,10 @@ def try_llm(out_dir: Path, kpis: dict, patterns, buckets, ingest, model: str, ma
         (out_dir/"llm_advice.md").write_text(f"LLM error: {e}\n{traceback.format_exc()}", encoding="utf-8")
 
 # --------------- sweet-spot ---------------
-def sweet_spot_scan(rows):
+def sweet_spot_scan(soa: dict):
     """
     Scans coverage across engine-like grids (dynamic full threshold regime).
+    soa: rows_to_soa columns; the whole grid is one broadcast over rows.
     """
     import itertools
     Cgrid=[66,70]                 # engine dynamic full cuts
@@ -253,22 +398,26 @@ def sweet_spot_scan(rows):
     Vgrid=[1.00,1.15,1.20,1.30]   # include engine enter at 1.00
     Pgrid=[0.20,0.30]
     Tgrid=[0.60]
+    valid=~(np.isnan(soa["ce"]) | np.isnan(soa["ang"]) | np.isnan(soa["vr"]))
+    N=int(valid.sum())
+    if not N: return []
+    ce=soa["ce"][valid]; ang=soa["ang"][valid]; vr=soa["vr"][valid]; tech=soa["tech"][valid]
+    trap=soa["trap"][valid]; ap=np.abs(soa["p"][valid]); herald=soa["herald"][valid]
+    with np.errstate(invalid="ignore"):
+        # Engine-style veto & optional pressure
+        trap_ok = ~((trap>=0.60) & ~herald)
+        mC = ce[None,:] >= np.array(Cgrid, dtype=float)[:,None]
+        mA = np.stack([(ang>=lo) & (ang<=hi) for lo,hi in Agrid])
+        mV = vr[None,:] >= np.array(Vgrid)[:,None]
+        mP = np.isnan(ap)[None,:] | (ap[None,:] >= np.array(Pgrid)[:,None])
+        mT = (np.isnan(tech)[None,:] | (tech[None,:] >= np.array(Tgrid)[:,None])) & trap_ok
+    # (C,A,V,P,T) coverage counts
+    keep=(mC[:,None,None,None,None,:] & mA[None,:,None,None,None,:] & mV[None,None,:,None,None,:]
+          & mP[None,None,None,:,None,:] & mT[None,None,None,None,:,:]).sum(axis=-1)
     out=[]
-    for Cmin,(Amin,Amax),Vmin,Pmin,Tmin in itertools.product(Cgrid,Agrid,Vgrid,Pgrid,Tgrid):
-        keep=N=0
-        for r in rows:
-            ce=f(r.get("C_eff")); ang=f(r.get("phase_angle_deg")); vr=f(r.get("volume_ratio")); tech=f(r.get("tech_coh"))
-            herald = to_bool(r.get("herald_ok")) if "herald_ok" in r else (to_bool(r.get("leaders_ok")) or to_bool(r.get("flows_ok")))
-            trap=f(r.get("trap_T")); pv=compute_p(r)
-            if None in (ce,ang,vr): continue
-            N+=1
-            # Engine-style veto & optional pressure
-            trap_ok = not ((trap is not None and trap>=0.60) and (not herald))
-            p_ok = True if pv is None else (abs(pv) >= Pmin)
-            if ce>=Cmin and Amin<=ang<=Amax and vr>=Vmin and trap_ok and (tech is None or tech>=Tmin) and p_ok:
-                keep+=1
-        if N:
-            out.append({"Cmin":Cmin,"A":[Amin,Amax],"Vmin":Vmin,"Pmin":Pmin,"Tmin":Tmin,"coverage":keep/N})
+    for (ci,Cmin),(ai,(Amin,Amax)),(vi,Vmin),(pi,Pmin),(ti,Tmin) in itertools.product(
+            enumerate(Cgrid),enumerate(Agrid),enumerate(Vgrid),enumerate(Pgrid),enumerate(Tgrid)):
+        out.append({"Cmin":Cmin,"A":[Amin,Amax],"Vmin":Vmin,"Pmin":Pmin,"Tmin":Tmin,"coverage":int(keep[ci,ai,vi,pi,ti])/N})
     out.sort(key=lambda d:(-d["coverage"], d["Cmin"], -d["Pmin"]))
     return out[:10]
 
@@ -281,29 +430,21 @@ def main():
     out_dir = _p(ns.out) if ns.out else (root_out / stamp)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    strong_all = read_jsonl(_p(ns.jsonl))
-    weak_all   = read_jsonl(_p(ns.jsonl_skipped)) if ns.jsonl_skipped else []
-
-    # Daily Brussels slice
+    # Daily Brussels slice, filtered while parsing
     start_ts, end_ts = day_bounds_utc(ns.day_utc, ns.tz)
-    def in_window(r):
-        ep = to_epoch(r.get("timestamp_utc") or r.get("ts_utc") or r.get("timestamp"))
-        return (ep is not None) and (ep >= start_ts) and (ep < end_ts)
+    strong_fp = _p(ns.jsonl)
+    weak_fp   = _p(ns.jsonl_skipped) if ns.jsonl_skipped else None
+    strong = read_jsonl_window(strong_fp, start_ts, end_ts)
+    weak   = read_jsonl_window(weak_fp, start_ts, end_ts)
 
-    strong = [r for r in strong_all if in_window(r)]
-    weak   = [r for r in weak_all   if in_window(r)]
-
-    # Auto-widen if empty
+    # Auto-widen if empty (second read only in this case)
     widened = False
     if (len(strong) + len(weak)) == 0:
         widened = True
         end_ts = datetime.now(timezone.utc).timestamp()
         start_ts = end_ts - 48*3600.0
-        def in_window2(r):
-            ep = to_epoch(r.get("timestamp_utc") or r.get("ts_utc") or r.get("timestamp"))
-            return (ep is not None) and (ep >= start_ts) and (ep < end_ts)
-        strong = [r for r in strong_all if in_window2(r)]
-        weak   = [r for r in weak_all   if in_window2(r)]
+        strong = read_jsonl_window(strong_fp, start_ts, end_ts)
+        weak   = read_jsonl_window(weak_fp, start_ts, end_ts)
 
     data_dir = _p(ns.data_dir)
     flows_fp    = _p(ns.flows) if ns.flows else (data_dir/"flows_btc.json")
@@ -311,6 +452,8 @@ def main():
     senti_fp    = _p(ns.sentiment_index) if ns.sentiment_index else (data_dir/"sentiment_index.txt")
     headlines_fp= data_dir/"headlines.csv"
     heartbeat_fp= _p(ns.heartbeat)
+    now_ts = datetime.now(timezone.utc).timestamp()
+    ages = {fp: path_age_minutes(fp, now_ts) for fp in (headlines_fp, senti_fp, flows_fp, pressure_fp, heartbeat_fp)}
     coc_summary_fp = _p(ns.data_dir).parent / "derived" / "coc_summary.json"
     coc = load_optional_json(coc_summary_fp)
 
@@ -328,80 +471,64 @@ def main():
     except: pass
 
     ingest = {
-        "headlines_csv_age_mins": path_age_minutes(headlines_fp),
-        "sentiment_index_age_mins": path_age_minutes(senti_fp),
-        "flows_btc_age_mins": path_age_minutes(flows_fp),
-        "pressure_btc_age_mins": path_age_minutes(pressure_fp),
+        "headlines_csv_age_mins": ages[headlines_fp],
+        "sentiment_index_age_mins": ages[senti_fp],
+        "flows_btc_age_mins": ages[flows_fp],
+        "pressure_btc_age_mins": ages[pressure_fp],
         "sentiment_index_value": senti_v,
         "engine_heartbeat": hb_line
     }
 
     # aggregate
-    def metrics(rows):
+    def metrics(rows, cls):
+        soa=cls["soa"]; bc=cls["codes"]
         agg=defaultdict(float); cnt=defaultdict(int)
-        buckets=Counter(); patterns=Counter(); strong_hits=0
-        size_mix=Counter(); wcode_mix=Counter()
-        for r in rows:
-            ce=f(r.get("C_eff")); ang=f(r.get("phase_angle_deg")); vr=f(r.get("volume_ratio"))
-            trap=f(r.get("trap_T")); tech=f(r.get("tech_coh")); pv=compute_p(r)
-            herald = to_bool(r.get("herald_ok")) if "herald_ok" in r else (to_bool(r.get("leaders_ok")) or to_bool(r.get("flows_ok")))
-            size_mix[str(r.get("size_band",""))]+=1
-            wcode_mix[str(r.get("w_code",""))]+=1
-            if ce is not None:   agg["C_eff_sum"]+=ce; cnt["C_eff"]+=1
-            if ang is not None:  agg["angle_sum"]+=ang; cnt["angle"]+=1
-            if vr is not None:   agg["vr_sum"]+=vr;    cnt["vr"]+=1
-            if trap is not None: agg["trap_sum"]+=trap;cnt["trap"]+=1
-            if tech is not None: agg["tech_sum"]+=tech;cnt["tech"]+=1
-            if pv is not None:   agg["P_sum"]+=pv;     cnt["P"]+=1
-            def b_ce(c):
-                if c is None: return "Ceff:NA"
-                c=float(c);
-                return "Ceff:>=90" if c>=90 else "Ceff:[70,90)" if c>=70 else "Ceff:[55,70)" if c>=55 else "Ceff:[35,55)" if c>=35 else "Ceff:<35"
-            def b_ang(a):
-                if a is None: return "Ang:NA"
-                a=abs(float(a));
-                return "Ang:<15" if a<15 else "Ang:15-45" if a<=45 else "Ang:45-90" if a<=90 else "Ang:>90"
-            def b_vr(v):
-                if v is None: return "Vol:NA"
-                v=float(v);
-                return "Vol:>=1.30" if v>=1.30 else "Vol:1.20-1.29" if v>=1.20 else "Vol:1.00-1.19" if v>=1.00 else "Vol:<1.00"
-            def b_tr(t):
-                if t is None: return "Trap:NA"
-                t=float(t);
-                return "Trap:>=0.60" if t>=0.60 else "Trap:0.30-0.59" if t>=0.30 else "Trap:<0.30"
-            def b_p(p):
-                if p is None: return "P:NA"
-                ap=abs(float(p));
-                return "P:>=0.50" if ap>=0.50 else "P:[0.30,0.50)" if ap>=0.30 else "P:[0.20,0.30)" if ap>=0.20 else "P:[0.10,0.20)" if ap>=0.10 else "P:<0.10"
-            buckets[b_ce(ce)] += 1; buckets[b_ang(ang)] += 1; buckets[b_vr(vr)] += 1; buckets[b_tr(trap)] += 1; buckets[b_p(pv)] += 1
-            buckets["Herald:" + ("Y" if herald else "N")] += 1
-            patt=[b_ce(ce), b_ang(ang), b_vr(vr), b_p(pv), "Herald:"+("Y" if herald else "N"),
-                  ("TrapHi" if (trap is not None and trap>=0.60) else "TrapLo")]
-            patterns[" | ".join(patt)] += 1
-            if strong_zone_ok(r, pv): strong_hits += 1
+        for name,col in (("C_eff",soa["ce"]),("angle",soa["ang"]),("vr",soa["vr"]),
+                         ("trap",soa["trap"]),("tech",soa["tech"]),("P",soa["p"])):
+            c=int(np.count_nonzero(~np.isnan(col)))
+            if c: agg[name+"_sum"]=float(np.nansum(col)); cnt[name]=c
+
+        # Counters filled in first-seen row order (then field order), as the row loop did
+        ent=[]
+        for pos,(k,labels) in enumerate((("ce",_CE_LABELS),("ang",_ANG_LABELS),("vr",_VR_LABELS),
+                                         ("trap",_TR_LABELS),("p",_P_LABELS),("herald",_H_LABELS))):
+            ent += [(first,pos,labels[c],n) for c,first,n in _first_seen_counts(bc[k])]
+        buckets=Counter()
+        for _,_,lab,n in sorted(ent): buckets[lab]=n
+
+        patterns=Counter()
+        for k,_,n in sorted(_first_seen_counts(bc["key"]), key=lambda t: t[1]):
+            patt=[_CE_LABELS[k&15], _ANG_LABELS[(k>>4)&15], _VR_LABELS[(k>>8)&15], _P_LABELS[(k>>12)&15],
+                  _H_LABELS[(k>>16)&1], _TH_LABELS[(k>>17)&1]]
+            patterns[" | ".join(patt)]=n
+
+        size_mix=Counter(str(r.get("size_band","")) for r in rows)
+        wcode_mix=Counter(str(r.get("w_code","")) for r in rows)
+        strong_hits=int(cls["strong_ok"].sum())
         return {"agg":agg,"cnt":cnt,"buckets":buckets,"patterns":patterns,"strong_hits":strong_hits,"n":len(rows),
-                "size_mix":size_mix,"wcode_mix":wcode_mix}
+                "size_mix":size_mix,"wcode_mix":wcode_mix,
+                # sorted once; CSV writers and the LLM context share these lists
+                "buckets_sorted":buckets.most_common(),"patterns_sorted":patterns.most_common()}
 
-    S = metrics(strong)
-    W = metrics(weak)
+    S_cls = classify(strong)
+    W_cls = classify(weak)
+    S = metrics(strong, S_cls)
+    W = metrics(weak, W_cls)
 
     # Weak fail tags (legacy)
     GF = Counter()
-    for r in weak:
-        for t in gate_fail_tags(r, compute_p(r)):
+    for tags in W_cls["tags"]:
+        for t in tags:
             GF[t] += 1
 
     # Strong rows audit (new)
     strong_fail = []
     strong_pass = []
     SF = Counter()
-    for r in strong:
-        pv = compute_p(r)
-        ok = strong_zone_ok(r, pv)
+    for r, ok, reasons in zip(strong, S_cls["strong_ok"].tolist(), S_cls["tags"]):
         if ok:
             strong_pass.append(r)
         else:
-            reasons = gate_fail_tags(r, pv)
             for t in reasons: SF[t] += 1
             rcopy = {k:r.get(k) for k in ("timestamp_utc","signal","size_band","price","phase_angle_deg","C_eff","volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","tech_coh")}
             rcopy["reasons"] = reasons
@@ -434,66 +561,64 @@ def main():
 
     with (out_dir/"ingest_freshness.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["artifact","age_mins","notes"])
-        w.writerow(["headlines.csv", path_age_minutes(_p(ns.data_dir)/"headlines.csv"), ""])
-        w.writerow(["sentiment_index.txt", path_age_minutes(_p(ns.sentiment_index) if ns.sentiment_index else _p(ns.data_dir)/"sentiment_index.txt"), ""])
-        w.writerow(["flows_btc.json", path_age_minutes(_p(ns.flows) if ns.flows else _p(ns.data_dir)/"flows_btc.json"), ""])
-        w.writerow(["pressure_btc.json", path_age_minutes(_p(ns.pressure) if ns.pressure else _p(ns.data_dir)/"pressure_btc.json"), ""])
-        w.writerow(["engine_heartbeat.txt", path_age_minutes(_p(ns.heartbeat)), ""])
+        w.writerows([
+            ["headlines.csv", ages[headlines_fp], ""],
+            ["sentiment_index.txt", ages[senti_fp], ""],
+            ["flows_btc.json", ages[flows_fp], ""],
+            ["pressure_btc.json", ages[pressure_fp], ""],
+            ["engine_heartbeat.txt", ages[heartbeat_fp], ""],
+        ])
 
     with (out_dir/"strong_vs_weak.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["bucket","strong_count","weak_count"])
         allk=set(S["buckets"])|set(W["buckets"])
-        for k in sorted(allk):
-            w.writerow([k, S["buckets"].get(k,0), W["buckets"].get(k,0)])
+        w.writerows([k, S["buckets"].get(k,0), W["buckets"].get(k,0)] for k in sorted(allk))
 
     # Mixes
     with (out_dir/"size_mix.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["size_band","count"])
-        for k,cnt in S["size_mix"].most_common(): w.writerow([k,cnt])
+        w.writerows(S["size_mix"].most_common())
     with (out_dir/"w_code_mix.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["w_code","count"])
-        for k,cnt in S["wcode_mix"].most_common(): w.writerow([k,cnt])
+        w.writerows(S["wcode_mix"].most_common())
 
     # Buckets & patterns
     with (out_dir/"bucket_stats.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["bucket","count"])
-        for k,cnt in S["buckets"].most_common(): w.writerow([k,cnt])
+        w.writerows(S["buckets_sorted"])
     with (out_dir/"pattern_counts.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["pattern","count"])
-        for k,cnt in S["patterns"].most_common(): w.writerow([k,cnt])
+        w.writerows(S["patterns_sorted"])
 
     # Weak gate fails (legacy) + Strong gate fails (new)
     with (out_dir/"gate_fail_leaderboard.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["tag","count"])
-        for tag,cnt in Counter(GF).most_common(): w.writerow([tag,cnt])
+        w.writerows(GF.most_common())
     with (out_dir/"strong_fail_leaderboard.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["tag","count"])
-        for tag,cnt in Counter(SF).most_common(): w.writerow([tag,cnt])
+        w.writerows(SF.most_common())
 
-    # Strong details
-    def write_details(fp, rows):
-        if not rows:
-            Path(fp).write_text("", encoding="utf-8"); return
-        cols = ["timestamp_utc","signal","size_band","price","phase_angle_deg","C_eff","volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","tech_coh","reasons"]
+    # Strong details: csv's C writer, one row list per record; reasons is joined once per row
+    detail_cols = ["timestamp_utc","signal","size_band","price","phase_angle_deg","C_eff","volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","tech_coh"]
+    def write_details(fp, rows, with_reasons):
         with open(fp, "w", encoding="utf-8", newline="") as fh:
-            w=csv.writer(fh); w.writerow(cols)
-            for r in rows:
-                w.writerow([r.get(c) if c!="reasons" else "|".join(r.get("reasons",[])) for c in cols])
-
-    write_details(out_dir/"strong_fail_details.csv", strong_fail)
+            w=csv.writer(fh)
+            if with_reasons:
+                w.writerow(detail_cols + ["reasons"])
+                w.writerows([*map(r.get, detail_cols), "|".join(r.get("reasons",[]))] for r in rows)
+            else:
+                w.writerow(detail_cols)
+                w.writerows(list(map(r.get, detail_cols)) for r in rows)
+
+    if strong_fail: write_details(out_dir/"strong_fail_details.csv", strong_fail, True)
+    else: (out_dir/"strong_fail_details.csv").write_text("", encoding="utf-8")
     # For passes, record without "reasons"
-    if strong_pass:
-        cols = ["timestamp_utc","signal","size_band","price","phase_angle_deg","C_eff","volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","tech_coh"]
-        with open(out_dir/"strong_pass_details.csv", "w", encoding="utf-8", newline="") as fh:
-            w=csv.writer(fh); w.writerow(cols)
-            for r in strong_pass:
-                w.writerow([r.get(c) for c in cols])
-
-    sweet = sweet_spot_scan(strong+weak)
+    if strong_pass: write_details(out_dir/"strong_pass_details.csv", strong_pass, False)
+
+    sweet = sweet_spot_scan({k: np.concatenate([S_cls["soa"][k], W_cls["soa"][k]]) for k in S_cls["soa"]})
     with (out_dir/"sweet_spot_candidates.csv").open("w", encoding="utf-8", newline="") as fh:
         w=csv.writer(fh); w.writerow(["Cmin","Amin","Amax","Vmin","Pmin","Tmin","coverage"])
-        for d in sweet:
-            w.writerow([d["Cmin"], d["A"][0], d["A"][1], d["Vmin"], d["Pmin"], d["Tmin"], d["coverage"]])
+        w.writerows([d["Cmin"], d["A"][0], d["A"][1], d["Vmin"], d["Pmin"], d["Tmin"], d["coverage"]] for d in sweet)
 
     best = {
         "strong_zone": {
@@ -507,43 +632,42 @@ def main():
         },
         "notes": "Auto-proposal from today's coverage sweet-spot scan (engine-aligned)."
     }
-    (out_dir/"best_params.json").write_text(json.dumps(best, indent=2), encoding="utf-8")
+    (out_dir/"best_params.json").write_bytes(_dumps(best, indent=True))
 
-    with (out_dir/"signal_audits.jsonl").open("w", encoding="utf-8") as fh:
+    with (out_dir/"signal_audits.jsonl").open("wb") as fh:
         for r in strong[-100:]:
-            fh.write(json.dumps(r, ensure_ascii=False) + "\n")
+            fh.write(_dumps(r) + b"\n")
 
     # Markdown summary
-    (out_dir/"unified_report.md").write_text(
-        "# OPRT EOD Report ({} UTC)\n\nWindow: {} ? {}\n\n{}\n\n## Daily KPIs\n"
-        "- samples_strong: {}\n- samples_weak: {}\n"
-        "- C_eff_avg_strong: {}\n- P_avg_strong: {}\n"
-        "- strong_zone_coverage: {}  (passes/strong = {}/{})\n"
-        "- size_mix: Full={} Half={} Quarter={}\n\n"
-        "## Ingest Freshness (minutes)\n"
-        "- headlines.csv age: {} min\n- sentiment_index.txt age: {} min (value={})\n"
-        "- flows_btc.json age: {} min\n- pressure_btc.json age: {} min\n"
-        "- engine_heartbeat: {}\n".format(
-            datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M"),
-            datetime.fromtimestamp(start_ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M"),
-            datetime.fromtimestamp(end_ts,   tz=timezone.utc).strftime("%Y-%m-%d %H:%M"),
-            ("**[Auto-widened to last 48h due to empty day window]**\n" if (len(strong)+len(weak)==0) else ""),
-            kpis["samples_strong"], kpis["samples_weak"],
-            kpis["C_eff_avg_strong"], kpis["P_avg_strong"],
-            (round(100.0* (len(strong_pass)/S["n"]),1) if S["n"] else None),
-            len(strong_pass), S["n"],
-            kpis["count_full"], kpis["count_half"], kpis["count_quarter"],
-            path_age_minutes(_p(ns.data_dir)/"headlines.csv"),
-            path_age_minutes(_p(ns.sentiment_index) if ns.sentiment_index else _p(ns.data_dir)/"sentiment_index.txt"), (senti_v or ""),
-            path_age_minutes(_p(ns.flows) if ns.flows else _p(ns.data_dir)/"flows_btc.json"),
-            path_age_minutes(_p(ns.pressure) if ns.pressure else _p(ns.data_dir)/"pressure_btc.json"),
-            (hb_line or "n/a")
-        ),
-        encoding="utf-8"
-    )
+    hm = lambda ts: datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+    coverage = round(100.0* (len(strong_pass)/S["n"]),1) if S["n"] else None
+    lines = [
+        f"# OPRT EOD Report ({datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC)",
+        "",
+        f"Window: {hm(start_ts)} → {hm(end_ts)}",
+        "",
+        ("**[Auto-widened to last 48h due to empty day window]**\n" if (len(strong)+len(weak)==0) else ""),
+        "",
+        "## Daily KPIs",
+        f"- samples_strong: {kpis['samples_strong']}",
+        f"- samples_weak: {kpis['samples_weak']}",
+        f"- C_eff_avg_strong: {kpis['C_eff_avg_strong']}",
+        f"- P_avg_strong: {kpis['P_avg_strong']}",
+        f"- strong_zone_coverage: {coverage}  (passes/strong = {len(strong_pass)}/{S['n']})",
+        f"- size_mix: Full={kpis['count_full']} Half={kpis['count_half']} Quarter={kpis['count_quarter']}",
+        "",
+        "## Ingest Freshness (minutes)",
+        f"- headlines.csv age: {ages[headlines_fp]} min",
+        f"- sentiment_index.txt age: {ages[senti_fp]} min (value={senti_v or ''})",
+        f"- flows_btc.json age: {ages[flows_fp]} min",
+        f"- pressure_btc.json age: {ages[pressure_fp]} min",
+        f"- engine_heartbeat: {hb_line or 'n/a'}",
+        "",
+    ]
+    (out_dir/"unified_report.md").write_text("\n".join(lines), encoding="utf-8")
 
     if ns.with_llm:
-        try_llm(out_dir, kpis, list(S["patterns"].most_common()), list(S["buckets"].most_common()),
+        try_llm(out_dir, kpis, S["patterns_sorted"], S["buckets_sorted"],
                 ingest, ns.llm_model, ns.llm_max_tokens)
 
     print("[OK] EOD wrote:", out_dir)
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 # OPRT Sweet-Spot Finder — targets 65–75% over last H hours (default 48h)
-import json, math
+import itertools, json, math, mmap, os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import pandas as pd
 import argparse
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
 
 def parse_args():
     ap = argparse.ArgumentParser()
@@ -16,150 +22,295 @@ def parse_args():
     ap.add_argument("--min_labelled", type=int, default=20, help="min rows required to accept a config")
     ap.add_argument("--experiment_id", default=None, help="optional filter to a specific variant id")
     ap.add_argument("--outname", default="best_params_48h.json")
+    ap.add_argument("--search", choices=("full","two_stage"), default="full",
+                    help="full grid, or coarse end-point grid then refine around the top 5")
+    ap.add_argument("--fast_ingest", action="store_true",
+                    help="bisect the (time-ordered) decisions log to the window start instead of parsing it all")
+    ap.add_argument("--n_jobs", type=int, default=1, help="grid worker processes (1 = in-process, -1 = all cores)")
     return ap.parse_args()
 
-def load_jsonl(p: Path) -> pd.DataFrame:
+def _loads_line(b: bytes):
+    # orjson on the raw bytes; anything it rejects (bad UTF-8, NaN literals, ...) gets the old text path
+    if orjson is not None:
+        try: return orjson.loads(b)
+        except Exception: pass
+    return json.loads(b.decode("utf-8", errors="ignore").strip())
+
+def _line_epoch(b: bytes):
+    # timestamp_utc of one JSONL line as epoch seconds (naive = UTC); None if unusable
+    try:
+        dt = datetime.fromisoformat(str(_loads_line(b)["timestamp_utc"]).replace("Z", "+00:00"))
+        return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+    except Exception:
+        return None
+
+def _window_offset(mm, since: float, block: int = 1 << 16) -> int:
+    """Line-start byte offset that no record with ts >= since precedes, found by bisecting
+    on line timestamps. Assumes the log is appended in time order (the engine's writes)."""
+    lo, hi = 0, len(mm)
+    while hi - lo > block:
+        mid = (lo + hi) // 2
+        pos = mm.find(b"\n", mid) + 1
+        ts = None
+        while 0 < pos < hi:                      # first parseable line after mid
+            end = mm.find(b"\n", pos)
+            if end < 0: end = len(mm)
+            ts = _line_epoch(mm[pos:end])
+            if ts is not None: break
+            pos = end + 1
+        if ts is not None and ts < since: lo = pos   # everything before this line is older
+        else: hi = mid
+    return lo
+
+def load_jsonl(p: Path, since: Optional[float] = None) -> pd.DataFrame:
+    """Parse the decisions log. With `since` (epoch s), skip the part of the file that
+    bisection shows is older than the window instead of parsing all of it."""
     rows=[]
     if not p.exists(): return pd.DataFrame()
-    with p.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s=line.strip()
-            if not s: continue
-            try: rows.append(json.loads(s))
-            except: pass
+    if since is None:
+        data = p.read_bytes()
+    else:
+        with p.open("rb") as fh:
+            if fh.seek(0, 2) == 0: return pd.DataFrame()   # mmap refuses empty files
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = mm[_window_offset(mm, since):]
+    for line in data.splitlines():
+        if not line.strip(): continue
+        try: rows.append(_loads_line(line))
+        except: pass
     return pd.DataFrame(rows)
 
-def prep_df(root: Path, hours: int) -> pd.DataFrame:
+def prep_df(root: Path, hours: int, fast_ingest: bool = False) -> pd.DataFrame:
     logs = root / "logs"
     dec  = logs / "mirror_loop_unified_decisions.jsonl"
     csvp = logs / "mirror_loop_unified_run.csv"
 
-    df = load_jsonl(dec)
+    end = datetime.now(timezone.utc); start = end - timedelta(hours=hours)
+    df = load_jsonl(dec, since=start.timestamp() if fast_ingest else None)
     if df.empty: return df
-    df = df.copy()
     df["ts"] = pd.to_datetime(df.get("timestamp_utc"), errors="coerce", utc=True)
-    end = datetime.now(timezone.utc); start = end - timedelta(hours=hours)
-    df = df[(df["ts"]>=start) & (df["ts"]<end)].copy()
-
-    # DEDUP per snapshot (prevents multi-writes inflating counts)
-    if not df.empty:
-        df = df.drop_duplicates(subset=[
-            'timestamp_utc','signal','mode','size_band','price','C_eff','phase_angle_deg'
-        ], keep='last')
+    # stable time sort once (duplicate snapshots keep their file order for the dedup below),
+    # then the window is a binary-searched slice instead of a full-length mask
+    df = df[df["ts"].notna()].sort_values("ts", kind="mergesort")
+    i0, i1 = df["ts"].searchsorted([pd.Timestamp(start), pd.Timestamp(end)])
+    df = df.iloc[i0:i1].copy()
 
-    # Fill price from CSV if missing
+    # Fill price from CSV if missing: ts-indexed lookup (last CSV row per ts), no merge.
+    # Runs before the dedup so price can take part in the snapshot key.
     if "price" not in df.columns and csvp.exists():
         try:
-            csv_df = pd.read_csv(csvp)
-            csv_df["ts"] = pd.to_datetime(csv_df["timestamp_utc"], errors="coerce", utc=True)
-            keep = csv_df[["ts","price"]].dropna()
-            df = df.merge(keep, on="ts", how="left", suffixes=("","_csv"))
-            df["price"] = df["price"].fillna(df["price_csv"])
-            df.drop(columns=["price_csv"], inplace=True, errors="ignore")
+            # two columns, ts kept as text (no per-column type inference), then one ISO8601 pass
+            csv_df = pd.read_csv(csvp, usecols=["timestamp_utc","price"], dtype={"timestamp_utc": str})
+            csv_df["ts"] = pd.to_datetime(csv_df["timestamp_utc"], errors="coerce", utc=True, format="ISO8601")
+            keep = csv_df.dropna(subset=["ts","price"]).drop_duplicates("ts", keep="last")
+            df["price"] = df["ts"].map(keep.set_index("ts")["price"])
         except Exception:
             pass
 
-    df = df.sort_values("ts").reset_index(drop=True)
-    for h in (1,4,12):
-        df[f"price_next_{h}h"] = df["price"].shift(-h)
+    # DEDUP per snapshot (prevents multi-writes inflating counts): one uint64 hash per row
+    # over the snapshot key, then keep the last writer of each hash
+    if not df.empty:
+        key = pd.util.hash_pandas_object(df[[
+            'timestamp_utc','signal','mode','size_band','price','C_eff','phase_angle_deg'
+        ]], index=False)
+        df = df[~key.duplicated(keep='last').to_numpy()]
+
+    df = df.reset_index(drop=True)
+    # next snapshot's price, taken before any experiment filter; only the 1h horizon is scored
+    p = num(df["price"]); nxt = np.full_like(p, np.nan)
+    nxt[:-1] = p[1:]
+    df["price_next_1h"] = nxt
+    # low-cardinality labels as categoricals: integer codes for the experiment filter and side masks
+    for c in ("signal","mode","size_band","experiment_id"):
+        if c in df: df[c] = df[c].astype("category")
     return df
 
-def within(x, lo, hi):
-    try: 
-        x = float(x)
-        return (x>=float(lo)) and (x<=float(hi))
-    except: 
-        return False
-
-def label_hit(row, friction_bps: float=5.0) -> Tuple[float, float]:
-    """Return (pnl_1h_bps, hit_1h) where hit_1h is 1/0/np.nan."""
-    sig = row.get("signal")
-    p0, p1 = row.get("price"), row.get("price_next_1h")
+def num(col) -> np.ndarray:
+    """float64 view of a column; None / non-numeric -> NaN (what float() rejected before)."""
+    return pd.to_numeric(col, errors="coerce").to_numpy(dtype=float)
+
+def _engine_thr(cv):
+    # checks_values.ceff.thr as float; None when absent/unusable (row falls back to the volume default)
     try:
-        p0f=float(p0); p1f=float(p1)
-        if not np.isfinite(p0f) or not np.isfinite(p1f) or p0f==0.0:
-            return (np.nan, np.nan)
+        thr = cv.get("ceff", {}).get("thr")
+        return float(thr) if thr is not None else None
     except Exception:
-        return (np.nan, np.nan)
-
-    raw = ((p1f/p0f)-1.0)*1e4 - float(friction_bps)
-    if sig == "BUY":
-        pnl = raw
-        hit = float(1.0 if pnl>0 else 0.0)
-    elif sig == "SELL":
-        pnl = raw  # SELL wins if pnl>0 after sign flip in sim below (we’ll flip earlier)
-        # For symmetry, treat SELL as positive when price went down; we already flip later.
-        hit = float(1.0 if pnl>0 else 0.0)
+        return None
+
+def full_thr_rows(df: pd.DataFrame, default_active=66.0, default_quiet=70.0) -> np.ndarray:
+    """Per-row full cut: prefer the engine's own threshold if present, else 66 (vol>=1.0) / 70."""
+    n = len(df)
+    if "volume_ratio" in df:
+        vr = df["volume_ratio"]
+        if pd.api.types.is_numeric_dtype(vr):
+            vr = vr.to_numpy(dtype=float)
+            vr = np.where(vr == 0.0, 1.0, vr)   # `vr or 1.0`: a zero ratio counts as active; NaN stays quiet
+        else:
+            vr = np.array([float(v or 1.0) for v in vr], dtype=float)
     else:
-        return (np.nan, np.nan)
-    return (pnl, hit)
+        vr = np.ones(n)
+    thr = np.where(vr >= 1.0, default_active, default_quiet)
+    if "checks_values" in df:
+        eng = [_engine_thr(cv) for cv in df["checks_values"]]
+        has = np.fromiter((t is not None for t in eng), dtype=bool, count=n)
+        thr[has] = [t for t in eng if t is not None]
+    return thr
 
-def row_full_thr(r, default_active=66.0, default_quiet=70.0) -> float:
-    # Prefer the engine's own threshold if present
-    try:
-        thr = r.get("checks_values", {}).get("ceff", {}).get("thr")
-        if thr is not None: return float(thr)
-    except Exception: pass
-    vr = float(r.get("volume_ratio", 1.0) or 1.0)
-    return float(default_active if vr >= 1.0 else default_quiet)
-
-def simulate(df: pd.DataFrame, params: dict, friction_bps: float) -> Tuple[pd.DataFrame, float]:
-    """Return (labelled_df, hit_1h_pct) for a param set applied to the *existing directions*."""
-    if df.empty: return pd.DataFrame(), None
-    s = df.copy()
-
-    # SIDE (direction) taken from engine signal (BUY/SELL only)
-    side_ok = s["signal"].isin(["BUY","SELL"])
-
-    # STRONG mask: replicate policy gates with candidate thresholds
-    phase_ok = s["phase_angle_deg"].apply(lambda a: within(a, params["angle_min"], params["angle_max"]))
-    trap_ok  = ~( (s.get("trap_T",1.0).astype(float) > params["trap_cutoff"]) & (~s.get("herald_ok",False).astype(bool)) )
-
-    # C_eff entry uses either row-aware thr or candidate full_cut (pick stricter of the two to avoid overfit)
-    ce_row = s.get("C_eff",-1).astype(float)
-    ce_thr_row = s.apply(lambda r: row_full_thr(r), axis=1).astype(float)
-    ce_thr_use = np.maximum(ce_thr_row.values, float(params["full_cut"]))
-    ce_ok  = ce_row.values >= ce_thr_use
-
-    strong_mask = side_ok & phase_ok & trap_ok & ce_ok
-
-    # LITE rescue (Half) — only when strong failed
-    lite_angle_ok = s["phase_angle_deg"].apply(lambda a: within(a, params["lite_angle_min"], params["lite_angle_max"]))
-    lite_vol_ok   = s.get("volume_ratio",0).astype(float) >= params["lite_vol"]
-    lite_herald   = (s.get("herald_ok",False).astype(bool)) | (s.get("leaders_ok",False).astype(bool)) | (s.get("flows_ok",False).astype(bool))
-    lite_mask     = (~strong_mask) & side_ok & lite_angle_ok & lite_vol_ok & lite_herald & trap_ok
-
-    selected = s[strong_mask | lite_mask].copy()
-    if selected.empty: 
-        return selected, None
-
-    # Label hits (direction already decided by engine’s signal)
-    pnls, hits = [], []
-    for _, r in selected.iterrows():
-        pnl, hit = label_hit(r, friction_bps=friction_bps)
-        # Flip sign for SELL so that positive means "correct"
-        if r.get("signal")=="SELL" and np.isfinite(pnl):
-            pnl = abs(pnl)
-        pnls.append(pnl); hits.append(hit)
-    selected["pnl_1h_bps"] = pnls
-    selected["hit_1h"] = hits
-
-    lab = selected[selected["hit_1h"].notna()]
-    hit = float(lab["hit_1h"].mean()*100) if len(lab)>0 else None
-    return lab, hit
+_POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
 
-def pick_config(results: List[Dict[str,Any]], target=(65.0,75.0), min_n=20):
+def pack(mask: np.ndarray) -> np.ndarray:
+    """bool[N] -> zero-padded uint64[ceil(N/64)] bitmap: mask ANDs touch 64 rows per word."""
+    b = np.packbits(mask)
+    pad = (-b.size) % 8
+    if pad: b = np.concatenate([b, np.zeros(pad, dtype=np.uint8)])
+    return b.view(np.uint64)
+
+def popcount(bits: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return int(np.bitwise_count(bits).sum())
+    return int(_POP8[bits.view(np.uint8)].sum(dtype=np.int64))
+
+@dataclass(slots=True)
+class SimCtx:
+    """Param-independent per-row arrays, built once before the grid sweep."""
+    side_ok: np.ndarray      # BUY/SELL rows
+    phase: np.ndarray        # phase_angle_deg, NaN when missing/non-numeric
+    ceff: np.ndarray
+    ce_thr_row: np.ndarray   # engine ceff thr, else 66/70 by volume
+    vol: np.ndarray
+    trap_T: np.ndarray
+    herald_ok: np.ndarray
+    lite_herald: np.ndarray  # herald | leaders | flows
+    good: np.ndarray         # bitmap: finite price and next price, p0 != 0
+    win: np.ndarray          # bitmap: good & signed 1h move net of friction > 0
+    masks: dict = field(default_factory=dict)   # per-dimension gate bitmaps, filled by simulate()
+
+def prep_simulate_ctx(df: pd.DataFrame, friction_bps: float) -> SimCtx:
+    herald = df.get("herald_ok",False).astype(bool)
+    p0 = num(df["price"]); p1 = num(df["price_next_1h"])
+    # SELL is right when price fell: flip the move, then charge friction either way
+    side = np.where(df["signal"].to_numpy()=="SELL", -1.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        good = np.isfinite(p0) & np.isfinite(p1) & (p0 != 0.0)
+        pnl = side*((p1/p0)-1.0)*1e4 - float(friction_bps)
+    return SimCtx(
+        side_ok=df["signal"].isin(["BUY","SELL"]).to_numpy(),
+        phase=num(df["phase_angle_deg"]),
+        ceff=df.get("C_eff",-1).astype(float).to_numpy(),
+        ce_thr_row=full_thr_rows(df),
+        vol=df.get("volume_ratio",0).astype(float).to_numpy(),
+        trap_T=df.get("trap_T",1.0).astype(float).to_numpy(),
+        herald_ok=herald.to_numpy(),
+        lite_herald=(herald | (df.get("leaders_ok",False).astype(bool)) | (df.get("flows_ok",False).astype(bool))).to_numpy(),
+        good=pack(good),
+        win=pack(good & (pnl > 0)),
+    )
+
+def _mask(ctx: SimCtx, key: tuple, build) -> np.ndarray:
+    # grid dimensions repeat (4 cuts, 6 angle ranges, ...): each distinct mask is built
+    # and packed once; padding bits stay 0 because grid points only AND/OR bitmaps
+    m = ctx.masks.get(key)
+    if m is None:
+        m = ctx.masks[key] = pack(build())
+    return m
+
+def simulate(ctx: SimCtx, params: dict, min_n: int = 0) -> Tuple[int, float]:
+    """Return (labelled_n, hit_1h_pct) for a param set applied to the *existing directions*.
+    hit is None when fewer than max(1, min_n) rows are labelled (pick_config can't use it)."""
+    fc = float(params["full_cut"]); tc = params["trap_cutoff"]
+    amin, amax = float(params["angle_min"]), float(params["angle_max"])
+    lmin, lmax, lvol = float(params["lite_angle_min"]), float(params["lite_angle_max"]), params["lite_vol"]
+
+    # STRONG: side & C_eff vs the stricter of row thr / candidate full_cut & phase range (NaN angle fails)
+    ce_ok    = _mask(ctx, ("ce", fc), lambda: ctx.side_ok & (ctx.ceff >= np.maximum(ctx.ce_thr_row, fc)))
+    phase_ok = _mask(ctx, ("phase", amin, amax), lambda: (ctx.phase >= amin) & (ctx.phase <= amax))
+    trap_ok  = _mask(ctx, ("trap", tc), lambda: ~((ctx.trap_T > tc) & ~ctx.herald_ok))
+
+    # LITE rescue (Half): side & lite angle & lite volume & any herald
+    lite_ok  = _mask(ctx, ("lite", lmin, lmax, lvol), lambda: ctx.side_ok & ctx.lite_herald
+                     & (ctx.phase >= lmin) & (ctx.phase <= lmax) & (ctx.vol >= lvol))
+
+    # strong | (~strong & lite), both behind the trap veto
+    sel = ((ce_ok & phase_ok) | lite_ok) & trap_ok
+
+    # Label hits (direction already decided by engine’s signal) on rows with usable prices
+    n = popcount(sel & ctx.good)
+    if n == 0 or n < min_n:
+        return n, None
+    return n, float(popcount(sel & ctx.win)/n*100)
+
+_CTX = None  # per-worker SimCtx and min_n, set once by the pool initializer
+_MIN_N = 0
+
+def _init_worker(ctx: SimCtx, min_n: int):
+    global _CTX, _MIN_N
+    _CTX, _MIN_N = ctx, min_n
+
+def _simulate_worker(params: dict) -> Tuple[int, float]:
+    return simulate(_CTX, params, _MIN_N)
+
+def sweep(ctx: SimCtx, grid: List[dict], n_jobs: int = 1, min_n: int = 0) -> List[Tuple[int, float]]:
+    """simulate() over the grid, in grid order. n_jobs != 1 fans out to worker processes;
+    ctx is pickled once per worker, each task only ships its params dict."""
+    workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+    if workers <= 1 or len(grid) < 2:
+        return [simulate(ctx, p, min_n) for p in grid]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ctx, min_n)) as ex:
+        return list(ex.map(_simulate_worker, grid, chunksize=16))
+
+def rank_configs(results: List[Dict[str,Any]], target=(65.0,75.0), min_n=20) -> List[int]:
+    """Indices of usable results (hit set, n>=min_n), best first: inside the target band
+    before outside, then closest to 70, then larger N (stable: exact ties keep grid order)."""
     lo, hi = target
-    # prefer inside 65–75 band with n>=min_n, closest to 70, then larger N
-    in_band = [r for r in results if (r["hit"] is not None and lo<=r["hit"]<=hi and r["n"]>=min_n)]
-    if in_band:
-        in_band.sort(key=lambda r: (abs(r["hit"]-70.0), -r["n"]))
-        return in_band[0]
-    # else closest to 70 with n>=min_n
-    cand = [r for r in results if r["hit"] is not None and r["n"]>=min_n]
-    if not cand: return None
-    cand.sort(key=lambda r: (abs(r["hit"]-70.0), -r["n"]))
-    return cand[0]
+    if not results: return []
+    hits = np.array([np.nan if r["hit"] is None else r["hit"] for r in results], dtype=float)
+    ns   = np.array([r["n"] for r in results], dtype=np.int64)
+    ok = ~np.isnan(hits) & (ns >= min_n)
+    in_band = ok & (hits >= lo) & (hits <= hi)
+    ranked = []
+    for m in (in_band, ok & ~in_band):
+        idx = np.flatnonzero(m)
+        ranked += idx[np.lexsort((-ns[idx], np.abs(hits[idx]-70.0)))].tolist()
+    return ranked
+
+def pick_config(results: List[Dict[str,Any]], target=(65.0,75.0), min_n=20):
+    # prefer inside 65–75 band with n>=min_n, else closest to 70 with n>=min_n
+    ranked = rank_configs(results, target, min_n)
+    return results[ranked[0]] if ranked else None
+
+# Parameter grid (tight, practical); lite_angle_max is fixed at 45
+GRID_AXES = {
+    "full_cut":       (64.0, 66.0, 68.0, 70.0),
+    "angle_min":      (12.0, 15.0),
+    "angle_max":      (30.0, 35.0, 40.0),
+    "trap_cutoff":    (0.75, 0.80),
+    "lite_angle_min": (12.0, 15.0),
+    "lite_vol":       (0.85, 0.90, 1.00),
+}
+
+def grid_points(axes: Dict[str, tuple]) -> List[dict]:
+    return [{"full_cut": fc, "angle_min": amin, "angle_max": amax, "trap_cutoff": tc,
+             "lite_angle_min": lmin, "lite_angle_max": 45.0, "lite_vol": lvol}
+            for fc, amin, amax, tc, lmin, lvol in itertools.product(*(axes[k] for k in GRID_AXES))]
+
+def two_stage_points(evaluate, min_n: int, top_k: int = 5) -> List[dict]:
+    """Coarse pass on each axis' end points, then the ±1-step neighbourhood (on the full
+    axes) of the top_k coarse configs. evaluate(points) scores new points and returns all
+    results so far; the union of evaluated points is returned in full-grid order."""
+    coarse = evaluate(grid_points({k: (v[0], v[-1]) for k, v in GRID_AXES.items()}))
+    near = set()
+    for i in rank_configs(coarse, min_n=min_n)[:top_k]:
+        p = coarse[i]["params"]
+        nb = {}
+        for k, vals in GRID_AXES.items():
+            j = vals.index(p[k])
+            nb[k] = vals[max(0, j-1):j+2]
+        near.update(_grid_key(q) for q in grid_points(nb))
+    evaluate([q for q in grid_points(GRID_AXES) if _grid_key(q) in near])
+    return evaluate([])
+
+def _grid_key(p: dict) -> tuple:
+    return tuple(p[k] for k in GRID_AXES)
 
 def main():
     args = parse_args()
@@ -167,7 +318,7 @@ def main():
     OUTD = ROOT / "tuning"
     OUTD.mkdir(parents=True, exist_ok=True)
 
-    df = prep_df(ROOT, args.hours)
+    df = prep_df(ROOT, args.hours, args.fast_ingest)
     if df.empty:
         out = {"generated_at": datetime.now(timezone.utc).isoformat(),
                "hours": args.hours, "status":"no_rows_in_window"}
@@ -175,7 +326,7 @@ def main():
         print(json.dumps(out, indent=2)); return
 
     if args.experiment_id:
-        df = df[df.get("experiment_id")==args.experiment_id].copy()
+        df = df[df.get("experiment_id")==args.experiment_id]   # read-only from here on
         if df.empty:
             out = {"generated_at": datetime.now(timezone.utc).isoformat(),
                    "hours": args.hours, "experiment_id": args.experiment_id,
@@ -183,26 +334,19 @@ def main():
             (OUTD/args.outname).write_text(json.dumps(out, indent=2), encoding="utf-8")
             print(json.dumps(out, indent=2)); return
 
-    # Parameter grid (tight, practical)
-    grid=[]
-    for full_cut in (64.0, 66.0, 68.0, 70.0):
-        for ang_min in (12.0, 15.0):
-            for ang_max in (30.0, 35.0, 40.0):
-                for trap_cut in (0.75, 0.80):
-                    for lite_ang_min in (12.0, 15.0):
-                        for lite_vol in (0.85, 0.90, 1.00):
-                            grid.append({
-                                "full_cut": full_cut,
-                                "angle_min": ang_min, "angle_max": ang_max,
-                                "trap_cutoff": trap_cut,
-                                "lite_angle_min": lite_ang_min, "lite_angle_max": 45.0,
-                                "lite_vol": lite_vol
-                            })
-
-    results=[]
-    for p in grid:
-        lab, hit = simulate(df, p, friction_bps=args.friction_bps)
-        results.append({"params":p, "n":int(lab.shape[0]), "hit":hit})
+    ctx = prep_simulate_ctx(df, args.friction_bps)
+    if args.search == "two_stage":
+        seen = {}
+        order = {k: i for i, k in enumerate(map(_grid_key, grid_points(GRID_AXES)))}
+        def evaluate(points):
+            todo = [p for p in points if _grid_key(p) not in seen]
+            for p, (n, hit) in zip(todo, sweep(ctx, todo, args.n_jobs, args.min_labelled)):
+                seen[_grid_key(p)] = {"params":p, "n":n, "hit":hit}
+            return sorted(seen.values(), key=lambda r: order[_grid_key(r["params"])])
+        results = two_stage_points(evaluate, args.min_labelled)
+    else:
+        grid = grid_points(GRID_AXES)
+        results=[{"params":p, "n":n, "hit":hit} for p, (n, hit) in zip(grid, sweep(ctx, grid, args.n_jobs, args.min_labelled))]
 
     # Save full grid for audit
     grid_df = pd.DataFrame([{
@@ -8,13 +8,16 @@ OPRT Unified Analytics — ENGINE-ALIGNED & ROBUST (v3.5)
 - variant_summary: hit_1h_pct + meets_sweet_spot flag
 """
 from __future__ import annotations
-import argparse, json, math
+import argparse, io, json, math, mmap
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Tuple, List, Dict, Any
+from typing import List, Dict, Any
 import numpy as np
 import pandas as pd
-from collections import Counter
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
 
 # ---------------- CLI ----------------
 def parse_args():
@@ -31,32 +34,66 @@ def parse_args():
     return ap.parse_args()
 
 # ---------------- IO helpers ----------------
+def _loads_line(b: bytes):
+    # orjson on the raw bytes; anything it rejects (bad UTF-8, NaN literals, ...) gets the old text path
+    if orjson is not None:
+        try: return orjson.loads(b)
+        except Exception: pass
+    return json.loads(b.decode("utf-8", errors="ignore").strip())
+
 def load_jsonl(p: Path) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
     if not p.exists():
         return pd.DataFrame()
-    with p.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s=line.strip()
-            if not s:
-                continue
-            try:
-                rows.append(json.loads(s))
-            except Exception:
-                pass
+    # walk a read-only mmap line by line: the file stays in the OS page cache instead of
+    # a heap copy (plus a list of line copies) next to the parsed rows
+    with p.open("rb") as fh:
+        if fh.seek(0, 2) == 0:
+            return pd.DataFrame()   # mmap refuses empty files
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, size = 0, len(mm)
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                if end < 0: end = size
+                line = mm[pos:end]; pos = end + 1
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(_loads_line(line))
+                except Exception:
+                    pass
     return pd.DataFrame(rows)
 
+# fields any report step reads (plus the cached threshold columns); the rest of the
+# engine's row (checks_values dicts, notes, tech detail, ...) is dropped at load
+KEEP_COLS = ["timestamp_utc","ts","signal","mode","size_band","price","C_eff","phase_angle_deg",
+             "volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","assets_present",
+             "experiment_id","hard_gate_reason","failed_checks"]
+
+def load_log(p: Path, trap_default=0.80) -> pd.DataFrame:
+    """load_jsonl plus the prep every consumer shares, done once per log."""
+    d = load_jsonl(p)
+    # parse timestamps once (explicit ISO8601: no per-string format inference, and a log
+    # mixing 'Z' / '+00:00' / fractional-second stamps still parses); everything below uses 'ts'
+    if "timestamp_utc" in d.columns:
+        d["ts"] = pd.to_datetime(d["timestamp_utc"], errors="coerce", utc=True, format="ISO8601")
+    # low-cardinality labels as categoricals: integer codes for the masks and groupbys below
+    for c in ("signal","mode","size_band"):
+        if c in d.columns:
+            d[c] = d[c].astype("category")
+    # per-row thresholds (angle window, full cut, trap cutoff), cached as columns once
+    # for the overlay league, gate funnel, policy mask, calibration and medians
+    d[THR_COLS] = np.column_stack(extract_row_thresholds(d, trap_default=trap_default))
+    # the skipped log keeps the full set too: it stands in for decisions as coverage
+    return d[[c for c in KEEP_COLS + THR_COLS if c in d.columns]]
+
 def compute_next_prices(df: pd.DataFrame, steps=(1,4,12)) -> pd.DataFrame:
     if df.empty: return df
-    df = df.copy()
-    if "timestamp_utc" in df.columns:
-        df["ts"] = pd.to_datetime(df["timestamp_utc"], errors="coerce", utc=True)
+    if "ts" in df.columns:
         df = df.sort_values("ts").reset_index(drop=True)
-    if "price" not in df.columns:
-        df["price"] = pd.NA
-    for h in steps:
-        df[f"price_next_{h}h"] = df["price"].shift(-h)
-    return df
+    price = df["price"] if "price" in df.columns else pd.Series(pd.NA, index=df.index)
+    # assign() hands back a new frame: the caller's df is never written to
+    return df.assign(price=price, **{f"price_next_{h}h": price.shift(-h) for h in steps})
 
 def window_bounds(day_utc: str|None, tz_name: str, since_hours: int|None):
     if since_hours is not None:
@@ -79,103 +116,152 @@ def window_bounds(day_utc: str|None, tz_name: str, since_hours: int|None):
     return start_local.astimezone(timezone.utc), end_local.astimezone(timezone.utc)
 
 # ---------------- Row-aware helpers ----------------
-def row_full_thr(r, default_active=66.0, default_quiet=70.0) -> float:
+def _cv_thresholds(cv):
+    # (ceff thr, (phase thr_min, thr_max)) from one checks_values dict; None where absent/unusable
     try:
-        thr = r.get("checks_values", {}).get("ceff", {}).get("thr")
-        if thr is not None: return float(thr)
-    except Exception: pass
-    vr = float(r.get("volume_ratio", 1.0) or 1.0)
-    return float(default_active if vr >= 1.0 else default_quiet)
-
-def row_angle_minmax(r, default_min=12.0, default_max=35.0) -> Tuple[float,float]:
+        thr = cv.get("ceff", {}).get("thr")
+        thr = float(thr) if thr is not None else None
+    except Exception:
+        thr = None
     try:
-        pm = r.get("checks_values", {}).get("phase", {})
+        pm = cv.get("phase", {})
         amin = pm.get("thr_min"); amax = pm.get("thr_max")
-        if amin is not None and amax is not None:
-            return float(amin), float(amax)
-    except Exception: pass
-    return float(default_min), float(default_max)
-
-def row_trap_cutoff(r, default_cut=0.80) -> float:
-    return float(default_cut)
-
-def within_angle(a, amin, amax) -> bool:
-    try: x = float(a); return (x >= float(amin)) and (x <= float(amax))
-    except Exception: return False
+        ang = (float(amin), float(amax)) if amin is not None and amax is not None else None
+    except Exception:
+        ang = None
+    return thr, ang
+
+def extract_row_thresholds(df: pd.DataFrame, trap_default=0.80, default_min=12.0, default_max=35.0,
+                           default_active=66.0, default_quiet=70.0):
+    """Per-row engine thresholds, one walk over checks_values and array ops for the defaults:
+      amin/amax  phase.thr_min/thr_max (both present), else 12/35
+      full_thr   ceff.thr, else 66 when volume_ratio >= 1.0 (a zero ratio counts as active), else 70
+      trap_thr   trap_default
+    Returns float arrays (amin, amax, full_thr, trap_thr)."""
+    n = len(df)
+    if "volume_ratio" in df:
+        vr = df["volume_ratio"]
+        if pd.api.types.is_numeric_dtype(vr):
+            vr = vr.to_numpy(dtype=float)
+            vr = np.where(vr == 0.0, 1.0, vr)   # `vr or 1.0`: a zero ratio counts as active; NaN stays quiet
+        else:
+            vr = np.array([float(v or 1.0) for v in vr], dtype=float)
+    else:
+        vr = np.ones(n)
+    full_thr = np.where(vr >= 1.0, default_active, default_quiet)
+    amin = np.full(n, float(default_min)); amax = np.full(n, float(default_max))
+    if "checks_values" in df and n:
+        thr, ang = zip(*map(_cv_thresholds, df["checks_values"]))
+        has = np.fromiter((t is not None for t in thr), dtype=bool, count=n)
+        full_thr[has] = [t for t in thr if t is not None]
+        has = np.fromiter((a is not None for a in ang), dtype=bool, count=n)
+        if has.any():
+            amin[has], amax[has] = np.array([a for a in ang if a is not None]).T
+    return amin, amax, full_thr, np.full(n, float(trap_default))
+
+THR_COLS = ["_amin","_amax","_full_thr","_trap_thr"]
+
+def row_thresholds(df: pd.DataFrame):
+    # the cached extract_row_thresholds columns as float arrays
+    return tuple(df[c].to_numpy(dtype=float) for c in THR_COLS)
+
+def num(col) -> np.ndarray:
+    """float64 view of a column; None / non-numeric -> NaN (what float() rejected before)."""
+    return pd.to_numeric(col, errors="coerce").to_numpy(dtype=float)
+
+def _col(df: pd.DataFrame, c: str, fill) -> pd.Series:
+    # df.get(c, fill), but always a row-aligned Series
+    return df[c] if c in df else pd.Series(fill, index=df.index, dtype=object)
+
+def label_mask(col: pd.Series, pred) -> np.ndarray:
+    """pred(label) for every row, evaluated once per distinct label and gathered by category
+    code (a missing label is tested as NaN)."""
+    cat = col.astype("category")
+    hit = np.array([bool(pred(x)) for x in cat.cat.categories] + [bool(pred(np.nan))], dtype=bool)
+    return hit[cat.cat.codes.to_numpy()]   # code -1 picks the trailing NaN slot
 
 # ---------------- Metrics helpers ----------------
-def dir_hit(sig, p0, p1):
-    if sig not in ("BUY","SELL") or pd.isna(p0) or pd.isna(p1): return None
-    return 1 if ((sig=="BUY" and p1>p0) or (sig=="SELL" and p1<p0)) else 0
-
-def safe_ret_bps(p0, p1, friction_bps=5.0, sig=None):
-    try:
-        p0f=float(p0); p1f=float(p1)
-        if not np.isfinite(p0f) or not np.isfinite(p1f) or p0f==0.0: return np.nan
-        ret=((p1f/p0f)-1.0)*1e4 - float(friction_bps)
-        return ret if sig=="BUY" else (-ret if sig=="SELL" else ret)
-    except Exception: return np.nan
-
-def eff_bucket(c):
-    if pd.isna(c): return None
-    c=float(c)
-    if c<35: return "<35"
-    lo = int((max(35,c)//5)*5); hi=lo+5
-    lo=max(lo,35); hi=min(hi,100)
-    return f"{lo}-{hi}"
-
-def ang_bucket(a):
-    if pd.isna(a): return None
-    a=float(a)
-    if a<=15: return "≤15°"
-    if a<=30: return "15–30°"
-    if a<=45: return "30–45°"
-    return ">45°"
-
-def vol_bucket(v):
-    if pd.isna(v): return None
-    v=float(v)
-    if v<0.8: return "<0.8"
-    if v<1.0: return "0.8–1.0"
-    if v<1.2: return "1.0–1.2"
-    return "≥1.2"
+def dir_hits(sig: np.ndarray, p0: np.ndarray, p1: np.ndarray) -> np.ndarray:
+    """1.0 if the next price moved the signal's way (BUY: up, SELL: down), else 0.0;
+    NaN for non BUY/SELL rows or a missing price."""
+    buy = sig == "BUY"; sell = sig == "SELL"
+    hit = ((buy & (p1 > p0)) | (sell & (p1 < p0))).astype(float)
+    hit[~(buy | sell) | np.isnan(p0) | np.isnan(p1)] = np.nan
+    return hit
+
+def ret_bps(sig: np.ndarray, p0: np.ndarray, p1: np.ndarray, friction_bps=5.0) -> np.ndarray:
+    """Move p0 -> p1 in bps net of friction, sign-flipped for SELL; NaN if a price is
+    missing/non-finite or p0 is 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = ((p1 / p0) - 1.0) * 1e4 - float(friction_bps)
+    ret = np.where(sig == "SELL", -ret, ret)
+    ret[~np.isfinite(p0) | ~np.isfinite(p1) | (p0 == 0.0)] = np.nan
+    return ret
+
+# bucket edges/labels: C_eff in 5-pt steps from 35 ([lo, hi)), angle right-closed, volume [lo, hi)
+EFF_EDGES  = [-np.inf, *range(35, 105, 5), np.inf]
+EFF_LABELS = ["<35", *(f"{lo}-{lo+5}" for lo in range(35, 100, 5)), "100-100"]
+ANG_EDGES  = [-np.inf, 15, 30, 45, np.inf]
+ANG_LABELS = ["≤15°","15–30°","30–45°",">45°"]
+VOL_EDGES  = [-np.inf, 0.8, 1.0, 1.2, np.inf]
+VOL_LABELS = ["<0.8","0.8–1.0","1.0–1.2","≥1.2"]
+
+HERALD_CATS  = pd.CategoricalDtype(["Herald=Off","Herald=On"], ordered=True)
+TRAP_CATS    = pd.CategoricalDtype(["Trap≤0.8","Trap>0.8"], ordered=True)
+FLOWS_CATS   = pd.CategoricalDtype(["Flows=Off","Flows=On"], ordered=True)
+LEADERS_CATS = pd.CategoricalDtype(["Leaders=Off","Leaders=On"], ordered=True)
+
+def eff_bucket(c: pd.Series) -> pd.Categorical:
+    return pd.cut(num(c), bins=EFF_EDGES, labels=EFF_LABELS, right=False)
+
+def ang_bucket(a: pd.Series) -> pd.Categorical:
+    return pd.cut(num(a), bins=ANG_EDGES, labels=ANG_LABELS, right=True)
+
+def vol_bucket(v: pd.Series) -> pd.Categorical:
+    return pd.cut(num(v), bins=VOL_EDGES, labels=VOL_LABELS, right=False)
+
+def hit_rate_by(codes: np.ndarray, hit: np.ndarray, k: int):
+    """Per group code 0..k-1: row count, and hit % (1 dp) over the labelled (non-NaN) rows,
+    NaN where a group has none. Three bincount passes instead of a groupby."""
+    lab = ~np.isnan(hit)
+    count = np.bincount(codes, minlength=k)
+    n_lab = np.bincount(codes[lab], minlength=k)
+    hits  = np.bincount(codes[lab], weights=hit[lab], minlength=k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = hits / n_lab * 100
+    return count, pct.round(1)
 
 # ---------------- Tables / masks ----------------
-def overlay_league(df: pd.DataFrame, trap_default=0.80) -> pd.DataFrame:
-    base = df.copy()
-    base["active"] = base["signal"].isin(["BUY","SELL"])
-    base["hit1"] = [dir_hit(s,p,n) for s,p,n in zip(base["signal"], base["price"], base.get("price_next_1h"))]
-
-    amin=[]; amax=[]; full_thr=[]; trap_thr=[]
-    for _, r in base.iterrows():
-        mi, ma = row_angle_minmax(r); amin.append(mi); amax.append(ma)
-        full_thr.append(row_full_thr(r))
-        trap_thr.append(row_trap_cutoff(r, trap_default))
-    base["_amin"]=amin; base["_amax"]=amax; base["_full"]=full_thr; base["_trap_thr"]=trap_thr
+def overlay_league(df: pd.DataFrame) -> pd.DataFrame:
+    # every column converted once; the overlays are plain bool arrays over the rows
+    amin, amax, full_thr, trap_thr = row_thresholds(df)
+    active = df["signal"].isin(["BUY","SELL"]).to_numpy()
+    hit1   = dir_hits(df["signal"].to_numpy(), num(df["price"]), num(df["price_next_1h"]))
+    ang    = num(_col(df, "phase_angle_deg", 999))
+    herald = _col(df, "herald_ok", False).astype(bool).to_numpy()
 
     m_engine = (
-        base["active"]
-        & (base.get("mode","")=="strong")
-        & (base.get("size_band","")=="Full")
-        & (base["phase_angle_deg"].astype(float).between(base["_amin"], base["_amax"], inclusive="both"))
-        & (~((base.get("trap_T",0).astype(float) > base["_trap_thr"]) & (~base.get("herald_ok", False).astype(bool))))
-        & (base.get("C_eff",-1).astype(float) >= base["_full"])
+        active
+        & (_col(df, "mode", "")=="strong").to_numpy()
+        & (_col(df, "size_band", "")=="Full").to_numpy()
+        & (ang >= amin) & (ang <= amax)
+        & ~((num(_col(df, "trap_T", 0)) > trap_thr) & ~herald)
+        & (num(_col(df, "C_eff", -1)) >= full_thr)
     )
 
     overlays = {
         "EngineStrong": m_engine,
-        "OPRT_loose(≤45°)": base["active"] & (base.get("phase_angle_deg",999).astype(float) <= 45),
-        "VOL_≥1.2":         base["active"] & (base.get("volume_ratio",0).astype(float) >= 1.2),
-        "HERALD_only":      base["active"] & (base.get("herald_ok",False).astype(bool)),
-        "FLOWS_only":       base["active"] & (base.get("flows_ok",False).astype(bool)),
+        "OPRT_loose(≤45°)": active & (ang <= 45),
+        "VOL_≥1.2":         active & (num(_col(df, "volume_ratio", 0)) >= 1.2),
+        "HERALD_only":      active & herald,
+        "FLOWS_only":       active & _col(df, "flows_ok", False).astype(bool).to_numpy(),
     }
 
     rows=[]
     for name, m in overlays.items():
-        sub=base[m]
-        lab=sub[sub["hit1"].notna()]
-        tot=int(sub.shape[0]); labn=int(lab.shape[0])
-        hit=float(lab["hit1"].mean()*100) if labn>0 else float("nan")
+        lab=hit1[m]; lab=lab[~np.isnan(lab)]
+        tot=int(m.sum()); labn=int(lab.size)
+        hit=float(lab.mean()*100) if labn>0 else float("nan")
         rows.append({
             "strategy": name,
             "count_labelled": labn,
@@ -185,81 +271,77 @@ def overlay_league(df: pd.DataFrame, trap_default=0.80) -> pd.DataFrame:
         })
     return pd.DataFrame(rows).sort_values(["hit_1h_%","count_labelled"], ascending=[False,False])
 
-def gate_funnel(df: pd.DataFrame, trap_default=0.80) -> pd.DataFrame:
-    rows=[]
-    total=int(df.shape[0]); rows.append(("all_rows", total))
-
-    m_active = df["signal"].isin(["BUY","SELL"])
-    rows.append(("active(BUY/SELL)", int(m_active.sum())))
-
-    m_mode = m_active & (df.get("mode","")=="strong") & (df.get("size_band","")=="Full")
-    rows.append(("mode=strong & size=Full", int(m_mode.sum())))
-
-    amin=[]; amax=[]; trap_thr=[]; full_thr=[]
-    for _, r in df.iterrows():
-        mi, ma = row_angle_minmax(r); amin.append(mi); amax.append(ma)
-        trap_thr.append(row_trap_cutoff(r, trap_default))
-        full_thr.append(row_full_thr(r))
-    _amin=pd.Series(amin, index=df.index); _amax=pd.Series(amax, index=df.index)
-    _trap=pd.Series(trap_thr, index=df.index); _full=pd.Series(full_thr, index=df.index)
-
-    m_ang = m_mode & (df.get("phase_angle_deg",999).astype(float).between(_amin, _amax, inclusive="both"))
-    rows.append(("phase row-window", int(m_ang.sum())))
-
-    m_trap = m_ang & (~((df.get("trap_T",0).astype(float)>_trap) & (~df.get("herald_ok",False).astype(bool))))
-    rows.append(("trap veto (ok)", int(m_trap.sum())))
-
-    m_ce = m_trap & (df.get("C_eff",-1).astype(float) >= _full)
-    rows.append(("C_eff >= full_thr(row)", int(m_ce.sum())))
-
-    out = pd.DataFrame(rows, columns=["gate","count"])
+def gate_funnel(df: pd.DataFrame) -> pd.DataFrame:
+    amin, amax, full_thr, trap_thr = row_thresholds(df)
+    m_active = df["signal"].isin(["BUY","SELL"]).to_numpy()
+    m_mode   = m_active & (_col(df, "mode", "") == "strong").to_numpy() & (_col(df, "size_band", "") == "Full").to_numpy()
+    ang      = num(_col(df, "phase_angle_deg", 999))
+    m_ang    = m_mode & (ang >= amin) & (ang <= amax)
+    herald   = _col(df, "herald_ok", False).astype(bool).to_numpy()
+    m_trap   = m_ang & ~((num(_col(df, "trap_T", 0)) > trap_thr) & ~herald)
+    m_ce     = m_trap & (num(_col(df, "C_eff", -1)) >= full_thr)
+
+    total = int(df.shape[0])
+    out = pd.DataFrame({
+        "gate":  ["all_rows", "active(BUY/SELL)", "mode=strong & size=Full", "phase row-window",
+                  "trap veto (ok)", "C_eff >= full_thr(row)"],
+        "count": [total] + [int(m.sum()) for m in (m_active, m_mode, m_ang, m_trap, m_ce)],
+    })
     out["survival_%"] = (out["count"]/max(1,total)*100).round(1)
     return out
 
 # ---------------- Performance & buckets ----------------
-def passes_policy_row(r, trap_default=0.80) -> bool:
-    if r.get("signal") == "WATCH": return False
-    if str(r.get("mode","")).lower() != "strong": return False
-    if str(r.get("size_band","")) != "Full": return False
-    amin, amax = row_angle_minmax(r)
-    if not within_angle(r.get("phase_angle_deg"), amin, amax): return False
-    trap_thr = row_trap_cutoff(r, trap_default)
-    trap = float(r.get("trap_T", 0.0) or 0.0)
-    herald = bool(r.get("herald_ok", False))
-    if (trap > trap_thr) and (not herald):
-        return False
-    try:
-        ce = float(r.get("C_eff"))
-        return bool(ce >= row_full_thr(r))
-    except Exception:
-        return False
-
-def perf_and_buckets(df: pd.DataFrame, friction_bps=5.0, trap_default=0.80):
-    mask=[passes_policy_row(r, trap_default) for _, r in df.iterrows()]
-    s = df[pd.Series(mask, index=df.index)].copy()
+def policy_mask(df: pd.DataFrame) -> np.ndarray:
+    """EngineStrong policy for every row: not WATCH, mode strong, size Full, angle inside the
+    row's [thr_min, thr_max], no un-heralded trap, C_eff >= the row's full cut."""
+    amin, amax, full_thr, trap_thr = row_thresholds(df)
+    ang    = num(_col(df, "phase_angle_deg", None))
+    trap   = num(_col(df, "trap_T", 0.0))
+    ce     = num(_col(df, "C_eff", None))
+    herald = _col(df, "herald_ok", False).astype(bool).to_numpy()
+    return ((_col(df, "signal", None) != "WATCH").to_numpy()
+            & label_mask(_col(df, "mode", ""), lambda x: str(x).lower() == "strong")
+            & label_mask(_col(df, "size_band", ""), lambda x: str(x) == "Full")
+            & (ang >= amin) & (ang <= amax)
+            & ~((trap > trap_thr) & ~herald)
+            & (ce >= full_thr))
+
+def perf_and_buckets(df: pd.DataFrame, friction_bps=5.0):
+    if df.empty:
+        return (pd.DataFrame(), {}, pd.DataFrame())
+    s = df[policy_mask(df)]   # boolean take: a new frame, safe to add columns to
     if s.empty:
         return (pd.DataFrame(), {}, s)
+    sig = s["signal"].to_numpy(); p0 = num(s["price"])
     for H in (1,4,12):
-        s[f"hit_{H}h"] = [dir_hit(sig, p0, pH) for sig,p0,pH in zip(s["signal"], s["price"], s.get(f"price_next_{H}h"))]
-        s[f"pnl_{H}h_bps"] = [safe_ret_bps(p0, pH, friction_bps, sig) for sig,p0,pH in zip(s["signal"], s["price"], s.get(f"price_next_{H}h"))]
-    s["C_bucket5"] = s["C_eff"].apply(eff_bucket)
-    s["ang_bin"]   = s["phase_angle_deg"].apply(ang_bucket)
-    s["vol_bin"]   = s["volume_ratio"].apply(vol_bucket)
-    s["herald"]    = s.get("herald_ok", False).astype(bool).map({True:"Herald=On", False:"Herald=Off"})
-    s["trap_hi"]   = s.get("trap_T",0).astype(float).apply(lambda x: "Trap>0.8" if (pd.notna(x) and x>0.8) else "Trap≤0.8")
-    s["flows"]     = s.get("flows_ok", False).astype(bool).map({True:"Flows=On", False:"Flows=Off"})
-    s["leaders"]   = s.get("leaders_ok", False).astype(bool).map({True:"Leaders=On", False:"Leaders=Off"})
-
-    def agg_hit(df_in, col, H=1):
-        g=(df_in.groupby(col)[f"hit_{H}h"].agg(["size","mean"]).rename(columns={"size":"count","mean":"hit_%"}))
-        g["hit_%"]=(g["hit_%"]*100).round(1)
-        return g
-
+        pH = num(s[f"price_next_{H}h"])
+        s[f"hit_{H}h"] = dir_hits(sig, p0, pH)
+        s[f"pnl_{H}h_bps"] = ret_bps(sig, p0, pH, friction_bps)
+    s["C_bucket5"] = eff_bucket(s["C_eff"])
+    s["ang_bin"]   = ang_bucket(s["phase_angle_deg"])
+    s["vol_bin"]   = vol_bucket(s["volume_ratio"])
+    # two-level labels straight from the bool arrays: code 0 = Off/≤, 1 = On/>
+    def flag(arr, dtype): return pd.Categorical.from_codes(arr.astype(np.int8), dtype=dtype)
+    s["herald"]    = flag(_col(s, "herald_ok", False).astype(bool).to_numpy(), HERALD_CATS)
+    s["trap_hi"]   = flag(num(_col(s, "trap_T", 0)) > 0.8, TRAP_CATS)
+    s["flows"]     = flag(_col(s, "flows_ok", False).astype(bool).to_numpy(), FLOWS_CATS)
+    s["leaders"]   = flag(_col(s, "leaders_ok", False).astype(bool).to_numpy(), LEADERS_CATS)
+
+    def agg_hit(df_in, col, H=1, observed=True):
+        # groupby(col)[hit].agg(size, mean) on the category codes; NaN bucket dropped
+        cat = df_in[col].astype("category").cat
+        codes = cat.codes.to_numpy(); ok = codes >= 0
+        count, pct = hit_rate_by(codes[ok], df_in[f"hit_{H}h"].to_numpy(dtype=float)[ok], len(cat.categories))
+        g = pd.DataFrame({"count": count, "hit_%": pct}, index=pd.Index(cat.categories, name=col))
+        return g[count > 0] if observed else g
+
+    # bucket columns are ordered categoricals: groups come out in bucket order;
+    # angle/volume list every bin (empty ones with count 0)
     buckets={
         "by_signal": agg_hit(s, "signal", 1),
-        "by_Ceff":   agg_hit(s, "C_bucket5", 1).sort_index(),
-        "by_angle":  agg_hit(s, "ang_bin", 1).reindex(["≤15°","15–30°","30–45°",">45°"]),
-        "by_volume": agg_hit(s, "vol_bin", 1).reindex(["<0.8","0.8–1.0","1.0–1.2","≥1.2"]),
+        "by_Ceff":   agg_hit(s, "C_bucket5", 1),
+        "by_angle":  agg_hit(s, "ang_bin", 1, observed=False),
+        "by_volume": agg_hit(s, "vol_bin", 1, observed=False),
         "by_herald": agg_hit(s, "herald", 1),
         "by_trap":   agg_hit(s, "trap_hi", 1),
         "by_flows":  agg_hit(s, "flows", 1),
@@ -278,21 +360,16 @@ def perf_and_buckets(df: pd.DataFrame, friction_bps=5.0, trap_default=0.80):
                              "pnl_std_bps":round(sd,2),"sharpe":round(mu/sd,2) if sd>1e-9 else None})
     pnl_tbl=pd.DataFrame(pnl_rows)
 
-    # simple calibration
-    def prob_map(row):
-        try:
-            ce=float(row.get("C_eff")); thr=row_full_thr(row)
-            return max(0.0, min(1.0, (ce - thr)/34.0))
-        except Exception:
-            return 0.5
-    s["p_est"]=s.apply(prob_map, axis=1)
+    # simple calibration: margin over the row's full cut, 34 pts -> p=1
+    ce = num(s["C_eff"])
+    s["p_est"]=np.clip((ce - s["_full_thr"].to_numpy()) / 34.0, 0.0, 1.0)
     s["y1"]=s["hit_1h"].astype(float)
     brier=float(((s["p_est"]-s["y1"])**2).mean()) if len(s)>0 else float("nan")
 
     try:
-        s["C_bin"]=pd.qcut(s["C_eff"].astype(float), q=min(7, max(2, int(np.sqrt(max(1,len(s))/2)))), duplicates="drop")
+        s["C_bin"]=pd.qcut(ce, q=min(7, max(2, int(math.sqrt(len(s)/2)))), duplicates="drop")
     except Exception:
-        s["C_bin"]=pd.cut(s["C_eff"].astype(float), bins=[35,50,60,66,70,80,90,100], right=True, include_lowest=True)
+        s["C_bin"]=pd.cut(ce, bins=[35,50,60,66,70,80,90,100], right=True, include_lowest=True)
     calib=(s.groupby("C_bin")["y1"].agg(["size","mean"]).rename(columns={"size":"count","mean":"hit_%"}))
     calib["hit_%"]=(calib["hit_%"]*100).round(1)
 
@@ -302,18 +379,24 @@ def perf_and_buckets(df: pd.DataFrame, friction_bps=5.0, trap_default=0.80):
 def failure_table(skipped_df: pd.DataFrame, topn=50) -> pd.DataFrame:
     if skipped_df.empty:
         return pd.DataFrame(columns=["reason|size|signal","count"])
-    keys=[]
-    for _, r in skipped_df.iterrows():
-        hard=r.get("hard_gate_reason")
-        if pd.isna(hard) or hard is None:
-            fc=r.get("failed_checks")
-            hard=(fc[0] if isinstance(fc,(list,tuple)) and len(fc)>0 else None)
-        keys.append(f"{hard}|{r.get('size_band')}|{r.get('signal')}")
-    cnt=Counter(keys)
-    rows=[{"reason|size|signal":k,"count":n} for k,n in cnt.most_common(topn)]
-    return pd.DataFrame(rows)
+    # hard gate reason, else the first failed check (None when neither is there)
+    hard = _col(skipped_df, "hard_gate_reason", None).to_numpy(dtype=object)
+    first_fc = np.array([fc[0] if isinstance(fc,(list,tuple)) and len(fc)>0 else None
+                         for fc in _col(skipped_df, "failed_checks", None)], dtype=object)
+    hard = np.where(pd.notna(hard), hard, first_fc)
+    keys = pd.Series([f"{h}|{z}|{g}" for h, z, g in zip(
+        hard, _col(skipped_df, "size_band", None), _col(skipped_df, "signal", None))])
+    # value_counts ranks like Counter.most_common (count desc, ties in first-seen order)
+    return keys.value_counts().head(topn).rename_axis("reason|size|signal").reset_index(name="count")
 
 # ---------------- ToD & rolling ----------------
+def _fixed_offset_s(tz):
+    """UTC offset in seconds if tz is a true fixed-offset tzinfo (UTC included), else None.
+    Zone rules (zoneinfo) are never treated as fixed: transitions can fall on any date."""
+    if isinstance(tz, timezone):
+        return int(tz.utcoffset(None).total_seconds())
+    return None
+
 def tod_heatmap(engine_df: pd.DataFrame, tz_name: str) -> pd.DataFrame:
     if engine_df.empty:
         return pd.DataFrame(columns=["hour_local","count","hit_%"])
@@ -322,21 +405,22 @@ def tod_heatmap(engine_df: pd.DataFrame, tz_name: str) -> pd.DataFrame:
         tz = zoneinfo.ZoneInfo(tz_name) if tz_name.upper()!="UTC" else timezone.utc
     except Exception:
         tz = timezone.utc
-    e = engine_df.copy()
-    e["ts"] = pd.to_datetime(e["timestamp_utc"], errors="coerce", utc=True)
-    e["hour_local"] = e["ts"].dt.tz_convert(tz).dt.hour
-    e["hit1"] = e["hit_1h"]
-    g = e.groupby("hour_local")["hit1"].agg(["size","mean"]).rename(columns={"size":"count","mean":"hit_%"})
-    g["hit_%"]=(g["hit_%"]*100).round(1)
-    return g.reset_index()
+    ts = engine_df["ts"]
+    off = _fixed_offset_s(tz)
+    if off is not None:
+        # fixed offset: local hour straight from epoch seconds, no tz_convert
+        hour = (ts.to_numpy("datetime64[s]").astype(np.int64) + off) // 3600 % 24
+    else:
+        hour = ts.dt.tz_convert(tz).dt.hour.to_numpy()
+    count, pct = hit_rate_by(hour, engine_df["hit_1h"].to_numpy(dtype=float), 24)
+    seen = np.flatnonzero(count)
+    return pd.DataFrame({"hour_local": seen, "count": count[seen], "hit_%": pct[seen]})
 
 def rolling_accuracy(engine_df: pd.DataFrame) -> pd.DataFrame:
     if engine_df.empty:
         return pd.DataFrame(columns=["date","n","hit_%"])
-    e=engine_df.copy()
-    e["date"]=pd.to_datetime(e["timestamp_utc"], errors="coerce", utc=True).dt.date
-    e["hit1"]=e["hit_1h"]
-    g=(e.groupby("date")["hit1"].agg(["size","mean"]).rename(columns={"size":"n","mean":"hit_%"}))
+    g=(engine_df["hit_1h"].groupby(engine_df["ts"].dt.date.rename("date")).agg(["size","mean"])
+       .rename(columns={"size":"n","mean":"hit_%"}))
     g["hit_%"]=(g["hit_%"]*100).round(1)
     return g.reset_index()
 
@@ -355,14 +439,16 @@ def main():
     OUT.mkdir(parents=True, exist_ok=True)
 
     # -------- load raw ----------
-    df_dec = load_jsonl(decisions_path)
-    df_skp = load_jsonl(skipped_path)
+    df_dec = load_log(decisions_path, trap_default=args.trap_cutoff_default)
+    df_skp = load_log(skipped_path, trap_default=args.trap_cutoff_default)
 
     # coverage fallback
     used_skipped_as_cover = False
-    df = df_dec.copy()
+    # no frame below is modified in place (filters rebind df, new columns go through
+    # assign), so df can start as the loaded frame itself
+    df = df_dec
     if df.empty and args.use_skipped_as_cover and not df_skp.empty:
-        df = df_skp.copy()
+        df = df_skp
         used_skipped_as_cover = True
 
     # price fill from CSV
@@ -370,15 +456,14 @@ def main():
         try:
             csv_df = pd.read_csv(csv_path)
             if "timestamp_utc" in csv_df.columns and "ts" not in csv_df.columns:
-                csv_df["ts"] = pd.to_datetime(csv_df["timestamp_utc"], errors="coerce", utc=True)
+                csv_df["ts"] = pd.to_datetime(csv_df["timestamp_utc"], errors="coerce", utc=True, format="ISO8601")
             else:
-                csv_df["ts"] = pd.to_datetime(csv_df.get("ts"), errors="coerce", utc=True)
+                csv_df["ts"] = pd.to_datetime(csv_df.get("ts"), errors="coerce", utc=True, format="ISO8601")
             csv_df["price"] = pd.to_numeric(csv_df.get("price"), errors="coerce")
-            keep = csv_df[["ts","price"]].dropna()
-            df["ts"] = pd.to_datetime(df["timestamp_utc"], errors="coerce", utc=True)
-            df = df.merge(keep, on="ts", how="left", suffixes=("", "_csv"))
-            df["price"] = pd.to_numeric(df["price"], errors="coerce").fillna(df["price_csv"])
-            df.drop(columns=["price_csv"], inplace=True, errors="ignore")
+            # ts-indexed lookup (last CSV row per ts) instead of a merge: no row
+            # duplication on repeated CSV stamps, no suffix column to fold back in
+            keep = csv_df[["ts","price"]].dropna().drop_duplicates("ts", keep="last")
+            df = df.assign(price=df["ts"].map(keep.set_index("ts")["price"]))
         except Exception as e:
             print("[WARN] CSV merge:", e)
 
@@ -387,18 +472,16 @@ def main():
 
     # ---- initial bounds for debug ----
     def _ts_bounds(x: pd.DataFrame) -> Dict[str, Any]:
-        if x.empty or "timestamp_utc" not in x.columns: return {"min": None, "max": None}
-        ts = pd.to_datetime(x["timestamp_utc"], errors="coerce", utc=True)
-        return {"min": str(ts.min()), "max": str(ts.max())}
+        if x.empty or "ts" not in x.columns: return {"min": None, "max": None}
+        return {"min": str(x["ts"].min()), "max": str(x["ts"].max())}
 
     raw_dec_bounds = _ts_bounds(df_dec)
     raw_skp_bounds = _ts_bounds(df_skp)
 
     # ---- filter by time window ----
-    df_all = df.copy()
-    if not df.empty and "timestamp_utc" in df.columns:
-        df["ts"] = pd.to_datetime(df["timestamp_utc"], errors="coerce", utc=True)
-        df = df[(df["ts"]>=start_utc) & (df["ts"]<end_utc)].copy()
+    df_all = df
+    if not df.empty and "ts" in df.columns:
+        df = df[(df["ts"]>=start_utc) & (df["ts"]<end_utc)]
 
     # Auto-widen by +2h (min total 8h) once if empty
     window_widened_hours = 0
@@ -407,21 +490,20 @@ def main():
         base = max(args.since_hours or 6, 6)
         widen = max(base+2, 8)
         start_f = end_f - timedelta(hours=widen)
-        df = df_all[(pd.to_datetime(df_all["timestamp_utc"], errors="coerce", utc=True)>=start_f) &
-                    (pd.to_datetime(df_all["timestamp_utc"], errors="coerce", utc=True)<end_f)].copy()
+        df = df_all[(df_all["ts"]>=start_f) & (df_all["ts"]<end_f)]
         window_widened_hours = widen
 
     # ---- experiment filter ----
     df_pre_exp_ct = int(df.shape[0])
     if args.experiment_id and not df.empty:
-        df = df[df.get("experiment_id")==args.experiment_id].copy()
+        df = df[df.get("experiment_id")==args.experiment_id]
 
-    # ---- DEDUP per snapshot ----
+    # ---- DEDUP per snapshot: one uint64 hash per row over the key, keep the last writer ----
     if not df.empty:
-        df = df.drop_duplicates(
-            subset=['timestamp_utc','signal','mode','size_band','price','C_eff','phase_angle_deg'],
-            keep='last'
-        )
+        key = pd.util.hash_pandas_object(df[[
+            'timestamp_utc','signal','mode','size_band','price','C_eff','phase_angle_deg'
+        ]], index=False)
+        df = df[~key.duplicated(keep='last').to_numpy()]
 
     # ---- DEBUG COUNTS (always write) ----
     dbg = {
@@ -467,55 +549,67 @@ def main():
     OUT.joinpath("debug_counts.json").write_text(json.dumps(dbg, indent=2), encoding="utf-8")
 
     # ---- Next prices + ensure 'ts' + prune (FIX) ----
-    df = compute_next_prices(df, steps=(1,4,12))
-    if "ts" not in df.columns:
-        df["ts"] = pd.to_datetime(df.get("timestamp_utc"), errors="coerce", utc=True)
-    df = df[df["ts"].notna()].copy()
+    if not df.empty:
+        df = compute_next_prices(df, steps=(1,4,12))
+        if "ts" not in df.columns:
+            df = df.assign(ts=pd.NaT)   # no timestamp_utc at all: nothing below can be placed in time
+        df = df[df["ts"].notna()]
+
+    # Analysis only runs on a non-empty window; otherwise the same empty tables are
+    # written straight away (the usual "no data" run skips all pandas dispatch below)
+    overlays = pd.DataFrame()
+    funnel   = pd.DataFrame(columns=["gate","count","survival_%"])
+    pnl_tbl, stats, engine_df = pd.DataFrame(), {}, pd.DataFrame()
+    if not df.empty:
+        overlays = overlay_league(df)
+        funnel   = gate_funnel(df)
+        pnl_tbl, stats, engine_df = perf_and_buckets(df, friction_bps=args.friction_bps)
+
+    # every CSV is rendered once; the markdown report re-parses that text, not the file
+    csv_text: Dict[str, str] = {}
+    def write_csv(tbl: pd.DataFrame, name: str, index: bool):
+        text = tbl.to_csv(index=index)
+        OUT.joinpath(name).write_bytes(text.encode("utf-8"))
+        csv_text[name] = text
 
     # 1) Overlays & funnel
-    overlays = overlay_league(df.copy(), trap_default=args.trap_cutoff_default) if not df.empty else pd.DataFrame()
-    funnel   = gate_funnel(df.copy(), trap_default=args.trap_cutoff_default) if not df.empty else pd.DataFrame(columns=["gate","count","survival_%"])
-    overlays.to_csv(OUT/"overlay_league.csv", index=False, encoding="utf-8")
-    funnel.to_csv(OUT/"gate_funnel.csv", index=False, encoding="utf-8")
+    write_csv(overlays, "overlay_league.csv", index=False)
+    write_csv(funnel, "gate_funnel.csv", index=False)
 
     # 2) EngineStrong perf & buckets
-    pnl_tbl, stats, engine_df = perf_and_buckets(df.copy(), friction_bps=args.friction_bps, trap_default=args.trap_cutoff_default)
-    pnl_tbl.to_csv(OUT/"pnl_by_horizon.csv", index=False, encoding="utf-8")
+    write_csv(pnl_tbl, "pnl_by_horizon.csv", index=False)
 
     # 3) Buckets → CSV
     buckets = stats.get("buckets", {})
     for name, tbl in buckets.items():
         if isinstance(tbl, pd.DataFrame):
-            tbl.to_csv(OUT/f"{name}.csv", index=True, encoding="utf-8")
+            write_csv(tbl, f"{name}.csv", index=True)
 
     # 4) Calibration
     calib = stats.get("calib", pd.DataFrame())
-    calib.to_csv(OUT/"calibration_by_Ceff.csv", index=True, encoding="utf-8")
+    write_csv(calib, "calibration_by_Ceff.csv", index=True)
 
     # 5) ToD & rolling accuracy
     tod = tod_heatmap(engine_df, args.tz)
     roll = rolling_accuracy(engine_df)
-    tod.to_csv(OUT/"time_of_day.csv", index=False, encoding="utf-8")
-    roll.to_csv(OUT/"rolling_accuracy_14d.csv", index=False, encoding="utf-8")
+    write_csv(tod, "time_of_day.csv", index=False)
+    write_csv(roll, "rolling_accuracy_14d.csv", index=False)
 
     # 6) Failure combos
-    if not df_skp.empty:
-        df_skp["ts"] = pd.to_datetime(df_skp.get("timestamp_utc"), errors="coerce", utc=True)
     fail_tbl = failure_table(df_skp[(df_skp.get("ts")>=start_utc) & (df_skp.get("ts")<end_utc)] if "ts" in df_skp.columns else df_skp, topn=50)
-    fail_tbl.to_csv(OUT/"skipped_failure_top50.csv", index=False, encoding="utf-8")
+    write_csv(fail_tbl, "skipped_failure_top50.csv", index=False)
 
     # 7) Last N rows
-    lastN = engine_df.tail(int(args.list_last)).copy()
+    lastN = engine_df.tail(int(args.list_last))
     cols = ["timestamp_utc","signal","size_band","price","phase_angle_deg","C_eff","volume_ratio","trap_T","herald_ok","leaders_ok","flows_ok","assets_present"]
     keep_cols=[c for c in cols if c in lastN.columns]
-    lastN[keep_cols].to_csv(OUT/"last_engine_strong.csv", index=False, encoding="utf-8")
+    write_csv(lastN[keep_cols], "last_engine_strong.csv", index=False)
 
     # 8) best_params.json — medians (decisions-only if available)
-    src_for_medians = df_dec.copy() if not df_dec.empty else pd.DataFrame()
-    def _med_or_nan(values): return float(pd.Series(values).median()) if len(values)>0 else float("nan")
-    med_full = _med_or_nan([row_full_thr(r) for _,r in src_for_medians.iterrows()])
-    med_amin = _med_or_nan([row_angle_minmax(r)[0] for _,r in src_for_medians.iterrows()])
-    med_amax = _med_or_nan([row_angle_minmax(r)[1] for _,r in src_for_medians.iterrows()])
+    def _med_or_nan(values): return float(values.median()) if len(values)>0 else float("nan")
+    med_full = _med_or_nan(df_dec["_full_thr"])
+    med_amin = _med_or_nan(df_dec["_amin"])
+    med_amax = _med_or_nan(df_dec["_amax"])
     params_obj={
         "version": "engine-strong-row-aware",
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -559,9 +653,9 @@ def main():
 
     def add_csv_table(title, path):
         p=OUT/path
-        if p.exists():
+        if path in csv_text or p.exists():
             try:
-                t=pd.read_csv(p)
+                t=pd.read_csv(io.StringIO(csv_text[path]) if path in csv_text else p)
                 md.append(f"\n### {title}\n" + t.to_string(index=False))
             except Exception:
                 md.append(f"\n### {title}\n(see file: {p})")
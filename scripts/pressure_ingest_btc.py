@@ -35,88 +35,156 @@ CLI (optional):
 
 import argparse
 import json
+from bisect import bisect_right
 import math
+import os
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # stdlib json fallback
+
+# volume gate: multiplier for #edges <= vol_ratio
+VOL_GATE_EDGES = (1.0, 1.2, 1.3)
+VOL_GATE_MULTS = (0.65, 0.80, 0.95, 1.00)
+
+SKEW_SCORES = {
+    "short": 0.75,   # short skew â†’ bull tilt
+    "neutral": 0.50,
+    "flat": 0.50,
+    "long": 0.25     # long skew â†’ bear tilt
+}
+
+# per-ROOT (OUTF, FLOWS, SENTF) and created dirs, for callers that run compute_pressure repeatedly
+_PATHS = {}
+_KNOWN_DIRS = set()
+
+# numeric flow fields read by compute_pressure; missing/null/0 all mean 0.0
+FLOW_NUM_KEYS = ("funding", "vol_lh_current", "vol_1h_current", "vol_avg20")
+
 
 def _sigmoid(x: float, k: float = 4.0):
-    try:
-        return 1.0 / (1.0 + math.exp(-k * x))
-    except OverflowError:
-        return 1.0 if x > 0 else 0.0
+    # 1/(1+exp(-kx)) written via tanh: saturates to 0/1 without overflowing
+    return 0.5 * (1.0 + math.tanh(0.5 * k * x))
+
+
+def _loads(b: bytes):
+    # orjson on raw bytes; anything it rejects (NaN/Infinity, ...) gets the stdlib path
+    if orjson is not None:
+        try: return orjson.loads(b)
+        except Exception: pass
+    return json.loads(b.decode("utf-8"))
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        try: return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except Exception: pass   # e.g. ints beyond 64 bit: stdlib handles them
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def _read_json(p: Path):
-    if not p.exists():
-        return {}
+    # a missing file is just another failed read: one open, no separate stat
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return _loads(p.read_bytes())
     except Exception:
         return {}
 
 
 def _read_sentiment(p: Path):
-    if not p.exists():
-        return 0.0
+    # one short number: float() parses the bytes directly, and 64 bytes bound a corrupt file
     try:
-        return float(p.read_text(encoding="utf-8").strip())
+        with open(p, "rb") as f:
+            return float(f.read(64))
     except Exception:
         return 0.0
 
 
-def compute_pressure(ROOT: Path):
-    DATA = ROOT / "data"
-    OUTF = DATA / "pressure_btc.json"
-    FLOWS = DATA / "flows_btc.json"
-    SENTF = DATA / "sentiment_index.txt"
-
-    flows = _read_json(FLOWS)
-    sent_val = _read_sentiment(SENTF)
-
+def pressure_kernel(sent_val: float, funding: float, skew_score: float, vol_ratio: float):
+    """Scalar core of compute_pressure, no I/O.
+    Returns (P_eff, sentiment_score, funding_score, volume_gate)."""
     # --- Components ---------------------------------------------------------
     # Sentiment: assume ~[-3..+3] typical, softly squash to [0..1]
     sent_score = _sigmoid(sent_val / 3.0, k=3.0)  # 0.5 is neutral
-
     # Funding to [0..1], stronger tail if extreme
-    funding = float(flows.get("funding", 0.0) or 0.0)
     funding_score = _sigmoid(funding, k=3.0)     # 0.5 neutral
 
+    # NaN compares false against every edge, so it lands in the first bucket
+    volume_gate = VOL_GATE_MULTS[0 if math.isnan(vol_ratio) else bisect_right(VOL_GATE_EDGES, vol_ratio)]
+
+    # --- Blend to "bull energy" in [0..1] -----------------------------------
+    # Weighting: sentiment 0.4, skew 0.3, funding 0.3
+    bull_energy = 0.4 * sent_score + 0.3 * skew_score + 0.3 * funding_score
+    # Convert to pressure in [-1,1]: P = 2*bull - 1
+    P = 2.0 * bull_energy - 1.0
+    # Apply volume gate softly to avoid overread during quiet hours
+    return max(-1.0, min(1.0, P * volume_gate)), sent_score, funding_score, volume_gate
+
+
+def compute_pressure_batch(sent_vals, fundings, liq_skews, vol_ratios, dtype=None):
+    """Vectorized pressure_kernel for backfills: one P_eff per element (no I/O).
+    liq_skews goes through the same str().lower() + SKEW_SCORES mapping as
+    compute_pressure; pass dtype=np.float32 to trade the last digits for speed."""
+    import numpy as np  # only backfills pay for numpy; the hourly run stays scalar
+    dt = np.float64 if dtype is None else dtype
+    sent = np.asarray(sent_vals, dtype=dt)
+    fund = np.asarray(fundings, dtype=dt)
+    vr = np.asarray(vol_ratios, dtype=dt)
+    skew = np.fromiter((SKEW_SCORES.get(str(s or "neutral").lower(), 0.50) for s in liq_skews),
+                       dtype=dt, count=len(liq_skews))
+
+    sent_score = 0.5 * (1.0 + np.tanh(0.5 * 3.0 * (sent / 3.0)))
+    funding_score = 0.5 * (1.0 + np.tanh(0.5 * 3.0 * fund))
+    k = np.searchsorted(np.asarray(VOL_GATE_EDGES, dtype=dt), vr, side="right")
+    volume_gate = np.asarray(VOL_GATE_MULTS, dtype=dt)[np.where(np.isnan(vr), 0, k)]
+
+    P = 2.0 * (0.4 * sent_score + 0.3 * skew + 0.3 * funding_score) - 1.0
+    # fmin/fmax, not clip: NaN lands on +1.0 exactly as max(-1, min(1, nan)) does in the scalar path
+    return np.fmax(-1.0, np.fmin(1.0, P * volume_gate))
+
+
+def _paths(ROOT: Path):
+    paths = _PATHS.get(ROOT)
+    if paths is None:
+        DATA = ROOT / "data"
+        paths = _PATHS[ROOT] = (DATA / "pressure_btc.json", DATA / "flows_btc.json", DATA / "sentiment_index.txt")
+    return paths
+
+
+def ensure_dir(d: Path):
+    # makedirs once per directory per process; later calls skip the syscall
+    if d not in _KNOWN_DIRS:
+        d.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(d)
+
+
+def compute_pressure(ROOT: Path):
+    OUTF, FLOWS, SENTF = _paths(ROOT)
+
+    flows = _read_json(FLOWS)
+    sent_val = _read_sentiment(SENTF)
+
+    # One pass over the numeric flow fields.
+    # Funding rate: pressure_kernel squashes it to [0..1]
+    funding, vol_lh, vol_1h, v20 = (flows.get(k) or 0.0 for k in FLOW_NUM_KEYS)
+    funding = float(funding)
+
     # Liquidity skew â†’ longs under pressure if "short" (bullish)
     liq_skew = str(flows.get("liq_skew", "neutral") or "neutral").lower()
-    skew_score = {
-        "short": 0.75,   # short skew â†’ bull tilt
-        "neutral": 0.50,
-        "flat": 0.50,
-        "long": 0.25     # long skew â†’ bear tilt
-    }.get(liq_skew, 0.50)
+    skew_score = SKEW_SCORES.get(liq_skew, 0.50)
 
         # Optional: volume gate (discourage strong P if volume is poor)
     # Accept both 'vol_lh_current' and 'vol_1h_current'; prefer direct 'volume_ratio' if present.
-    vol = float((flows.get("vol_lh_current") or flows.get("vol_1h_current") or 0.0) or 0.0)
-    v20 = float(flows.get("vol_avg20", 0.0) or 0.0)
+    vol = float(vol_lh or vol_1h)
+    v20 = float(v20)
     vol_ratio = flows.get("volume_ratio")
     try:
         vol_ratio = float(vol_ratio)
     except Exception:
         vol_ratio = (vol / v20) if (vol > 0 and v20 > 0) else 1.0
 
-    if vol_ratio >= 1.3:
-        volume_gate = 1.00
-    elif vol_ratio >= 1.2:
-        volume_gate = 0.95
-    elif vol_ratio >= 1.0:
-        volume_gate = 0.80
-    else:
-        volume_gate = 0.65
-
-
-    # --- Blend to "bull energy" in [0..1] -----------------------------------
-    # Weighting: sentiment 0.4, skew 0.3, funding 0.3
-    bull_energy = 0.4 * sent_score + 0.3 * skew_score + 0.3 * funding_score
-    # Convert to pressure in [-1,1]: P = 2*bull - 1
-    P = 2.0 * bull_energy - 1.0
-    # Apply volume gate softly to avoid overread during quiet hours
-    P_eff = max(-1.0, min(1.0, P * volume_gate))
+    P_eff, sent_score, funding_score, volume_gate = pressure_kernel(sent_val, funding, skew_score, vol_ratio)
 
     out = {
         "pressure": round(P_eff, 6),
@@ -134,9 +202,17 @@ def compute_pressure(ROOT: Path):
             "price": flows.get("price", None),
         },
     }
-    OUTF.parent.mkdir(parents=True, exist_ok=True)
-    OUTF.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(json.dumps(out, ensure_ascii=False))  # keep stdout JSON for caller visibility
+    ensure_dir(OUTF.parent)
+    payload = _dumps(out)
+    try:
+        unchanged = OUTF.read_bytes() == payload
+    except OSError:
+        unchanged = False
+    if unchanged:
+        os.utime(OUTF)  # same payload: skip the rewrite, but keep the file's age fresh for the monitors
+    else:
+        OUTF.write_bytes(payload)
+    print(payload.decode("utf-8"))  # keep stdout JSON for caller visibility (same document as the file)
 
 
 def main():